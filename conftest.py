@@ -1,92 +1,493 @@
 """
 Конфигурация для pytest тестов
 """
+from pathlib import Path
+
 import pytest
-import random
-import requests
 
-BASE_URL = "https://qa-internship.avito.com"
+from utils.benchmark import (
+    DEFAULT_BASELINE,
+    DEFAULT_ITERATIONS,
+    DEFAULT_THRESHOLDS,
+    DEFAULT_WARMUP,
+    MARKER as BENCHMARK_MARKER,
+    BenchmarkPlugin,
+    compare,
+    measure,
+    parse_thresholds,
+)
+from utils.budget import MODES as LATENCY_BUDGET_MODES, LatencyBudgetPlugin
+from utils.capture import DEFAULT_MAX_BYTES as TRAFFIC_MAX_BYTES, TrafficCapture, TrafficCapturePlugin
+from utils.cassette import DEFAULT_CASSETTE, MODES as CASSETTE_MODES, CassetteRecorder, install_replay
+from utils.contention import (
+    DEFAULT_LEVELS as STRESS_LEVELS,
+    DEFAULT_WRITES as STRESS_WRITES,
+    MARKER as STRESS_MARKER,
+    ContentionPlugin,
+    parse_levels,
+)
+from utils.fault_proxy import FaultProxy, FaultProxyPlugin, parse_fault
+from utils.http_client import DEFAULT_BASE_URL, ApiClient
+from utils.resilience import (
+    CircuitBreaker,
+    ResiliencePlugin,
+    ResiliencePolicy,
+    ResilienceStats,
+    RetryPolicy,
+    parse_endpoint_timeout,
+)
+from utils.item_cache import ItemCache
+from utils.seeder import seller_sizes
+from utils.sellers import SellerIdAllocator, xdist_worker
+from utils.sharding import ShardingPlugin
+from utils.throttle import RateLimiter, RateLimitPlugin, build_rate_limiter
+from utils.items import (
+    DEFAULT_CREATE_WORKERS,
+    ItemPool,
+    create_item,
+    create_items,
+    create_seller_items,
+    make_item_payload,
+    make_pool_payloads,
+)
+from utils.stub_server import StubServer
+from utils.timing import HttpTimingPlugin, TimingRecorder
+
+BASE_URL = DEFAULT_BASE_URL
 API_VERSION = "1"
 
+# Объявления пула только читаются, поэтому нескольких хватает на любое число тестов
+DEFAULT_POOL_SIZE = 4
 
-@pytest.fixture
-def base_url():
-    """Базовый URL API"""
-    return BASE_URL
+item_pool_size_key = pytest.StashKey[int]()
+timing_recorder_key = pytest.StashKey[TimingRecorder]()
+resilience_stats_key = pytest.StashKey[ResilienceStats]()
+traffic_capture_key = pytest.StashKey[TrafficCapture]()
+rate_limiter_key = pytest.StashKey[RateLimiter]()
 
 
-@pytest.fixture
+def pytest_addoption(parser):
+    group = parser.getgroup("api", "Настройки API под тестом")
+    group.addoption(
+        "--api-url",
+        default=BASE_URL,
+        help="Базовый URL API (по умолчанию %(default)s)",
+    )
+    group.addoption(
+        "--local-api",
+        action="store_true",
+        default=False,
+        help="Запустить тесты против локальной заглушки API без сети",
+    )
+    group.addoption(
+        "--item-pool-size",
+        type=int,
+        default=DEFAULT_POOL_SIZE,
+        help="Наибольшее число объявлений в пуле; тесты получают их по кругу "
+             "(по умолчанию %(default)s)",
+    )
+    group.addoption(
+        "--item-pool-workers",
+        type=int,
+        default=DEFAULT_CREATE_WORKERS,
+        help="Число параллельных запросов при создании пула и пакетов объявлений",
+    )
+    group.addoption(
+        "--seller-id-state",
+        default=None,
+        help="Файл с позицией выдачи sellerID между запусками "
+             "(по умолчанию в .pytest_cache)",
+    )
+    group.addoption(
+        "--seed-manifest",
+        default=None,
+        help="Манифест id объявлений, созданных utils.seeder, для тестов на больших объемах",
+    )
+    group.addoption(
+        "--item-cache-file",
+        default=None,
+        help="Файл кэша объявлений пула между запусками (по умолчанию в .pytest_cache)",
+    )
+    group.addoption(
+        "--no-item-cache",
+        action="store_true",
+        default=False,
+        help="Создавать пул объявлений заново, не используя кэш прошлых запусков",
+    )
+    group.addoption(
+        "--fault",
+        type=parse_fault,
+        action="append",
+        default=[],
+        help="Пускать запросы через локальный прокси со сбоями, например "
+             "'GET /api/1/item/{id}: latency=lognormal(50,0.8), error=503@0.1' (можно несколько раз)",
+    )
+    group.addoption(
+        "--fault-seed",
+        type=int,
+        default=0,
+        help="Seed случайных сбоев прокси (по умолчанию %(default)s)",
+    )
+    group.addoption(
+        "--cassette-mode",
+        choices=CASSETTE_MODES,
+        default="off",
+        help="record - записать трафик в кассету, replay - отвечать из кассеты без сети",
+    )
+    group.addoption(
+        "--cassette",
+        default=DEFAULT_CASSETTE,
+        help="Путь к файлу кассеты (по умолчанию %(default)s)",
+    )
+    group.addoption(
+        "--retries",
+        type=int,
+        default=2,
+        help="Число повторов GET при 5xx, таймаутах и сетевых ошибках (0 - без повторов)",
+    )
+    group.addoption(
+        "--breaker-threshold",
+        type=int,
+        default=5,
+        help="После скольких ошибок подряд остальные запросы сразу отклоняются",
+    )
+    group.addoption(
+        "--breaker-reset",
+        type=float,
+        default=30.0,
+        help="Через сколько секунд после срабатывания breaker пробовать снова",
+    )
+    group.addoption(
+        "--endpoint-timeout",
+        type=parse_endpoint_timeout,
+        action="append",
+        default=[],
+        metavar="'METHOD /path=connect,read'",
+        help="Таймаут эндпоинта, например 'GET /api/1/{sellerID}/item=3,60'",
+    )
+    group.addoption(
+        "--latency-budget",
+        choices=LATENCY_BUDGET_MODES,
+        default="enforce",
+        help="Проверка маркеров latency_budget: enforce - падение теста, "
+             "warn - предупреждение, off - не проверять",
+    )
+    group.addoption(
+        "--benchmark",
+        action="store_true",
+        default=False,
+        help="Запустить бенчмарки эндпоинтов (тесты с маркером benchmark)",
+    )
+    group.addoption(
+        "--benchmark-iterations",
+        type=int,
+        default=DEFAULT_ITERATIONS,
+        help="Число замеряемых вызовов в бенчмарке (по умолчанию %(default)s)",
+    )
+    group.addoption(
+        "--benchmark-warmup",
+        type=int,
+        default=DEFAULT_WARMUP,
+        help="Число вызовов для прогрева перед замерами (по умолчанию %(default)s)",
+    )
+    group.addoption(
+        "--benchmark-baseline",
+        default=DEFAULT_BASELINE,
+        help="JSON-файл базовой линии бенчмарков (по умолчанию %(default)s)",
+    )
+    group.addoption(
+        "--benchmark-save",
+        action="store_true",
+        default=False,
+        help="Сохранить результаты бенчмарков как новую базовую линию",
+    )
+    group.addoption(
+        "--benchmark-threshold",
+        type=parse_thresholds,
+        default=DEFAULT_THRESHOLDS,
+        help="Допустимый рост перцентилей относительно базовой линии в %%, "
+             "например p50=10,p95=20 или 25 для всех",
+    )
+    group.addoption(
+        "--stress",
+        action="store_true",
+        default=False,
+        help="Запустить стресс-тесты (маркер stress), например конкурентную запись одного продавца",
+    )
+    group.addoption(
+        "--stress-writes",
+        type=int,
+        default=STRESS_WRITES,
+        help="Число POST на каждом уровне конкурентности (по умолчанию %(default)s)",
+    )
+    group.addoption(
+        "--stress-levels",
+        type=parse_levels,
+        default=STRESS_LEVELS,
+        help="Уровни конкурентности записи через запятую (по умолчанию 1,16,64,256)",
+    )
+    group.addoption(
+        "--traffic-dir",
+        default=None,
+        help="Записывать все запросы и ответы в сжатые JSONL-файлы в этом каталоге",
+    )
+    group.addoption(
+        "--traffic-max-mb",
+        type=float,
+        default=TRAFFIC_MAX_BYTES / 1024 / 1024,
+        help="Размер несжатых данных, после которого начинается новый файл трафика (по умолчанию %(default)s)",
+    )
+    group.addoption(
+        "--rate-limit",
+        type=float,
+        default=None,
+        help="Не больше N запросов в секунду на весь запуск (делится между воркерами xdist)",
+    )
+    group.addoption(
+        "--rate-burst",
+        type=float,
+        default=None,
+        help="Запас токенов для коротких всплесков (по умолчанию равен --rate-limit)",
+    )
+    group.addoption(
+        "--max-concurrency",
+        type=int,
+        default=None,
+        help="Адаптивный (AIMD) лимит одновременных запросов воркера не выше N",
+    )
+    group.addoption(
+        "--num-shards",
+        type=int,
+        default=1,
+        help="На сколько шардов делить тесты по длительностям прошлых запусков",
+    )
+    group.addoption(
+        "--shard-id",
+        type=int,
+        default=0,
+        help="Номер шарда этого запуска, от 0 до --num-shards - 1",
+    )
+    group.addoption(
+        "--durations-file",
+        default=None,
+        help="JSON-файл длительностей тестов (по умолчанию в .pytest_cache)",
+    )
+
+
+def pytest_configure(config):
+    recorder = TimingRecorder()
+    config.stash[timing_recorder_key] = recorder
+    config.stash[resilience_stats_key] = ResilienceStats()
+    config.pluginmanager.register(ResiliencePlugin(config.stash[resilience_stats_key]), "http_resilience")
+    config.pluginmanager.register(HttpTimingPlugin(recorder), "http_timing")
+    config.pluginmanager.register(LatencyBudgetPlugin(config.getoption("--latency-budget")), "latency_budget")
+    config.pluginmanager.register(BenchmarkPlugin(config), "benchmark")
+    config.pluginmanager.register(ShardingPlugin(config), "sharding")
+    config.pluginmanager.register(ContentionPlugin(config), "write_contention")
+    if config.getoption("--traffic-dir"):
+        capture = TrafficCapture(config.getoption("--traffic-dir"),
+                                 max_bytes=int(config.getoption("--traffic-max-mb") * 1024 * 1024))
+        config.stash[traffic_capture_key] = capture
+        config.pluginmanager.register(TrafficCapturePlugin(capture), "traffic_capture")
+    _, worker_count = xdist_worker()
+    rate = config.getoption("--rate-limit")
+    burst = config.getoption("--rate-burst")
+    limiter = build_rate_limiter(
+        rate=rate / worker_count if rate else None,
+        burst=burst / worker_count if burst else None,
+        max_concurrency=config.getoption("--max-concurrency"),
+    )
+    if limiter is not None:
+        config.stash[rate_limiter_key] = limiter
+        config.pluginmanager.register(RateLimitPlugin(limiter), "rate_limit")
+    config.addinivalue_line(
+        "markers",
+        "latency_budget(max_ms, percentile=None, repeat=1, endpoint=None, strict=True): "
+        "бюджет задержки HTTP-вызовов теста",
+    )
+    config.addinivalue_line("markers", f"{BENCHMARK_MARKER}: бенчмарк эндпоинта, запускается с --benchmark")
+    config.addinivalue_line("markers", f"{STRESS_MARKER}: стресс-тест, запускается с --stress")
+
+
+@pytest.fixture(scope="session")
+def local_api_server():
+    """Локальная заглушка API в фоновом потоке"""
+    with StubServer() as server:
+        yield server
+
+
+@pytest.fixture(scope="session")
+def base_url(request):
+    """Базовый URL API; с --fault - адрес прокси со сбоями перед ним"""
+    config = request.config
+    replay = config.getoption("--cassette-mode") == "replay"
+    if config.getoption("--local-api") and not replay:
+        url = request.getfixturevalue("local_api_server").url
+    else:
+        url = config.getoption("--api-url").rstrip("/")
+    if not config.getoption("--fault") or replay:
+        return url
+
+    proxy = FaultProxy(url, config.getoption("--fault"), seed=config.getoption("--fault-seed")).start()
+    request.addfinalizer(proxy.stop)
+    config.pluginmanager.register(FaultProxyPlugin(proxy), "fault_proxy")
+    return proxy.url
+
+
+@pytest.fixture(scope="session")
 def api_version():
     """Версия API"""
     return API_VERSION
 
 
+@pytest.fixture(scope="session")
+def api_client(request, base_url, api_version):
+    """Общий HTTP-клиент с пулом keep-alive соединений на всю сессию"""
+    config = request.config
+    resilience = ResiliencePolicy(
+        endpoint_timeouts=dict(config.getoption("--endpoint-timeout")),
+        retry=RetryPolicy(retries=config.getoption("--retries")),
+        breaker=CircuitBreaker(config.getoption("--breaker-threshold"), config.getoption("--breaker-reset")),
+        stats=config.stash[resilience_stats_key],
+    )
+    client = ApiClient(base_url, api_version, resilience=resilience, limiter=config.stash.get(rate_limiter_key, None))
+    client.listeners.append(config.stash[timing_recorder_key])
+    if traffic_capture_key in config.stash:
+        client.listeners.append(config.stash[traffic_capture_key])
+
+    cassette_mode = config.getoption("--cassette-mode")
+    cassette_path = Path(config.getoption("--cassette"))
+    recorder = None
+    if cassette_mode == "record":
+        cassette_path.parent.mkdir(parents=True, exist_ok=True)
+        recorder = CassetteRecorder(cassette_path)
+        client.listeners.append(recorder)
+    elif cassette_mode == "replay":
+        install_replay(client, cassette_path)
+
+    yield client
+    client.close()
+    if recorder:
+        recorder.close()
+
+
+@pytest.fixture(scope="session")
+def seller_id_allocator(request):
+    """Выдача sellerID из диапазона текущего воркера без повторов между запусками"""
+    state_file = request.config.getoption("--seller-id-state")
+    if state_file is None and getattr(request.config, "cache", None) is not None:
+        state_file = request.config.cache.mkdir("seller_ids") / "next"
+    return SellerIdAllocator.for_xdist_worker(state_file=state_file)
+
+
 @pytest.fixture
-def unique_seller_id():
+def unique_seller_id(seller_id_allocator):
     """Генерация уникального sellerID в диапазоне 111111-999999"""
-    return random.randint(111111, 999999)
+    return seller_id_allocator.allocate()
 
 
 @pytest.fixture
 def sample_item_data(unique_seller_id):
     """Пример данных для создания объявления"""
-    return {
-        "sellerID": unique_seller_id,
-        "name": "testItem",
-        "price": 9900,
-        "statistics": {
-            "likes": 21,
-            "viewCount": 11,
-            "contacts": 43
-        }
-    }
-
-
-def extract_item_id_from_response(response_data, base_url, api_version):
-    """Извлекает id объявления из ответа API и получает полные данные"""
-    item_id = None
-    
-    if isinstance(response_data, dict):
-        if "status" in response_data:
-            # API возвращает {"status": "Сохранили объявление - {id}"}
-            status_text = response_data["status"]
-            if " - " in status_text:
-                item_id = status_text.split(" - ")[-1]
-        elif "id" in response_data:
-            item_id = response_data["id"]
-    elif isinstance(response_data, list) and len(response_data) > 0:
-        if "id" in response_data[0]:
-            item_id = response_data[0]["id"]
-    
-    # Если получили id, получаем полные данные объявления
-    if item_id:
-        get_response = requests.get(
-            f"{base_url}/api/{api_version}/item/{item_id}",
-            headers={"Accept": "application/json"}
-        )
-        if get_response.status_code == 200:
-            items = get_response.json()
-            if isinstance(items, list) and len(items) > 0:
-                return items[0]
-    
-    return response_data
+    return make_item_payload(unique_seller_id)
 
 
 @pytest.fixture
-def created_item(base_url, api_version, sample_item_data):
+def created_item(api_client, sample_item_data):
     """Создает объявление и возвращает его данные"""
-    response = requests.post(
-        f"{base_url}/api/{api_version}/item",
-        json=sample_item_data,
-        headers={"Content-Type": "application/json", "Accept": "application/json"}
-    )
-    assert response.status_code == 200, f"Failed to create item: {response.text}"
-    response_data = response.json()
-    
-    # Извлекаем id и получаем полные данные
-    item_data = extract_item_id_from_response(response_data, base_url, api_version)
-    
-    # Проверяем, что есть id
-    assert "id" in item_data, f"Response doesn't contain 'id': {item_data}"
-    yield item_data
+    yield create_item(api_client, sample_item_data)
     # Cleanup не требуется, так как нет DELETE endpoint в версии 1
+
+
+@pytest.fixture(scope="session")
+def seeded_sellers(request):
+    """Число объявлений каждого продавца из --seed-manifest; без манифеста тест пропускается"""
+    path = request.config.getoption("--seed-manifest")
+    if path is None:
+        pytest.skip("requires --seed-manifest from utils.seeder")
+    return seller_sizes(path)
+
+
+@pytest.fixture
+def item_factory(request, api_client):
+    """Параллельно создает несколько объявлений продавца: item_factory(seller_id, count)"""
+    max_workers = request.config.getoption("--item-pool-workers")
+
+    def factory(seller_id, count, **kwargs):
+        kwargs.setdefault("max_workers", max_workers)
+        return create_seller_items(api_client, seller_id, count, **kwargs)
+
+    return factory
+
+
+@pytest.hookimpl(trylast=True)
+def pytest_collection_modifyitems(config, items):
+    # Объявления создаются только для тестов, которые будут выполнены: после отбора
+    # и маркеров пропуска плагинов (бенчмарки без --benchmark, стресс-тесты без --stress)
+    consumers = sum(1 for item in items
+                    if "pooled_item" in getattr(item, "fixturenames", ()) and not item.get_closest_marker("skip"))
+    config.stash[item_pool_size_key] = min(consumers, config.getoption("--item-pool-size"))
+
+
+def item_cache_path(config):
+    """Файл кэша объявлений текущего воркера или None, если кэш выключен"""
+    if (config.getoption("--no-item-cache") or config.getoption("--cassette-mode") != "off"
+            or config.getoption("--fault")):
+        return None
+    worker_index, _ = xdist_worker()
+    path = config.getoption("--item-cache-file")
+    if path is None:
+        if getattr(config, "cache", None) is None:
+            return None
+        path = config.cache.mkdir("item_cache") / "items.json"
+    return f"{path}.{worker_index}"
+
+
+@pytest.fixture(scope="session")
+def item_pool(request, api_client, base_url, seller_id_allocator):
+    """Объявления, созданные одним пакетом в начале сессии или взятые из кэша прошлых запусков"""
+    size = max(request.config.stash.get(item_pool_size_key, 0), 1)
+    workers = request.config.getoption("--item-pool-workers")
+    cache_path = item_cache_path(request.config)
+    if cache_path is None:
+        payloads = make_pool_payloads([seller_id_allocator.allocate() for _ in range(size)])
+        return ItemPool(create_items(api_client, payloads, max_workers=workers))
+
+    # Объявления пула кэшируются под одним продавцом, чтобы проверить их одним запросом списка
+    cache = ItemCache(cache_path, base_url)
+    if cache.seller_id is None or not seller_id_allocator.low <= cache.seller_id <= seller_id_allocator.high:
+        cache.seller_id = seller_id_allocator.allocate()
+        cache.entries.clear()
+    cache.validate(api_client, max_workers=workers)
+    payloads = make_pool_payloads([cache.seller_id] * size)
+    items = cache.get_or_create(api_client, payloads, max_workers=workers)
+    cache.save()
+    return ItemPool(items)
+
+
+@pytest.fixture
+def pooled_item(item_pool):
+    """Объявление из общего пула для тестов, которые не изменяют данные"""
+    return item_pool.checkout()
+
+
+@pytest.fixture
+def benchmark(request):
+    """Замер вызова с прогревом и сравнение с базовой линией: benchmark(name, call)"""
+    config = request.config
+    plugin = config.pluginmanager.get_plugin("benchmark")
+
+    def run(name, call):
+        summary = measure(call, config.getoption("--benchmark-iterations"), config.getoption("--benchmark-warmup"))
+        request.node.user_properties.append((BENCHMARK_MARKER, {"name": name, "summary": summary}))
+        assert summary["errors"] == 0, f"{name}: {summary['errors']} of {summary['requests']} calls failed"
+        baseline = plugin.baseline.get(name)
+        if baseline and not plugin.save:
+            regressions = compare(summary, baseline, plugin.thresholds)
+            assert not regressions, f"{name} regressed vs baseline: " + ", ".join(
+                f"{column} {before:.1f} -> {after:.1f} ms (+{growth:.0f}%)"
+                for column, before, after, growth in regressions
+            )
+        return summary
+
+    return run
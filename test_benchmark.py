@@ -0,0 +1,60 @@
+"""
+Бенчмарки эндпоинтов API объявлений (utils/benchmark.py)
+
+Запуск: pytest test_benchmark.py --benchmark [--benchmark-save]
+"""
+import pytest
+
+from utils.benchmark import compare, parse_thresholds, save_baseline, load_baseline
+
+
+@pytest.mark.benchmark
+class TestEndpointBenchmarks:
+    """Задержка каждого эндпоинта на фиксированном числе вызовов"""
+
+    def test_create_item(self, benchmark, api_client, sample_item_data):
+        benchmark("POST /api/1/item", lambda: api_client.post("item", json=sample_item_data))
+
+    def test_get_item(self, benchmark, api_client, pooled_item):
+        benchmark("GET /api/1/item/{id}", lambda: api_client.get(f"item/{pooled_item['id']}"))
+
+    def test_get_statistic(self, benchmark, api_client, pooled_item):
+        benchmark("GET /api/1/statistic/{id}", lambda: api_client.get(f"statistic/{pooled_item['id']}"))
+
+    def test_get_seller_items(self, benchmark, api_client, item_factory, unique_seller_id):
+        item_factory(unique_seller_id, 5)
+        benchmark("GET /api/1/{sellerID}/item", lambda: api_client.get(f"{unique_seller_id}/item"))
+
+    def test_get_largest_seeded_seller_items(self, benchmark, api_client, seeded_sellers):
+        seller_id, _ = seeded_sellers.most_common(1)[0]
+        benchmark("GET /api/1/{sellerID}/item (largest seeded seller)", lambda: api_client.get(f"{seller_id}/item"))
+
+
+class TestBaselineComparison:
+    """Сравнение результатов с базовой линией"""
+
+    BASELINE = {"p50": 10.0, "p95": 20.0, "p99": 40.0}
+
+    def test_within_thresholds(self):
+        assert compare({"p50": 11.0, "p95": 25.0, "p99": 55.0}, self.BASELINE) == []
+
+    def test_regression_reported(self):
+        regressions = compare({"p50": 15.0, "p95": 20.0, "p99": 40.0}, self.BASELINE)
+
+        assert regressions == [("p50", 10.0, 15.0, 50.0)]
+
+    def test_small_absolute_growth_ignored(self):
+        assert compare({"p50": 0.9}, {"p50": 0.5}) == []
+
+    def test_parse_thresholds(self):
+        assert parse_thresholds("p95=15") == {"p95": 15.0}
+        assert parse_thresholds("25") == {"p50": 25.0, "p95": 25.0, "p99": 25.0}
+        with pytest.raises(ValueError):
+            parse_thresholds("p90=10")
+
+    def test_save_merges_with_existing_baseline(self, tmp_path):
+        path = str(tmp_path / "bench" / "baseline.json")
+        save_baseline(path, {"GET /a": self.BASELINE})
+        save_baseline(path, {"GET /b": self.BASELINE}, {"iterations": 10})
+
+        assert set(load_baseline(path)) == {"GET /a", "GET /b"}
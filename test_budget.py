@@ -0,0 +1,93 @@
+"""
+Тесты маркера latency_budget (utils/budget.py)
+"""
+from pathlib import Path
+
+import pytest
+
+from utils.budget import LatencyBudget
+
+pytest_plugins = ["pytester"]
+
+ROOT_DIR = Path(__file__).parent
+
+INNER_CONFTEST = """
+from utils.budget import LatencyBudgetPlugin
+from utils.http_client import RequestTiming
+from utils.timing import HttpTimingPlugin, TimingRecorder
+
+recorder = TimingRecorder()
+
+
+def pytest_configure(config):
+    config.pluginmanager.register(HttpTimingPlugin(recorder))
+    config.pluginmanager.register(LatencyBudgetPlugin())
+
+
+def fake_request(total_ms):
+    recorder(RequestTiming("GET", "GET /api/1/item/{id}", 200, None, total_ms / 2000, total_ms / 1000), None)
+"""
+
+
+def timing(total_ms, endpoint="GET /api/1/item/{id}"):
+    return {"endpoint": endpoint, "status_code": 200, "connect": None,
+            "ttfb": total_ms / 2000, "total": total_ms / 1000}
+
+
+class TestLatencyBudget:
+    """Проверка бюджета по замерам и влияние на результат теста"""
+
+    def test_max_latency_within_budget(self):
+        assert LatencyBudget(max_ms=100).check([timing(50), timing(99)]) is None
+
+    def test_max_latency_exceeded_lists_requests(self):
+        violation = LatencyBudget(max_ms=100).check([timing(50), timing(150)])
+
+        assert "observed 150.0 ms" in violation
+        assert violation.count("over budget") == 1
+
+    def test_percentile_budget(self):
+        timings = [timing(10)] * 19 + [timing(500)]
+
+        assert LatencyBudget(max_ms=100, percentile=95).check(timings) is None
+        assert LatencyBudget(max_ms=100, percentile=99).check(timings) is not None
+
+    def test_endpoint_filter(self):
+        timings = [timing(500, endpoint="POST /api/1/item"), timing(10)]
+
+        assert LatencyBudget(max_ms=100, endpoint="GET /api/1/item/{id}").check(timings) is None
+
+    @pytest.mark.parametrize("strict, outcome", [(True, {"failed": 1}), (False, {"passed": 1, "warnings": 1})])
+    def test_budget_breach_outcome(self, pytester, strict, outcome):
+        pytester.syspathinsert(ROOT_DIR)
+        pytester.makeconftest(INNER_CONFTEST)
+        pytester.makepyfile(f"""
+            import pytest
+            from conftest import fake_request
+
+            @pytest.mark.latency_budget(max_ms=100, strict={strict})
+            def test_slow():
+                fake_request(250)
+        """)
+
+        result = pytester.runpytest("-p", "no:cacheprovider")
+
+        result.assert_outcomes(**outcome)
+        result.stdout.fnmatch_lines(["*Latency budget exceeded*"])
+
+    def test_repeat_runs_test_body(self, pytester):
+        pytester.syspathinsert(ROOT_DIR)
+        pytester.makeconftest(INNER_CONFTEST)
+        pytester.makepyfile("""
+            import pytest
+            from conftest import fake_request, recorder
+
+            @pytest.mark.latency_budget(max_ms=100, percentile=50, repeat=4)
+            def test_repeated():
+                fake_request(10)
+
+            def test_count():
+                assert recorder.endpoints["GET /api/1/item/{id}"].total.count == 4
+        """)
+
+        pytester.runpytest("-p", "no:cacheprovider").assert_outcomes(passed=2)
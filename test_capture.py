@@ -0,0 +1,53 @@
+"""
+Тесты фоновой записи HTTP-трафика (utils/capture.py)
+"""
+import queue
+
+from utils.capture import TrafficCapture, read_capture
+from utils.http_client import ApiClient
+from utils.items import make_item_payload
+from utils.streaming import stream_listing
+
+
+class TestTrafficCapture:
+    """Запросы и ответы пишутся фоновым потоком с привязкой к тесту"""
+
+    def test_records_requests_with_context(self, local_api_server, tmp_path):
+        capture = TrafficCapture(str(tmp_path))
+        with ApiClient(local_api_server.url) as client:
+            client.listeners.append(capture)
+            capture.context = ("test_x.py::test_y", "call")
+            client.post("item", json=make_item_payload(333333))
+            stream_listing(client, 333333)
+        capture.close()
+
+        create, listing = read_capture(capture.files)
+        assert (create["node"], create["phase"], create["status"]) == ("test_x.py::test_y", "call", 200)
+        assert create["request"]["body"]["sellerID"] == 333333
+        assert "status" in create["response"]["body"]
+        assert create["timings"]["total"] > 0
+        assert listing["endpoint"] == "GET /api/1/{sellerID}/item"
+        assert listing["response"]["body"] == "<streamed>"
+
+    def test_rotation_by_size(self, local_api_server, tmp_path):
+        capture = TrafficCapture(str(tmp_path), max_bytes=1000)
+        with ApiClient(local_api_server.url) as client:
+            client.listeners.append(capture)
+            for _ in range(6):
+                client.post("item", json=make_item_payload(333334))
+        capture.close()
+
+        assert len(capture.files) > 1
+        assert len(list(read_capture(capture.files))) == capture.records == 6
+
+    def test_full_queue_drops_instead_of_blocking(self, tmp_path):
+        capture = TrafficCapture(str(tmp_path))
+        writer_queue, capture._queue = capture._queue, queue.Queue(maxsize=1)
+        capture._queue.put(None)
+
+        capture(None, None)
+
+        assert capture.dropped == 1
+        capture._queue = writer_queue
+        capture.close()
+        assert capture.files == []
@@ -0,0 +1,77 @@
+"""
+Тесты записи и воспроизведения HTTP-трафика (utils/cassette.py)
+"""
+import pytest
+
+from utils.cassette import CassetteMissError, CassetteRecorder, install_replay
+from utils.http_client import ApiClient
+from utils.items import ItemPool, create_item, create_items, make_item_payload, make_pool_payloads
+
+
+@pytest.fixture
+def cassette_path(tmp_path, local_api_server):
+    """Кассета с созданием объявления и чтением объявлений продавца 200001"""
+    path = tmp_path / "api.jsonl"
+    recorder = CassetteRecorder(path)
+    with ApiClient(local_api_server.url) as client:
+        client.listeners.append(recorder)
+        create_item(client, make_item_payload(200001))
+        client.get("200001/item")
+    recorder.close()
+    return path
+
+
+class TestCassette:
+    """Воспроизведение не обращается к сети и подменяет sellerID"""
+
+    def test_replay_maps_seller_ids(self, cassette_path):
+        with ApiClient("http://replay.invalid") as client:
+            install_replay(client, cassette_path)
+            item = create_item(client, make_item_payload(300003))
+            response = client.get("300003/item")
+
+        assert item["sellerId"] == 300003
+        assert response.status_code == 200
+        assert [listed["id"] for listed in response.json()] == [item["id"]]
+        assert response.json()[0]["sellerId"] == 300003
+
+    def test_repeated_request_gets_last_response(self, cassette_path):
+        with ApiClient("http://replay.invalid") as client:
+            install_replay(client, cassette_path)
+            item = create_item(client, make_item_payload(300003))
+            responses = [client.get(f"item/{item['id']}") for _ in range(2)]
+
+        assert [response.json() for response in responses] == [[item], [item]]
+
+    def test_unknown_request_raises(self, cassette_path):
+        with ApiClient("http://replay.invalid") as client:
+            install_replay(client, cassette_path)
+
+            with pytest.raises(CassetteMissError):
+                client.get("statistic/0f1e2d3c")
+
+
+def test_concurrent_pool_replays_deterministically(tmp_path, local_api_server):
+    """Пул создается параллельно, а статистику читают только некоторые объявления:
+    при воспроизведении каждое объявление пула получает свой записанный id"""
+    path = tmp_path / "pool.jsonl"
+
+    def run(client, first_seller):
+        pool = ItemPool(create_items(client, make_pool_payloads(range(first_seller, first_seller + 8))))
+        items = [pool.checkout() for _ in range(8)]
+        statistics = [client.get(f"statistic/{item['id']}") for item in items[1::2]]
+        return items, statistics
+
+    recorder = CassetteRecorder(path)
+    with ApiClient(local_api_server.url) as client:
+        client.listeners.append(recorder)
+        recorded, _ = run(client, 400000)
+    recorder.close()
+
+    for attempt in range(5):
+        with ApiClient("http://replay.invalid") as client:
+            install_replay(client, path)
+            items, statistics = run(client, 500000 + attempt * 100)
+
+        assert [item["id"] for item in items] == [item["id"] for item in recorded]
+        assert [response.status_code for response in statistics] == [200] * 4
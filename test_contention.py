@@ -0,0 +1,71 @@
+"""
+Конкурентная запись объявлений одного продавца (utils/contention.py)
+
+Стресс-тест: pytest test_contention.py --stress [--stress-writes=500 --stress-levels=1,16,64,256]
+"""
+import pytest
+
+from utils.contention import parse_levels, run_contention, verify_seller_items, write_concurrently
+from utils.http_client import ApiClient
+
+SELLER_ID = 555555
+
+
+@pytest.fixture
+def stress_client(request, api_client):
+    """Клиент с пулом соединений на наибольший уровень конкурентности; в пуле api_client
+    лишние соединения закрывались бы, и таблица мерила бы их переоткрытие, а не запись.
+    Таймауты, повторы, breaker и ограничитель - общие с api_client"""
+    levels = request.config.getoption("--stress-levels")
+    with ApiClient(api_client.base_url, api_client.api_version, timeout=api_client.timeout, pool_size=max(levels),
+                   resilience=api_client.resilience, limiter=api_client.limiter) as client:
+        client.listeners.extend(api_client.listeners)
+        yield client
+
+
+@pytest.mark.stress
+class TestWriteContention:
+    """Сотни одновременных POST одного продавца без потерь, дублей и перепутанной статистики"""
+
+    def test_single_seller_write_contention(self, request, stress_client, unique_seller_id, record_property):
+        config = request.config
+        steps = run_contention(stress_client, unique_seller_id,
+                               config.getoption("--stress-writes"), config.getoption("--stress-levels"))
+        record_property("write_contention", {
+            "seller_id": unique_seller_id,
+            "levels": {step.name: step.summary() for step in steps},
+        })
+
+        errors = verify_seller_items(stress_client, unique_seller_id, steps)
+
+        assert not errors, "\n".join(errors)
+
+
+class TestContentionChecks:
+    """Проверка списка продавца находит потери и неверную статистику"""
+
+    def test_parse_levels(self):
+        assert parse_levels("1,8,32") == (1, 8, 32)
+        with pytest.raises(ValueError):
+            parse_levels("0,8")
+
+    def test_consistent_writes_pass(self, local_api_server):
+        with ApiClient(local_api_server.url) as client:
+            steps = run_contention(client, SELLER_ID, writes=20, levels=(1, 8))
+            errors = verify_seller_items(client, SELLER_ID, steps)
+
+        assert errors == []
+        assert [step.stats.count for step in steps] == [20, 20]
+        assert len({item_id for step in steps for item_id in step.ids}) == 40
+
+    def test_lost_and_corrupted_items_reported(self, local_api_server):
+        seller_id = SELLER_ID + 1
+        with ApiClient(local_api_server.url) as client:
+            step = write_concurrently(client, seller_id, writes=10, concurrency=5)
+            lost, corrupted = step.ids[:2]
+            del local_api_server.api.items[lost]
+            local_api_server.api.items[corrupted]["statistics"]["likes"] += 100
+            errors = verify_seller_items(client, seller_id, [step])
+
+        assert any("1 created items missing" in error for error in errors)
+        assert any(f"statistic of {corrupted}" in error for error in errors)
@@ -2,29 +2,42 @@
 Тесты для создания объявлений (POST /api/1/item)
 """
 import pytest
-import requests
+
+from utils.items import make_item_payload
+from utils.schemas import validate_response
+from utils.validation import REJECTED, dispatch_cases, generate_invalid_cases
+
+INVALID_CASES = generate_invalid_cases()
+
+
+@pytest.fixture(scope="module")
+def invalid_case_responses(request, api_client, seller_id_allocator):
+    """Ответы на все выбранные для запуска случаи матрицы, отправленные параллельно"""
+    selected = [
+        item.callspec.params["invalid_case"]
+        for item in request.session.items
+        if "invalid_case" in getattr(getattr(item, "callspec", None), "params", {})
+    ]
+    payload = make_item_payload(seller_id_allocator.allocate())
+    return dispatch_cases(api_client, selected, payload,
+                          max_workers=request.config.getoption("--item-pool-workers"))
 
 
 class TestCreateItem:
     """Тесты для эндпоинта создания объявлений"""
 
-    BASE_URL = "https://qa-internship.avito.com"
-    API_VERSION = "1"
-
     @pytest.fixture
     def endpoint(self):
-        return f"{self.BASE_URL}/api/{self.API_VERSION}/item"
+        return "item"
 
-    def test_create_item_success(self, endpoint, sample_item_data):
+    def test_create_item_success(self, api_client, endpoint, sample_item_data):
         """TC-1.1: Успешное создание объявления со всеми обязательными полями"""
-        response = requests.post(
-            endpoint,
-            json=sample_item_data,
-            headers={"Content-Type": "application/json", "Accept": "application/json"}
-        )
+        response = api_client.post(endpoint, json=sample_item_data)
 
         assert response.status_code == 200, f"Expected 200, got {response.status_code}. Response: {response.text}"
-        
+        error = validate_response(response)
+        assert error is None, error
+
         data = response.json()
         
         # API может возвращать объект с полем "status" или объект с данными
@@ -36,10 +49,7 @@ class TestCreateItem:
                 if " - " in status_text:
                     item_id = status_text.split(" - ")[-1]
                     # Получаем объявление по id для проверки
-                    get_response = requests.get(
-                        f"{self.BASE_URL}/api/{self.API_VERSION}/item/{item_id}",
-                        headers={"Accept": "application/json"}
-                    )
+                    get_response = api_client.get(f"item/{item_id}")
                     if get_response.status_code == 200:
                         items = get_response.json()
                         if isinstance(items, list) and len(items) > 0:
@@ -89,203 +99,43 @@ class TestCreateItem:
             assert isinstance(item["createdAt"], str), "createdAt should be a string"
             assert item["createdAt"], "createdAt should not be empty"
 
-    def test_create_item_without_seller_id(self, endpoint, sample_item_data):
-        """TC-1.2: Создание объявления без обязательного поля sellerID"""
-        data = sample_item_data.copy()
-        del data["sellerID"]
-        
-        response = requests.post(
-            endpoint,
-            json=data,
-            headers={"Content-Type": "application/json", "Accept": "application/json"}
-        )
-
-        assert response.status_code == 400, f"Expected 400, got {response.status_code}. Response: {response.text}"
-        
-        error_data = response.json()
-        assert "result" in error_data, "Response should contain 'result' field"
-        assert "status" in error_data, "Response should contain 'status' field"
-
-    def test_create_item_without_name(self, endpoint, sample_item_data):
-        """TC-1.3: Создание объявления без обязательного поля name"""
-        data = sample_item_data.copy()
-        del data["name"]
-        
-        response = requests.post(
-            endpoint,
-            json=data,
-            headers={"Content-Type": "application/json", "Accept": "application/json"}
-        )
-
-        assert response.status_code == 400, f"Expected 400, got {response.status_code}. Response: {response.text}"
-        
-        error_data = response.json()
-        assert "result" in error_data, "Response should contain 'result' field"
-        assert "status" in error_data, "Response should contain 'status' field"
-
-    def test_create_item_without_price(self, endpoint, sample_item_data):
-        """TC-1.4: Создание объявления без обязательного поля price"""
-        data = sample_item_data.copy()
-        del data["price"]
-        
-        response = requests.post(
-            endpoint,
-            json=data,
-            headers={"Content-Type": "application/json", "Accept": "application/json"}
-        )
-
-        assert response.status_code == 400, f"Expected 400, got {response.status_code}. Response: {response.text}"
-        
-        error_data = response.json()
-        assert "result" in error_data, "Response should contain 'result' field"
-        assert "status" in error_data, "Response should contain 'status' field"
-
-    def test_create_item_without_statistics(self, endpoint, sample_item_data):
-        """TC-1.5: Создание объявления без обязательного поля statistics"""
-        data = sample_item_data.copy()
-        del data["statistics"]
-        
-        response = requests.post(
-            endpoint,
-            json=data,
-            headers={"Content-Type": "application/json", "Accept": "application/json"}
-        )
-
-        assert response.status_code == 400, f"Expected 400, got {response.status_code}. Response: {response.text}"
-        
-        error_data = response.json()
-        assert "result" in error_data, "Response should contain 'result' field"
-        assert "status" in error_data, "Response should contain 'status' field"
-
-    def test_create_item_without_likes(self, endpoint, sample_item_data):
-        """TC-1.6: Создание объявления с неполной статистикой (без likes)"""
-        data = sample_item_data.copy()
-        del data["statistics"]["likes"]
-        
-        response = requests.post(
-            endpoint,
-            json=data,
-            headers={"Content-Type": "application/json", "Accept": "application/json"}
-        )
-
-        assert response.status_code == 400, f"Expected 400, got {response.status_code}. Response: {response.text}"
-
-    def test_create_item_without_view_count(self, endpoint, sample_item_data):
-        """TC-1.7: Создание объявления с неполной статистикой (без viewCount)"""
-        data = sample_item_data.copy()
-        del data["statistics"]["viewCount"]
-        
-        response = requests.post(
-            endpoint,
-            json=data,
-            headers={"Content-Type": "application/json", "Accept": "application/json"}
-        )
-
-        assert response.status_code == 400, f"Expected 400, got {response.status_code}. Response: {response.text}"
-
-    def test_create_item_without_contacts(self, endpoint, sample_item_data):
-        """TC-1.8: Создание объявления с неполной статистикой (без contacts)"""
-        data = sample_item_data.copy()
-        del data["statistics"]["contacts"]
-        
-        response = requests.post(
-            endpoint,
-            json=data,
-            headers={"Content-Type": "application/json", "Accept": "application/json"}
-        )
-
-        assert response.status_code == 400, f"Expected 400, got {response.status_code}. Response: {response.text}"
-
-    def test_create_item_with_string_seller_id(self, endpoint, sample_item_data):
-        """TC-1.9: Создание объявления с некорректным типом данных для sellerID"""
-        data = sample_item_data.copy()
-        data["sellerID"] = "not_a_number"
-        
-        response = requests.post(
-            endpoint,
-            json=data,
-            headers={"Content-Type": "application/json", "Accept": "application/json"}
-        )
-
-        assert response.status_code == 400, f"Expected 400, got {response.status_code}. Response: {response.text}"
+    @pytest.mark.parametrize("invalid_case", INVALID_CASES, ids=lambda case: case.case_id)
+    def test_create_item_invalid_payload(self, invalid_case, invalid_case_responses):
+        """TC-1.2 - TC-1.12: Создание объявления с невалидным телом запроса (матрица по схеме)"""
+        response = invalid_case_responses[invalid_case.case_id]
 
-    def test_create_item_with_string_price(self, endpoint, sample_item_data):
-        """TC-1.10: Создание объявления с некорректным типом данных для price"""
-        data = sample_item_data.copy()
-        data["price"] = "not_a_number"
-        
-        response = requests.post(
-            endpoint,
-            json=data,
-            headers={"Content-Type": "application/json", "Accept": "application/json"}
-        )
-
-        assert response.status_code == 400, f"Expected 400, got {response.status_code}. Response: {response.text}"
-
-    def test_create_item_with_negative_price(self, endpoint, sample_item_data):
-        """TC-1.11: Создание объявления с отрицательным значением price"""
-        data = sample_item_data.copy()
-        data["price"] = -100
-        
-        response = requests.post(
-            endpoint,
-            json=data,
-            headers={"Content-Type": "application/json", "Accept": "application/json"}
-        )
-        
-        # Может быть 200 или 400 в зависимости от бизнес-логики
-        assert response.status_code in [200, 400], f"Unexpected status code: {response.status_code}"
+        assert response.status_code in invalid_case.expected, \
+            f"Expected {invalid_case.expected}, got {response.status_code}. Response: {response.text}"
 
-    def test_create_item_with_empty_name(self, endpoint, sample_item_data):
-        """TC-1.12: Создание объявления с пустой строкой в name"""
-        data = sample_item_data.copy()
-        data["name"] = ""
-        
-        response = requests.post(
-            endpoint,
-            json=data,
-            headers={"Content-Type": "application/json", "Accept": "application/json"}
-        )
-        
-        # Может быть 200 или 400 в зависимости от бизнес-логики
-        assert response.status_code in [200, 400], f"Unexpected status code: {response.status_code}"
+        if invalid_case.expected == REJECTED:
+            error_data = response.json()
+            assert "result" in error_data, "Response should contain 'result' field"
+            assert "status" in error_data, "Response should contain 'status' field"
 
-    def test_create_item_with_min_seller_id(self, endpoint, sample_item_data):
+    def test_create_item_with_min_seller_id(self, api_client, endpoint, sample_item_data):
         """TC-6.1: Создание объявления с минимальным sellerID (111111)"""
         data = sample_item_data.copy()
         data["sellerID"] = 111111
         
-        response = requests.post(
-            endpoint,
-            json=data,
-            headers={"Content-Type": "application/json", "Accept": "application/json"}
-        )
+        response = api_client.post(endpoint, json=data)
 
         assert response.status_code == 200, f"Expected 200, got {response.status_code}. Response: {response.text}"
 
-    def test_create_item_with_max_seller_id(self, endpoint, sample_item_data):
+    def test_create_item_with_max_seller_id(self, api_client, endpoint, sample_item_data):
         """TC-6.2: Создание объявления с максимальным sellerID (999999)"""
         data = sample_item_data.copy()
         data["sellerID"] = 999999
         
-        response = requests.post(
-            endpoint,
-            json=data,
-            headers={"Content-Type": "application/json", "Accept": "application/json"}
-        )
+        response = api_client.post(endpoint, json=data)
 
         assert response.status_code == 200, f"Expected 200, got {response.status_code}. Response: {response.text}"
 
-    def test_create_item_with_zero_price(self, endpoint, sample_item_data):
+    def test_create_item_with_zero_price(self, api_client, endpoint, sample_item_data):
         """TC-6.3: Создание объявления с нулевым price"""
         data = sample_item_data.copy()
         data["price"] = 0
         
-        response = requests.post(
-            endpoint,
-            json=data,
-            headers={"Content-Type": "application/json", "Accept": "application/json"}
-        )
+        response = api_client.post(endpoint, json=data)
         
         # Может быть 200 или 400 в зависимости от бизнес-логики
         assert response.status_code in [200, 400], f"Unexpected status code: {response.status_code}"
@@ -0,0 +1,136 @@
+"""
+Тесты прокси с внесением задержек и сбоев (utils/fault_proxy.py)
+"""
+import random
+import time
+
+import pytest
+import requests
+
+from utils.fault_proxy import FaultProxy, parse_fault
+from utils.http_client import ApiClient
+from utils.items import create_item, make_item_payload
+from utils.resilience import ResiliencePolicy, RetryPolicy
+from utils.schemas import validate_error
+
+SELLER_ID = 666666
+
+
+@pytest.fixture
+def make_proxy(local_api_server):
+    proxies = []
+
+    def make(*specs, seed=0):
+        proxy = FaultProxy(local_api_server.url, [parse_fault(spec) for spec in specs], seed=seed).start()
+        proxies.append(proxy)
+        return proxy
+
+    yield make
+    for proxy in proxies:
+        proxy.stop()
+
+
+class TestParseFault:
+    """Правила разбираются из строк опций"""
+
+    def test_endpoint_rule(self):
+        rule = parse_fault("GET /api/1/item/{id}: latency=uniform(10,20), error=503@0.25, burst=429x2/10")
+
+        assert rule.endpoint == "GET /api/1/item/{id}"
+        assert rule.error == (503, 0.25)
+        assert rule.burst == (429, 2, 10)
+        assert 0.01 <= rule.latency(random) <= 0.02
+
+    def test_rule_for_all_endpoints(self):
+        rule = parse_fault("bandwidth=16k, drip=500, reset=0.1")
+
+        assert (rule.endpoint, rule.bandwidth, rule.drip, rule.reset) == ("*", 16384, 0.5, 0.1)
+
+    @pytest.mark.parametrize("spec", ["latency=gamma(1,2)", "burst=503", "timeout=5", "nothing"])
+    def test_invalid_rule(self, spec):
+        with pytest.raises(ValueError):
+            parse_fault(spec)
+
+
+class TestFaultProxy:
+    """Сбои вносятся только в запросы подходящих эндпоинтов и воспроизводимы"""
+
+    def test_forwards_without_faults(self, make_proxy):
+        proxy = make_proxy()
+        with ApiClient(proxy.url) as client:
+            item = create_item(client, make_item_payload(SELLER_ID))
+            response = client.get(f"{SELLER_ID}/item")
+
+        assert response.status_code == 200
+        assert item["id"] in {listed["id"] for listed in response.json()}
+
+    def test_burst_is_deterministic_and_scoped(self, make_proxy):
+        proxy = make_proxy("GET /api/1/{sellerID}/item: burst=503x2/4")
+        with ApiClient(proxy.url) as client:
+            statuses = [client.get(f"{SELLER_ID}/item").status_code for _ in range(6)]
+            created = client.post("item", json=make_item_payload(SELLER_ID))
+
+        assert statuses == [503, 503, 200, 200, 503, 503]
+        assert created.status_code == 200
+        assert proxy.injected["status 503"] == 4
+
+    def test_throttling_response_format(self, make_proxy):
+        proxy = make_proxy("error=429@1")
+        response = requests.get(f"{proxy.url}/api/1/{SELLER_ID}/item")
+
+        assert response.status_code == 429
+        assert response.headers["Retry-After"] == "1"
+        assert validate_error(response.json()) is None
+
+    def test_random_errors_repeat_with_seed(self, make_proxy):
+        def statuses(seed):
+            proxy = make_proxy("error=500@0.5", seed=seed)
+            return [requests.get(f"{proxy.url}/api/1/{SELLER_ID}/item").status_code for _ in range(12)]
+
+        first = statuses(3)
+        assert first == statuses(3)
+        assert set(first) == {200, 500}
+
+    def test_latency(self, make_proxy):
+        proxy = make_proxy("latency=150")
+        started = time.perf_counter()
+        requests.get(f"{proxy.url}/api/1/{SELLER_ID}/item")
+
+        assert time.perf_counter() - started >= 0.15
+
+    def test_drip_delays_body_not_headers(self, make_proxy):
+        proxy = make_proxy("drip=400")
+        started = time.perf_counter()
+        response = requests.get(f"{proxy.url}/api/1/{SELLER_ID}/item")
+
+        assert response.elapsed.total_seconds() < 0.2
+        assert time.perf_counter() - started >= 0.4
+        assert response.status_code == 200
+
+    def test_bandwidth_cap(self, make_proxy):
+        with ApiClient(make_proxy().url) as client:
+            for _ in range(10):
+                client.post("item", json=make_item_payload(SELLER_ID + 1))
+        proxy = make_proxy("bandwidth=4k")
+        started = time.perf_counter()
+        response = requests.get(f"{proxy.url}/api/1/{SELLER_ID + 1}/item")
+
+        assert len(response.content) > 2000
+        assert time.perf_counter() - started >= len(response.content) / 4096 * 0.9
+
+    def test_reset_after_backend_processed_request(self, make_proxy, local_api_server):
+        proxy = make_proxy("POST /api/1/item: reset=1")
+        items_before = len(local_api_server.api.items)
+
+        with pytest.raises(requests.ConnectionError):
+            requests.post(f"{proxy.url}/api/1/item", json=make_item_payload(SELLER_ID))
+        assert len(local_api_server.api.items) == items_before + 1
+
+    def test_client_retries_through_injected_errors(self, make_proxy):
+        proxy = make_proxy("burst=503x1/2")
+        policy = ResiliencePolicy(retry=RetryPolicy(retries=2, base_delay=0))
+        with ApiClient(proxy.url, resilience=policy) as client:
+            response = client.get(f"{SELLER_ID}/item")
+
+        assert response.status_code == 200
+        assert policy.stats.retries == 1
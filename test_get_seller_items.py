@@ -2,66 +2,41 @@
 Тесты для получения всех объявлений продавца (GET /api/1/{sellerID}/item)
 """
 import pytest
-import requests
+
+from utils.streaming import check_listing_item, stream_listing
 
 
 class TestGetSellerItems:
     """Тесты для эндпоинта получения всех объявлений продавца"""
 
-    BASE_URL = "https://qa-internship.avito.com"
-    API_VERSION = "1"
-
-    def test_get_seller_items_success(self, base_url, api_version, unique_seller_id, sample_item_data):
+    @pytest.mark.latency_budget(max_ms=1500, endpoint="GET /api/1/{sellerID}/item")
+    def test_get_seller_items_success(self, api_client, unique_seller_id, item_factory):
         """TC-3.1: Успешное получение всех объявлений продавца"""
         # Создаем несколько объявлений с одинаковым sellerID
-        created_items = []
-        for i in range(3):
-            data = sample_item_data.copy()
-            data["sellerID"] = unique_seller_id
-            data["name"] = f"testItem_{i}"
-            
-            response = requests.post(
-                f"{base_url}/api/{api_version}/item",
-                json=data,
-                headers={"Content-Type": "application/json", "Accept": "application/json"}
-            )
-            assert response.status_code == 200, f"Failed to create item {i}: {response.text}"
-            item_data = response.json()
-            if isinstance(item_data, list):
-                item_data = item_data[0]
-            created_items.append(item_data)
-
-        # Получаем все объявления продавца
-        response = requests.get(
-            f"{base_url}/api/{api_version}/{unique_seller_id}/item",
-            headers={"Accept": "application/json"}
-        )
+        created_items = item_factory(unique_seller_id, 3)
+        missing_ids = {item["id"] for item in created_items}
+
+        def validate(item, seller_id):
+            if isinstance(item, dict):
+                missing_ids.discard(item.get("id"))
+            return check_listing_item(item, seller_id)
+
+        # Получаем все объявления продавца, проверяя элементы по мере чтения ответа
+        response, check = stream_listing(api_client, unique_seller_id, validate=validate)
+
+        assert response.status_code == 200, f"Expected 200, got {response.status_code}"
 
-        assert response.status_code == 200, f"Expected 200, got {response.status_code}. Response: {response.text}"
-        
-        data = response.json()
-        assert isinstance(data, list), "Response should be an array"
-        
         # Проверяем, что все созданные объявления присутствуют
-        assert len(data) >= 3, f"Expected at least 3 items, got {len(data)}"
-        
-        # Проверяем, что все элементы имеют правильный sellerId
-        for item in data:
-            assert "sellerId" in item, "Each item should have sellerId"
-            assert item["sellerId"] == unique_seller_id, f"All items should have sellerId={unique_seller_id}"
-            
-            # Проверка обязательных полей
-            required_fields = ["id", "sellerId", "name", "price", "statistics", "createdAt"]
-            for field in required_fields:
-                assert field in item, f"Field '{field}' is missing in item"
-
-    def test_get_nonexistent_seller_items(self):
+        assert check.count >= 3, f"Expected at least 3 items, got {check.count}"
+        assert not missing_ids, f"Created items missing from listing: {sorted(missing_ids)}"
+
+        # Все элементы имеют обязательные поля и правильный sellerId
+        assert check.failures == 0, check.describe()
+
+    def test_get_nonexistent_seller_items(self, api_client):
         """TC-3.2: Получение объявлений несуществующего продавца"""
         # Используем sellerID, который точно не существует (вне диапазона)
-        response = requests.get(
-            f"{self.BASE_URL}/api/{self.API_VERSION}/111110/item",
-            headers={"Accept": "application/json"}
-        )
+        response = api_client.get("111110/item")
 
         assert response.status_code == 200, f"Expected 200, got {response.status_code}. Response: {response.text}"
         
@@ -69,22 +44,16 @@ class TestGetSellerItems:
         assert isinstance(data, list), "Response should be an array"
         # API может возвращать объявления других пользователей, поэтому проверяем только тип
 
-    def test_get_seller_items_with_string_seller_id(self):
+    def test_get_seller_items_with_string_seller_id(self, api_client):
         """TC-3.3: Получение объявлений продавца с некорректным типом sellerID"""
-        response = requests.get(
-            f"{self.BASE_URL}/api/{self.API_VERSION}/abc/item",
-            headers={"Accept": "application/json"}
-        )
+        response = api_client.get("abc/item")
 
         # Может быть 400 или 404
         assert response.status_code in [400, 404], f"Unexpected status code: {response.status_code}"
 
-    def test_get_seller_items_with_negative_seller_id(self):
+    def test_get_seller_items_with_negative_seller_id(self, api_client):
         """TC-3.4: Получение объявлений продавца с отрицательным sellerID"""
-        response = requests.get(
-            f"{self.BASE_URL}/api/{self.API_VERSION}/-123/item",
-            headers={"Accept": "application/json"}
-        )
+        response = api_client.get("-123/item")
 
         # Может быть 400 или 200 в зависимости от бизнес-логики
         assert response.status_code in [200, 400], f"Unexpected status code: {response.status_code}"
@@ -0,0 +1,59 @@
+"""
+Тесты кэша объявлений между запусками (utils/item_cache.py)
+"""
+import pytest
+
+from utils.http_client import ApiClient
+from utils.item_cache import ItemCache
+from utils.items import make_item_payload
+
+SELLER_ID = 444444
+
+
+@pytest.fixture
+def payloads():
+    return [make_item_payload(SELLER_ID, name=f"poolItem_{index}") for index in range(4)]
+
+
+def run_with_cache(path, client, payloads):
+    """Один "запуск": загрузка кэша, проверка, добор объявлений и сохранение"""
+    cache = ItemCache(path, client.base_url)
+    cache.validate(client)
+    items = cache.get_or_create(client, payloads)
+    cache.save()
+    return cache, items
+
+
+class TestItemCache:
+    """Объявления прошлых запусков переиспользуются, пропавшие создаются заново"""
+
+    def test_second_run_reuses_items(self, local_api_server, tmp_path, payloads):
+        path = str(tmp_path / "items.json")
+        with ApiClient(local_api_server.url) as client:
+            first, first_items = run_with_cache(path, client, payloads)
+            created_before = len(local_api_server.api.items)
+            second, second_items = run_with_cache(path, client, payloads)
+
+        assert (first.created, first.reused) == (4, 0)
+        assert (second.created, second.reused) == (0, 4)
+        assert len(local_api_server.api.items) == created_before
+        assert [item["id"] for item in second_items] == [item["id"] for item in first_items]
+
+    def test_missing_item_is_recreated(self, local_api_server, tmp_path, payloads):
+        path = str(tmp_path / "items.json")
+        with ApiClient(local_api_server.url) as client:
+            _, items = run_with_cache(path, client, payloads)
+            del local_api_server.api.items[items[1]["id"]]
+            cache = ItemCache(path, client.base_url)
+
+            assert cache.validate(client) == 1
+            cache.get_or_create(client, payloads)
+
+        assert (cache.created, cache.reused) == (1, 3)
+
+    def test_other_base_url_is_ignored(self, local_api_server, tmp_path, payloads):
+        path = str(tmp_path / "items.json")
+        with ApiClient(local_api_server.url) as client:
+            run_with_cache(path, client, payloads)
+
+        assert ItemCache(path, "http://other-host").entries == {}
@@ -0,0 +1,74 @@
+"""
+Тесты вспомогательных функций для объявлений (utils/items.py)
+"""
+from pathlib import Path
+
+import pytest
+
+from utils.http_client import ApiClient
+from utils.items import ItemPool, create_seller_items, extract_item_id
+
+pytest_plugins = ["pytester"]
+
+ROOT_DIR = Path(__file__).parent
+
+POOL_TESTS = """
+import pytest
+
+@pytest.mark.parametrize("index", range({consumers}))
+def test_reads_pooled_item(pooled_item, index):
+    assert pooled_item["id"]
+
+@pytest.mark.benchmark
+@pytest.mark.parametrize("index", range(3))
+def test_skipped_without_benchmark(pooled_item, index):
+    pass
+
+def test_pool_size(item_pool):
+    assert len(item_pool) == {expected}
+"""
+
+
+class TestItemsHelpers:
+    """Разбор ответов POST /api/1/item и пул объявлений"""
+
+    @pytest.mark.parametrize("response_data, expected_id", [
+        ({"status": "Сохранили объявление - 0f1e2d3c"}, "0f1e2d3c"),
+        ({"id": "0f1e2d3c"}, "0f1e2d3c"),
+        ([{"id": "0f1e2d3c"}], "0f1e2d3c"),
+        ({"status": "400"}, None),
+        ([], None),
+    ])
+    def test_extract_item_id(self, response_data, expected_id):
+        assert extract_item_id(response_data) == expected_id
+
+    def test_pool_reuses_items_when_exhausted(self):
+        pool = ItemPool([{"id": "a"}, {"id": "b"}])
+
+        ids = [pool.checkout()["id"] for _ in range(3)]
+
+        assert ids == ["a", "b", "a"]
+
+    @pytest.mark.parametrize("seller_id, fetch", [(200002, True), (200003, False)])
+    def test_create_seller_items_concurrently(self, local_api_server, seller_id, fetch):
+        with ApiClient(local_api_server.url) as client:
+            items = create_seller_items(client, seller_id, 20, max_workers=5, fetch=fetch)
+            listed = client.get(f"{seller_id}/item").json()
+
+        assert [item["name"] for item in items] == [f"testItem_{index}" for index in range(20)]
+        assert {item["id"] for item in items} == {item["id"] for item in listed}
+        assert ("createdAt" in items[0]) is fetch
+
+    @pytest.mark.parametrize("consumers, extra_args, expected", [
+        (2, [], 2),
+        (10, [], 4),
+        (10, ["--item-pool-size=6"], 6),
+    ])
+    def test_pool_size_counts_only_running_consumers(self, pytester, consumers, extra_args, expected):
+        pytester.syspathinsert(ROOT_DIR)
+        pytester.makeconftest((ROOT_DIR / "conftest.py").read_text(encoding="utf-8"))
+        pytester.makepyfile(test_pool=POOL_TESTS.format(consumers=consumers, expected=expected))
+
+        result = pytester.runpytest("-p", "no:cacheprovider", "--local-api", *extra_args)
+
+        result.assert_outcomes(passed=consumers + 1, skipped=3)
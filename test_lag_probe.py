@@ -0,0 +1,118 @@
+"""
+Тесты замера задержки видимости (utils/lag_probe.py)
+"""
+import itertools
+import threading
+import time
+
+import requests
+
+from utils.http_client import ApiClient
+from utils.lag_probe import AdaptiveBackoff, VisibilityProbe, poll_until
+
+
+class SlowListingProbe(VisibilityProbe):
+    """Список продавца показывает объявление через listing_lag после первого запроса"""
+
+    def __init__(self, client, listing_lag, **kwargs):
+        super().__init__(client, **kwargs)
+        self.listing_lag = listing_lag
+        self._first_seen = {}
+        self._lock = threading.Lock()
+
+    def _in_listing(self, seller_id, item_id):
+        with self._lock:
+            first_seen = self._first_seen.setdefault(item_id, time.perf_counter())
+        return time.perf_counter() - first_seen >= self.listing_lag and super()._in_listing(seller_id, item_id)
+
+
+class TestLagProbe:
+    """Адаптивный опрос и сводка по ступеням частоты записи"""
+
+    def test_backoff_grows_to_max_delay(self):
+        backoff = AdaptiveBackoff(min_delay=0.01, max_delay=0.05, factor=2)
+
+        assert list(itertools.islice(backoff.delays(), 5)) == [0.01, 0.02, 0.04, 0.05, 0.05]
+
+    def test_backoff_starts_from_observed_lag(self):
+        backoff = AdaptiveBackoff(min_delay=0.01)
+        for lag in (0.4, 0.8, 1.2):
+            backoff.observe(lag)
+
+        assert next(backoff.delays()) == 0.2
+
+    def test_poll_until_visible(self):
+        answers = iter([False, False, True])
+
+        lag = poll_until(lambda: next(answers), AdaptiveBackoff(min_delay=0.001), timeout=1)
+
+        assert lag is not None and lag >= 0.002
+
+    def test_poll_until_timeout(self):
+        assert poll_until(lambda: False, AdaptiveBackoff(min_delay=0.01), timeout=0.05) is None
+
+    def test_run_step_on_local_api(self, local_api_server):
+        with ApiClient(local_api_server.url) as client:
+            summaries = VisibilityProbe(client, timeout=1).run_step(rate=50, duration=0.2)
+
+        assert set(summaries) == {"50/s seller_items", "50/s statistic"}
+        for summary in summaries.values():
+            assert summary["requests"] == 10
+            assert summary["errors"] == 0
+
+    def test_endpoints_are_polled_independently(self, local_api_server):
+        with ApiClient(local_api_server.url) as client:
+            probe = SlowListingProbe(client, listing_lag=0.3, timeout=1)
+            summaries = probe.run_step(rate=20, duration=0.2)
+
+        assert summaries["20/s seller_items"]["p50"] >= 300
+        assert summaries["20/s statistic"]["p50"] < 100
+
+    def test_slow_polling_does_not_stall_writes(self, local_api_server):
+        with ApiClient(local_api_server.url) as client:
+            probe = SlowListingProbe(client, listing_lag=10, timeout=0.3, max_workers=2)
+            started = time.perf_counter()
+            summaries = probe.run_step(rate=50, duration=0.4)
+            elapsed = time.perf_counter() - started
+
+        listing, statistic = summaries["50/s seller_items"], summaries["50/s statistic"]
+        assert listing["errors"] == listing["requests"] == 20
+        assert statistic["errors"] == 0
+        assert 35 < listing["rps"] < 65
+        # Последняя запись через 0.4 с и ее опрос до timeout, а не 20 опросов по 0.3 с на 2 потока
+        assert elapsed < 1.5
+
+    def test_request_errors_are_counted_not_raised(self, local_api_server):
+        class FlakyProbe(VisibilityProbe):
+            """Каждая вторая запись и первые два запроса списка на объявление падают"""
+
+            def __init__(self, client, **kwargs):
+                super().__init__(client, **kwargs)
+                self.writes = itertools.count()
+                self.listing_calls = {}
+                self._lock = threading.Lock()
+
+            def _in_listing(self, seller_id, item_id):
+                with self._lock:
+                    calls = self.listing_calls[item_id] = self.listing_calls.get(item_id, 0) + 1
+                if calls <= 2:
+                    raise requests.Timeout("read timed out")
+                return super()._in_listing(seller_id, item_id)
+
+        with ApiClient(local_api_server.url) as client:
+            probe = FlakyProbe(client, timeout=1)
+            post = client.post
+
+            def flaky_post(path, **kwargs):
+                if next(probe.writes) % 2:
+                    raise requests.ConnectionError("connection reset")
+                return post(path, **kwargs)
+
+            client.post = flaky_post
+            summaries = probe.run_step(rate=50, duration=0.2)
+
+        listing, statistic = summaries["50/s seller_items"], summaries["50/s statistic"]
+        assert listing["failed_writes"] == statistic["failed_writes"] == 5
+        assert listing["requests"] == 5 and listing["errors"] == 0
+        assert listing["failed_polls"] == 10
+        assert statistic["failed_polls"] == 0
@@ -0,0 +1,42 @@
+"""
+Тесты нагрузочного прогона (utils/load.py) на локальной заглушке API
+"""
+import asyncio
+
+import pytest
+
+from utils.http_client import ApiClient
+from utils.items import extract_item_id
+from utils.load import ENDPOINTS, ItemApiOperations, parse_mix, run_load
+
+
+class TestLoadRunner:
+    """Нагрузочный прогон собирает статистику по каждому эндпоинту"""
+
+    def test_parse_mix(self):
+        assert parse_mix("create=1,get_item=4") == {"create": 1.0, "get_item": 4.0}
+
+    def test_parse_mix_unknown_endpoint(self):
+        with pytest.raises(ValueError):
+            parse_mix("delete=1")
+
+    def test_run_load_by_request_count(self, local_api_server):
+        with ApiClient(local_api_server.url) as client:
+            result = asyncio.run(run_load(client, concurrency=4, total_requests=60, seed_items=2))
+
+        summaries = result.summaries()
+        assert set(summaries) == set(ENDPOINTS)
+        assert sum(summary["requests"] for summary in summaries.values()) == 60
+        assert all(summary["errors"] == 0 for summary in summaries.values())
+        assert all(summary["p99"] >= summary["p50"] for summary in summaries.values() if summary["requests"])
+
+    def test_known_items_are_bounded(self, local_api_server):
+        with ApiClient(local_api_server.url) as client:
+            operations = ItemApiOperations(client, max_known_items=5)
+            created = [operations.create().json() for _ in range(20)]
+            response = operations.get_item()
+
+        assert len(operations.known_items) == 5
+        assert [item_id for item_id, _ in operations.known_items] == [
+            extract_item_id(data) for data in created[-5:]]
+        assert response.status_code == 200
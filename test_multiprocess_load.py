@@ -0,0 +1,54 @@
+"""
+Тесты нагрузочного прогона в нескольких процессах (utils/multiprocess_load.py)
+"""
+import pytest
+
+from utils.histogram import LatencyHistogram
+from utils.multiprocess_load import merge_worker_results, run_multiprocess_load, split_evenly
+
+
+def worker_result(elapsed, latencies, errors=0):
+    histogram = LatencyHistogram()
+    for latency in latencies:
+        histogram.add(latency)
+    for _ in range(errors):
+        histogram.add(1.0, ok=False)
+    return {"elapsed": elapsed, "histograms": {"get_item": histogram.to_dict()}}
+
+
+class TestMultiProcessLoad:
+    """Процессы гоняют нагрузку независимо, статистика объединяется"""
+
+    def test_split_evenly(self):
+        assert split_evenly(10, 4) == [3, 3, 2, 2]
+
+    def test_merge_worker_results(self):
+        result = merge_worker_results([
+            worker_result(2.0, [0.01] * 90),
+            worker_result(2.5, [0.2] * 10, errors=5),
+        ])
+
+        histogram = result.stats["get_item"]
+        assert (result.workers, result.elapsed) == (2, 2.5)
+        assert (histogram.count, histogram.errors) == (105, 5)
+        assert histogram.percentile(50) == pytest.approx(0.01, rel=0.01)
+        assert histogram.percentile(95) == pytest.approx(0.2, rel=0.01)
+
+    def test_closed_loop_by_request_count(self, local_api_server):
+        result = run_multiprocess_load(local_api_server.url, processes=2, concurrency=4,
+                                       total_requests=60, seed_items=2)
+
+        summaries = result.summaries()
+        assert result.workers == 2
+        assert sum(summary["requests"] for summary in summaries.values()) == 60
+        assert all(summary["errors"] == 0 for summary in summaries.values())
+
+    def test_open_loop_rate_is_shared(self, local_api_server):
+        result = run_multiprocess_load(local_api_server.url, processes=2, concurrency=4,
+                                       duration=1, rate=40, seed_items=2)
+
+        assert sum(stats.count for stats in result.stats.values()) == 40
+
+    def test_worker_failure_is_reported(self):
+        with pytest.raises(RuntimeError, match="Load workers failed"):
+            run_multiprocess_load("http://127.0.0.1:9", processes=2, concurrency=1, total_requests=2, seed_items=1)
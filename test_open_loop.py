@@ -0,0 +1,88 @@
+"""
+Тесты прогона с открытой моделью поступления запросов (utils/open_loop.py)
+"""
+import asyncio
+import gc
+import random
+import threading
+import time
+import weakref
+
+import pytest
+
+from utils.http_client import ApiClient
+from utils.open_loop import arrival_offsets, run_open_loop
+from utils.stub_server import StubApi, StubServer
+
+
+class StallingApi(StubApi):
+    """Заглушка, которая один раз "зависает" на stall секунд после seed-объявлений"""
+
+    def __init__(self, stall, after):
+        super().__init__()
+        self.stall = stall
+        self.after = after
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def handle(self, method, path, body=None):
+        with self._lock:
+            self.calls += 1
+            stalled = self.calls == self.after
+        if stalled:
+            time.sleep(self.stall)
+        return super().handle(method, path, body)
+
+
+class TestOpenLoop:
+    """Запросы уходят по расписанию, задержка считается от запланированной отправки"""
+
+    def test_fixed_arrivals(self):
+        offsets = list(arrival_offsets(rate=10, duration=1))
+
+        assert len(offsets) == 10
+        assert offsets[1] == pytest.approx(0.1)
+
+    def test_poisson_arrivals_match_rate(self):
+        offsets = list(arrival_offsets(rate=1000, duration=10, arrival="poisson", rng=random.Random(21)))
+
+        assert len(offsets) == pytest.approx(10000, rel=0.03)
+        assert offsets == sorted(offsets)
+
+    def test_stall_is_counted_for_queued_requests(self):
+        # Один поток: пока он ждет зависший ответ, остальные запросы стоят в очереди
+        with StubServer(api=StallingApi(stall=0.4, after=3)) as server, ApiClient(server.url) as client:
+            result = asyncio.run(run_open_loop(client, rate=50, duration=1, mix={"get_item": 1},
+                                               max_workers=1, seed_items=2))
+
+        latency, service = result.stats["get_item"], result.service_stats["get_item"]
+        assert result.scheduled == latency.count == 50
+        assert latency.errors == 0
+        assert latency.percentile(90) > 0.1
+        assert service.percentile(90) < 0.1
+        assert service.max >= 0.4
+
+    def test_finished_requests_are_released(self, local_api_server, monkeypatch):
+        created = []
+        create_task = asyncio.create_task
+
+        def tracking_create_task(coro):
+            task = create_task(coro)
+            created.append(weakref.ref(task))
+            return task
+
+        monkeypatch.setattr(asyncio, "create_task", tracking_create_task)
+
+        async def run_and_count_retained(client):
+            run = create_task(run_open_loop(client, rate=200, duration=1, mix={"get_item": 1}, seed_items=2))
+            await asyncio.sleep(0.8)
+            gc.collect()
+            retained = sum(1 for ref in created if ref() is not None and ref().done())
+            return await run, retained
+
+        with ApiClient(local_api_server.url) as client:
+            result, retained = asyncio.run(run_and_count_retained(client))
+
+        assert result.scheduled == 200
+        assert len(created) > 100
+        assert retained < 10
@@ -0,0 +1,125 @@
+"""
+Тесты повторов, таймаутов и circuit breaker (utils/resilience.py)
+"""
+import pytest
+import requests
+from requests.adapters import BaseAdapter
+
+from utils.http_client import ApiClient
+from utils.resilience import CircuitBreaker, CircuitOpenError, ResiliencePolicy, RetryPolicy, parse_endpoint_timeout
+
+
+class ScriptedAdapter(BaseAdapter):
+    """Транспорт, отвечающий заранее заданными кодами или исключениями"""
+
+    def __init__(self, outcomes):
+        super().__init__()
+        self.outcomes = list(outcomes)
+        self.timeouts = []
+
+    def send(self, request, **kwargs):
+        self.timeouts.append(kwargs.get("timeout"))
+        outcome = self.outcomes.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        response = requests.Response()
+        response.status_code = outcome
+        response.request = request
+        response._content = b"{}"
+        return response
+
+    def close(self):
+        pass
+
+
+def make_client(outcomes, retries=2, threshold=5):
+    policy = ResiliencePolicy(retry=RetryPolicy(retries=retries, base_delay=0),
+                              breaker=CircuitBreaker(failure_threshold=threshold, reset_timeout=60))
+    client = ApiClient("http://api.invalid", resilience=policy)
+    adapter = ScriptedAdapter(outcomes)
+    client.session.mount("http://", adapter)
+    return client, adapter, policy
+
+
+class TestResilience:
+    """Повторы только для GET, breaker отклоняет запросы после серии ошибок"""
+
+    def test_get_retried_on_5xx(self):
+        client, adapter, policy = make_client([503, 502, 200])
+
+        assert client.get("item/x").status_code == 200
+        assert policy.stats.retries == 2
+
+    def test_get_retried_on_connection_error(self):
+        client, adapter, policy = make_client([requests.ConnectionError("reset"), 200])
+
+        assert client.get("item/x").status_code == 200
+        assert policy.stats.retries == 1
+
+    def test_retries_exhausted_returns_last_response(self):
+        client, adapter, policy = make_client([500, 500, 500])
+
+        assert client.get("item/x").status_code == 500
+        assert policy.stats.retries == 2
+
+    def test_post_not_retried(self):
+        client, adapter, policy = make_client([503, 200])
+
+        assert client.post("item", json={}).status_code == 503
+        assert policy.stats.retries == 0
+
+    def test_breaker_fast_fails_after_threshold(self):
+        client, adapter, policy = make_client([500] * 3, retries=0, threshold=3)
+        for _ in range(3):
+            client.post("item", json={})
+
+        with pytest.raises(CircuitOpenError):
+            client.get("item/x")
+        assert policy.stats.breaker_trips == 1
+        assert policy.stats.fast_failures == 1
+
+    def test_breaker_half_open_closes_on_success(self):
+        client, adapter, policy = make_client([500, 200, 200], retries=0, threshold=1)
+        client.get("item/x")
+        policy.breaker.reset_timeout = 0
+
+        assert client.get("item/x").status_code == 200
+        assert policy.breaker.state == CircuitBreaker.CLOSED
+
+    def test_breaker_half_open_allows_single_trial(self):
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=60)
+        breaker.record_failure()
+        breaker.opened_at -= 60
+
+        breaker.before_request()
+        with pytest.raises(CircuitOpenError, match="half-open"):
+            breaker.before_request()
+        breaker.record_success()
+        breaker.before_request()
+
+        assert breaker.state == CircuitBreaker.CLOSED
+        assert breaker.stats.fast_failures == 1
+
+    def test_breaker_half_open_trial_failure_reopens(self):
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=60)
+        breaker.record_failure()
+        breaker.opened_at -= 60
+        breaker.before_request()
+        breaker.record_failure()
+
+        with pytest.raises(CircuitOpenError, match="open after"):
+            breaker.before_request()
+        assert breaker.stats.breaker_trips == 2
+
+    def test_endpoint_timeouts(self):
+        client, adapter, policy = make_client([200, 200])
+        policy.endpoint_timeouts["GET /api/1/{sellerID}/item"] = (1, 60)
+
+        client.get("123456/item")
+        client.get("item/x")
+
+        assert adapter.timeouts == [(1, 60), (3.05, 10)]
+
+    def test_parse_endpoint_timeout(self):
+        assert parse_endpoint_timeout("GET /api/1/{sellerID}/item=3,60") == ("GET /api/1/{sellerID}/item", (3.0, 60.0))
+        assert parse_endpoint_timeout("POST /api/1/item=5") == ("POST /api/1/item", 5.0)
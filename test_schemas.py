@@ -0,0 +1,72 @@
+"""
+Тесты схем ответов и скомпилированных валидаторов (utils/schemas.py)
+"""
+import pytest
+
+from utils.http_client import ApiClient
+from utils.items import make_item_payload
+from utils.schemas import ListOf, OneOf, compile_schema, validate_item, validate_response
+
+ITEM = {
+    "id": "0cd4183f-a699-4486-83f8-b513dfde477a",
+    "sellerId": 123456,
+    "name": "testItem",
+    "price": 9900,
+    "statistics": {"likes": 21, "viewCount": 11, "contacts": 43},
+    "createdAt": "2024-01-01 00:00:00.000000 +0000 +0000",
+}
+
+
+class TestCompiledValidators:
+    """Ошибки валидаторов указывают путь до поля"""
+
+    def test_valid_item(self):
+        assert validate_item(ITEM) is None
+
+    @pytest.mark.parametrize("field, value, expected", [
+        ("price", "9900", "$.price: expected integer, got string"),
+        ("sellerId", True, "$.sellerId: expected integer, got boolean"),
+        ("statistics", None, "$.statistics: expected object, got null"),
+    ])
+    def test_wrong_type(self, field, value, expected):
+        assert validate_item(dict(ITEM, **{field: value})) == expected
+
+    def test_missing_nested_field(self):
+        item = dict(ITEM, statistics={"likes": 1, "viewCount": 2})
+
+        assert validate_item(item) == "$.statistics.contacts: missing"
+
+    def test_list_index_and_min_items(self):
+        validate = compile_schema(ListOf({"id": str}, min_items=1))
+
+        assert validate([]) == "$: expected at least 1 item(s), got 0"
+        assert validate([{"id": "a"}, {"id": 1}]) == "$[1].id: expected string, got integer"
+
+    def test_one_of(self):
+        validate = compile_schema(OneOf({"id": str}, {"status": str}))
+
+        assert validate({"status": "ok"}) is None
+        assert validate({}).startswith("$: matches none of 2 schemas")
+
+    def test_unsupported_schema(self):
+        with pytest.raises(TypeError):
+            compile_schema(set)
+
+
+class TestValidateResponse:
+    """Ответы заглушки соответствуют схемам своих эндпоинтов"""
+
+    def test_all_endpoints(self, local_api_server):
+        with ApiClient(local_api_server.url) as client:
+            payload = make_item_payload(222222)
+            created = client.post("item", json=payload)
+            item_id = created.json()["status"].split(" - ")[-1]
+            responses = [
+                created,
+                client.get(f"item/{item_id}"),
+                client.get(f"statistic/{item_id}"),
+                client.get("222222/item"),
+                client.get("item/not-a-uuid"),
+            ]
+
+        assert [validate_response(response) for response in responses] == [None] * len(responses)
@@ -0,0 +1,84 @@
+"""
+Тесты наполнения API синтетическими объявлениями (utils/seeder.py)
+"""
+from collections import Counter
+
+import pytest
+
+from utils.http_client import ApiClient
+from utils.seeder import SeedPlan, read_manifest, seed, seller_sizes
+from utils.sellers import DEFAULT_LOW, SEED_LOW, SellerIdAllocator
+
+
+class Interrupt(Exception):
+    pass
+
+
+def interrupt_after_first_batch(checkpoint):
+    raise Interrupt
+
+
+class TestSeedPlan:
+    """Пакеты детерминированы, продавцы распределены по Ципфу"""
+
+    def test_batches_are_deterministic(self):
+        plan = SeedPlan(items=250, sellers=50, seed=7, batch_size=100, use_numpy=False)
+
+        first, last = plan.batch(0), plan.batch(2)
+
+        assert first == SeedPlan(items=250, sellers=50, seed=7, batch_size=100, use_numpy=False).batch(0)
+        assert (len(first), len(last)) == (100, 50)
+        assert last[-1]["name"] == "seed_249"
+        payload = first[0]
+        assert set(payload) == {"sellerID", "name", "price", "statistics"}
+        assert set(payload["statistics"]) == {"likes", "viewCount", "contacts"}
+        assert all(payload["price"] >= 1 and min(payload["statistics"].values()) >= 1 for payload in first)
+
+    def test_seller_sizes_are_skewed(self):
+        plan = SeedPlan(items=20000, sellers=1000, batch_size=5000, use_numpy=False, zipf=1.1)
+        sizes = Counter(payload["sellerID"] for index in range(plan.batches) for payload in plan.batch(index))
+        ranked = [size for _, size in sizes.most_common()]
+
+        # Первый ранг получает ~1/H(1000, 1.1) ≈ 17% объявлений
+        assert 0.12 < sizes[plan.first_seller_id] / plan.items < 0.22
+        assert ranked[0] > 5 * ranked[9] > 5 * ranked[99]
+
+    @pytest.mark.parametrize("first_seller_id, sellers", [(SEED_LOW, 900000), (DEFAULT_LOW, 10)])
+    def test_seller_range_is_checked(self, first_seller_id, sellers):
+        with pytest.raises(AssertionError):
+            SeedPlan(items=10, sellers=sellers, first_seller_id=first_seller_id)
+
+    def test_default_sellers_are_never_allocated_to_tests(self):
+        plan = SeedPlan(items=10, sellers=1000)
+
+        assert plan.first_seller_id == SEED_LOW
+        assert SellerIdAllocator().high < plan.first_seller_id
+
+
+class TestSeeding:
+    """Наполнение продолжается с контрольной точки без дублей в манифесте"""
+
+    def test_resume_after_interruption(self, local_api_server, tmp_path):
+        plan = SeedPlan(items=30, sellers=5, batch_size=10, first_seller_id=777000, use_numpy=False)
+        manifest = str(tmp_path / "manifest.tsv.gz")
+        items_before = len(local_api_server.api.items)
+        with ApiClient(local_api_server.url) as client:
+            with pytest.raises(Interrupt):
+                seed(client, plan, manifest, concurrency=4, progress=interrupt_after_first_batch)
+            # Пакет, прерванный после записи манифеста, но до контрольной точки
+            with open(manifest, "ab") as output:
+                output.write(b"partial batch")
+            checkpoint = seed(client, plan, manifest, concurrency=4)
+
+        ids = [item_id for item_id, _ in read_manifest(manifest)]
+        assert (checkpoint.created, checkpoint.failed) == (30, 0)
+        assert len(ids) == len(set(ids)) == 30
+        assert len(local_api_server.api.items) - items_before == 30
+        assert sum(seller_sizes(manifest).values()) == 30
+
+    def test_checkpoint_for_other_plan_is_rejected(self, local_api_server, tmp_path):
+        manifest = str(tmp_path / "manifest.tsv.gz")
+        with ApiClient(local_api_server.url) as client:
+            seed(client, SeedPlan(items=5, sellers=2, first_seller_id=777100, use_numpy=False), manifest)
+            with pytest.raises(ValueError, match="another plan"):
+                seed(client, SeedPlan(items=6, sellers=2, first_seller_id=777100, use_numpy=False), manifest)
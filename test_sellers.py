@@ -0,0 +1,52 @@
+"""
+Тесты выдачи sellerID (utils/sellers.py)
+"""
+from utils.sellers import SEED_LOW, SELLER_ID_MAX, SELLER_ID_MIN, SellerIdAllocator
+
+
+class TestSellerIdAllocator:
+    """Диапазоны воркеров не пересекаются, позиция сохраняется между запусками"""
+
+    def test_worker_ranges_are_disjoint(self):
+        allocators = [SellerIdAllocator(index, 4, block_size=8) for index in range(4)]
+
+        issued = [{allocator.allocate() for _ in range(100)} for allocator in allocators]
+
+        assert sum(len(ids) for ids in issued) == 400
+        assert len(set().union(*issued)) == 400
+        for allocator, ids in zip(allocators, issued):
+            assert all(allocator.low <= seller_id <= allocator.high for seller_id in ids)
+
+    def test_boundary_ids_are_not_issued(self):
+        allocator = SellerIdAllocator()
+
+        assert allocator.low > SELLER_ID_MIN
+        assert allocator.high < SELLER_ID_MAX
+
+    def test_seed_range_is_not_issued(self):
+        allocators = [SellerIdAllocator(index, 4) for index in range(4)]
+
+        assert max(allocator.high for allocator in allocators) < SEED_LOW
+
+    def test_state_file_continues_sequence(self, tmp_path):
+        state_file = tmp_path / "seller_ids"
+        first_run = SellerIdAllocator(state_file=state_file, block_size=3)
+        first_ids = [first_run.allocate() for _ in range(3)]
+
+        second_run = SellerIdAllocator(state_file=state_file, block_size=3)
+        second_ids = [second_run.allocate() for _ in range(3)]
+
+        assert second_ids[0] == first_ids[-1] + 1 or second_ids[0] == first_run.low
+        assert len(set(first_ids + second_ids)) == 6
+
+    def test_fresh_state_files_start_at_random_positions(self, tmp_path):
+        starts = {SellerIdAllocator(state_file=tmp_path / f"ids_{run}").allocate() for run in range(3)}
+
+        assert len(starts) == 3
+
+    def test_sequence_wraps_around_range(self, tmp_path):
+        state_file = tmp_path / "ids"
+        state_file.with_name("ids.0").write_text("200001")
+        allocator = SellerIdAllocator(low=200000, high=200002, state_file=state_file, block_size=2)
+
+        assert [allocator.allocate() for _ in range(4)] == [200001, 200002, 200000, 200001]
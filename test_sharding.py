@@ -0,0 +1,131 @@
+"""
+Тесты шардирования по длительностям (utils/sharding.py) и объединения отчетов (utils/merge_reports.py)
+"""
+import json
+import re
+from pathlib import Path
+
+import pytest
+
+from utils.merge_reports import merge_reports, parse_duration
+from utils.sharding import DurationEstimator, assign_shards, order_longest_first
+
+pytest_plugins = ["pytester"]
+
+ROOT_DIR = Path(__file__).parent
+
+INNER_CONFTEST = """
+from utils.sharding import ShardingPlugin
+
+
+def pytest_addoption(parser):
+    parser.addoption("--num-shards", type=int, default=1)
+    parser.addoption("--shard-id", type=int, default=0)
+    parser.addoption("--durations-file", default=None)
+
+
+def pytest_configure(config):
+    config.pluginmanager.register(ShardingPlugin(config), "sharding")
+"""
+
+INNER_TESTS = """
+import pytest
+
+@pytest.mark.parametrize("index", range(12))
+def test_case(index):
+    pass
+"""
+
+
+class FakeItem:
+    def __init__(self, nodeid):
+        self.nodeid = nodeid
+
+
+class TestShardAssignment:
+    """LPT-разбиение и порядок выполнения"""
+
+    def test_shards_are_balanced(self):
+        durations = {f"test_a.py::test_{index}": duration
+                     for index, duration in enumerate([8, 7, 6, 5, 4, 3, 2, 2, 1, 1, 1])}
+        estimate = DurationEstimator(durations)
+
+        assignment = assign_shards(list(durations), estimate, 3)
+
+        loads = [sum(durations[nodeid] for nodeid, shard in assignment.items() if shard == index)
+                 for index in range(3)]
+        assert max(loads) - min(loads) <= 1
+        assert assignment == assign_shards(list(reversed(durations)), estimate, 3)
+
+    def test_unknown_test_uses_module_median(self):
+        estimate = DurationEstimator({"test_a.py::test_1": 2.0, "test_a.py::test_2": 4.0, "test_b.py::test_1": 0.1})
+
+        assert estimate("test_a.py::test_new") == 3.0
+        assert estimate("test_c.py::test_new") == 2.0
+        assert DurationEstimator({})("test_a.py::test_1") == 1.0
+
+    def test_longest_modules_first_and_grouped(self):
+        durations = {"test_a.py::t1": 1.0, "test_a.py::t2": 1.0, "test_b.py::t1": 0.5,
+                     "test_b.py::t2": 3.0, "test_c.py::t1": 0.1}
+        items = [FakeItem(nodeid) for nodeid in durations]
+
+        ordered = order_longest_first(items, DurationEstimator(durations))
+
+        assert [item.nodeid for item in ordered] == [
+            "test_b.py::t2", "test_b.py::t1", "test_a.py::t1", "test_a.py::t2", "test_c.py::t1"]
+
+
+class TestShardingPlugin:
+    """Шарды вместе покрывают весь набор без пересечений"""
+
+    def test_shards_cover_suite(self, pytester):
+        pytester.syspathinsert(ROOT_DIR)
+        pytester.makeconftest(INNER_CONFTEST)
+        pytester.makepyfile(test_inner=INNER_TESTS)
+        durations = pytester.path / "durations.json"
+        pytester.runpytest("-p", "no:cacheprovider", f"--durations-file={durations}").assert_outcomes(passed=12)
+
+        passed = []
+        for shard in range(3):
+            result = pytester.runpytest("-p", "no:cacheprovider", "-v", "--num-shards=3", f"--shard-id={shard}",
+                                        f"--durations-file={durations}")
+            passed.extend(re.findall(r"(test_case\[\d+\]) PASSED", result.stdout.str()))
+            assert (pytester.path / f"durations.shard-{shard}.json").exists()
+
+        assert sorted(passed) == sorted(f"test_case[{index}]" for index in range(12))
+        assert len(json.loads(durations.read_text())) == 12
+
+    def test_invalid_shard_id(self, pytester):
+        pytester.syspathinsert(ROOT_DIR)
+        pytester.makeconftest(INNER_CONFTEST)
+        pytester.makepyfile(test_inner=INNER_TESTS)
+
+        result = pytester.runpytest("-p", "no:cacheprovider", "--num-shards=2", "--shard-id=2")
+
+        assert result.ret == pytest.ExitCode.USAGE_ERROR
+
+
+class TestMergeReports:
+    """Объединенный отчет pytest-html содержит тесты всех шардов"""
+
+    def test_merge_shard_reports(self, pytester):
+        pytest.importorskip("pytest_html")
+        pytester.syspathinsert(ROOT_DIR)
+        pytester.makeconftest(INNER_CONFTEST)
+        pytester.makepyfile(test_inner=INNER_TESTS)
+        reports = []
+        for shard in range(2):
+            report = pytester.path / f"shard-{shard}.html"
+            pytester.runpytest("-p", "no:cacheprovider", "--num-shards=2", f"--shard-id={shard}",
+                               f"--html={report}", "--self-contained-html")
+            reports.append(str(report))
+
+        merged = merge_reports(reports)
+
+        assert '<span class="passed">12 Passed' in merged
+        assert "12 tests took" in merged
+        assert merged.count("test_inner.py::test_case[") >= 12
+
+    def test_parse_duration(self):
+        assert parse_duration("524 ms") == 0.524
+        assert parse_duration("01:02:03") == 3723
@@ -0,0 +1,77 @@
+"""
+Тесты потоковой гистограммы (utils/histogram.py) и soak-прогона (utils/soak.py)
+"""
+import asyncio
+import json
+import random
+
+import pytest
+
+from utils.histogram import LatencyHistogram
+from utils.http_client import ApiClient
+from utils.soak import run_soak
+from utils.stats import LatencyStats
+
+
+class TestLatencyHistogram:
+    """Перцентили гистограммы совпадают с точными в пределах precision"""
+
+    def test_percentiles_within_precision(self):
+        rng = random.Random(13)
+        exact, histogram = LatencyStats(), LatencyHistogram()
+        for _ in range(5000):
+            latency = rng.lognormvariate(-3, 0.8)
+            exact.add(latency)
+            histogram.add(latency)
+
+        expected, actual = exact.summary(), histogram.summary()
+        for column in ("p50", "p95", "p99"):
+            assert actual[column] == pytest.approx(expected[column], rel=0.011)
+
+    def test_memory_does_not_grow(self):
+        histogram = LatencyHistogram()
+        buckets = len(histogram.counts)
+        for index in range(10000):
+            histogram.add(index / 1000)
+
+        assert len(histogram.counts) == buckets
+        assert histogram.count == 10000
+
+    def test_out_of_range_values_are_clamped(self):
+        histogram = LatencyHistogram(lowest=0.001, highest=1.0)
+        histogram.add(0.0)
+        histogram.add(100.0, ok=False)
+
+        assert histogram.count == 2 and histogram.errors == 1
+        assert histogram.percentile(100) == 100.0
+
+    def test_merge_and_round_trip(self):
+        first, second = LatencyHistogram(), LatencyHistogram()
+        for latency in (0.01, 0.02, 0.03):
+            first.add(latency)
+        second.add(0.5, ok=False)
+
+        merged = LatencyHistogram.from_dict(json.loads(json.dumps(first.to_dict()))).merge(second)
+
+        assert merged.count == 4 and merged.errors == 1
+        assert merged.min == 0.01 and merged.max == 0.5
+        assert merged.counts == [a + b for a, b in zip(first.counts, second.counts)]
+
+
+class TestSoakRun:
+    """Soak-прогон пишет снимки по интервалам"""
+
+    def test_snapshots_written(self, local_api_server, tmp_path):
+        path = tmp_path / "soak.jsonl"
+        with ApiClient(local_api_server.url) as client:
+            result, writer = asyncio.run(run_soak(client, path, concurrency=4, duration=0.5,
+                                                  snapshot_interval=0.15))
+
+        records = [json.loads(line) for line in path.read_text().splitlines()]
+        assert len(records) == writer.snapshots >= 3
+        last = records[-1]["endpoints"]
+        assert set(last) == set(result.stats)
+        for endpoint, snapshot in last.items():
+            assert snapshot["total"]["requests"] == sum(
+                record["endpoints"][endpoint]["interval"]["requests"] for record in records)
+            assert snapshot["total"]["error_rate"] == 0.0
@@ -0,0 +1,89 @@
+"""
+Тесты потокового разбора списков объявлений (utils/streaming.py)
+"""
+import json
+
+import pytest
+
+from utils.fault_proxy import FaultProxy, parse_fault
+from utils.http_client import ApiClient
+from utils.items import make_item_payload
+from utils.streaming import ListingCheck, iter_json_array, stream_listing
+from utils.stub_server import StubApi, StubServer
+
+
+def split(text, size):
+    data = text.encode("utf-8")
+    return [data[start:start + size] for start in range(0, len(data), size)]
+
+
+class TestIterJsonArray:
+    """Элементы массива разбираются из кусков произвольного размера"""
+
+    VALUES = [{"id": "a", "name": "Имя, с запятой ]"}, 12345, [1, [2]], "x", None, -0.5]
+
+    @pytest.mark.parametrize("size", [1, 3, 7, 1024])
+    def test_chunk_boundaries(self, size):
+        text = json.dumps(self.VALUES, ensure_ascii=False, indent=1)
+
+        assert list(iter_json_array(split(text, size))) == self.VALUES
+
+    def test_empty_array(self):
+        assert list(iter_json_array([b" [ ", b"] "])) == []
+
+    @pytest.mark.parametrize("text", ['{"a": 1}', "[1, 2", "[1 2]", "[1,]"])
+    def test_malformed(self, text):
+        with pytest.raises(ValueError):
+            list(iter_json_array(split(text, 2)))
+
+    def test_failure_sample_is_bounded(self):
+        check = ListingCheck(sample_size=2)
+        for index in range(10):
+            check.feed({"index": index}, "bad" if index % 2 else None)
+
+        assert (check.count, check.failures, len(check.samples)) == (10, 5, 2)
+        assert [sample["index"] for sample in check.samples] == [1, 3]
+
+
+class TestStreamListing:
+    """Проверка большого списка продавца без загрузки тела целиком"""
+
+    def test_large_seller(self):
+        api = StubApi()
+        seller_id = 654321
+        for index in range(5000):
+            api.create_item(make_item_payload(seller_id, name=f"testItem_{index}"))
+        # Одно битое объявление в середине списка
+        broken = next(item for item in api.items.values() if item["name"] == "testItem_2500")
+        del broken["createdAt"]
+
+        with StubServer(api) as server, ApiClient(server.url) as client:
+            response, check = stream_listing(client, seller_id, chunk_size=4096)
+
+        assert response.status_code == 200
+        assert (check.count, check.failures) == (5000, 1)
+        assert "createdAt" in check.samples[0]["error"]
+
+    def test_error_status_is_not_parsed(self, local_api_server):
+        with ApiClient(local_api_server.url) as client:
+            response, check = stream_listing(client, "abc")
+
+        assert response.status_code == 400 and check is None
+
+    def test_timing_includes_body_transfer(self, local_api_server):
+        seller_id = 654322
+        with ApiClient(local_api_server.url) as client:
+            client.post("item", json=make_item_payload(seller_id))
+        proxy = FaultProxy(local_api_server.url, [parse_fault("GET /api/1/{sellerID}/item: drip=300")]).start()
+        timings = []
+        try:
+            with ApiClient(proxy.url) as client:
+                client.listeners.append(lambda timing, response: timings.append(timing))
+                response, check = stream_listing(client, seller_id)
+        finally:
+            proxy.stop()
+
+        assert check.count == 1
+        assert [timing.endpoint for timing in timings] == ["GET /api/1/{sellerID}/item"]
+        assert timings[0].ttfb < 0.2
+        assert timings[0].total >= 0.3
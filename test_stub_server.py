@@ -0,0 +1,70 @@
+"""
+Тесты локальной заглушки API (utils/stub_server.py)
+"""
+import pytest
+
+from utils.stub_server import ALL_BUGS, StubApi
+
+
+@pytest.fixture
+def item_payload():
+    return {
+        "sellerID": 123456,
+        "name": "testItem",
+        "price": 9900,
+        "statistics": {"likes": 21, "viewCount": 11, "contacts": 43},
+    }
+
+
+class TestStubApi:
+    """Проверка воспроизведения поведения из BUGS.md"""
+
+    def test_create_returns_status_string(self, item_payload):
+        """БАГ #1: POST возвращает строку статуса с id"""
+        status_code, data = StubApi().handle("POST", "/api/1/item", item_payload)
+
+        assert status_code == 200
+        assert data["status"].startswith("Сохранили объявление - ")
+
+    def test_create_returns_item_without_bugs(self, item_payload):
+        """Без багов POST возвращает объявление целиком"""
+        status_code, data = StubApi(bugs=()).handle("POST", "/api/1/item", item_payload)
+
+        assert status_code == 200
+        assert data["sellerId"] == item_payload["sellerID"]
+        assert data["statistics"] == item_payload["statistics"]
+
+    @pytest.mark.parametrize("path", ["/api/1/item/nonexistent-id-12345", "/api/1/statistic/nonexistent-id-12345"])
+    def test_not_found_status_code(self, path):
+        """БАГ #2, #3: 400 вместо 404 для несуществующего объявления"""
+        assert StubApi(bugs=ALL_BUGS).handle("GET", path)[0] == 400
+        assert StubApi(bugs=()).handle("GET", path)[0] == 404
+
+    @pytest.mark.parametrize("field, value", [("name", ""), ("name", None), ("price", -100), ("price", 0),
+                                              ("price", None)])
+    def test_validation_depends_on_bugs(self, item_payload, field, value):
+        """БАГ #4, #6, #8: невалидные значения принимаются только при включенных багах"""
+        item_payload[field] = value
+
+        assert StubApi(bugs=ALL_BUGS).handle("POST", "/api/1/item", item_payload)[0] == 200
+        assert StubApi(bugs=()).handle("POST", "/api/1/item", item_payload)[0] == 400
+
+    def test_statistic_null_for_empty_statistics(self, item_payload):
+        """БАГ #9: статистика возвращается как [null]"""
+        item_payload["statistics"] = {"likes": 0, "viewCount": 0, "contacts": 0}
+        api = StubApi()
+        _, data = api.handle("POST", "/api/1/item", item_payload)
+        item_id = data["status"].split(" - ")[-1]
+
+        assert api.handle("GET", f"/api/1/statistic/{item_id}") == (200, [None])
+
+    def test_seller_items_filtered_by_seller(self, item_payload):
+        """Список объявлений содержит только объявления продавца"""
+        api = StubApi()
+        api.handle("POST", "/api/1/item", item_payload)
+        api.handle("POST", "/api/1/item", dict(item_payload, sellerID=654321))
+
+        status_code, items = api.handle("GET", "/api/1/123456/item")
+
+        assert status_code == 200
+        assert [item["sellerId"] for item in items] == [123456]
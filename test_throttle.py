@@ -0,0 +1,127 @@
+"""
+Тесты ограничения нагрузки: token bucket и AIMD-конкурентность (utils/throttle.py)
+"""
+import threading
+
+import pytest
+import requests
+from requests.adapters import BaseAdapter
+
+from utils.http_client import ApiClient
+from utils.throttle import AimdConcurrency, RateLimiter, TokenBucket
+
+ENDPOINT = "GET /api/1/item/{id}"
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+class ThrottlingAdapter(BaseAdapter):
+    """Транспорт, отвечающий 429 с Retry-After на каждый второй запрос"""
+
+    def __init__(self):
+        super().__init__()
+        self.calls = 0
+
+    def send(self, request, **kwargs):
+        self.calls += 1
+        response = requests.Response()
+        response.status_code = 429 if self.calls % 2 == 0 else 200
+        response.headers["Retry-After"] = "2"
+        response.request = request
+        response._content = b"{}"
+        return response
+
+    def close(self):
+        pass
+
+
+class TestTokenBucket:
+    """Частота не выше rate после исчерпания запаса burst"""
+
+    def test_waits_after_burst(self):
+        clock = FakeClock()
+        bucket = TokenBucket(rate=10, burst=2, clock=clock, sleep=clock.sleep)
+
+        waits = [bucket.acquire() for _ in range(5)]
+
+        assert waits[:2] == [0.0, 0.0]
+        assert clock.now == pytest.approx(0.3)
+
+    def test_pause_blocks_tokens(self):
+        clock = FakeClock()
+        bucket = TokenBucket(rate=100, clock=clock, sleep=clock.sleep)
+
+        bucket.pause(2)
+
+        assert bucket.acquire() == 2
+
+
+class TestAimdConcurrency:
+    """Аддитивный рост на успехах, одно мультипликативное снижение на волну перегрузки"""
+
+    def test_additive_increase(self):
+        limiter = AimdConcurrency(initial=4, max_limit=8)
+        for _ in range(8):
+            limiter.release(limiter.acquire(), ENDPOINT, 200, 0.01)
+
+        assert 5.5 < limiter.limit < 6
+
+    def test_single_decrease_per_overload_window(self):
+        limiter = AimdConcurrency(initial=8, max_limit=8)
+        tickets = [limiter.acquire() for _ in range(8)]
+
+        decreased = [limiter.release(ticket, ENDPOINT, 429, 0.01) for ticket in tickets]
+
+        assert decreased.count(True) == 1
+        assert limiter.limit == 4
+        assert limiter.release(limiter.acquire(), ENDPOINT, None, 0.01)
+        assert limiter.limit == 2
+
+    def test_latency_spike_decreases(self):
+        limiter = AimdConcurrency(initial=4, warmup=5)
+        for _ in range(5):
+            limiter.release(limiter.acquire(), ENDPOINT, 200, 0.01)
+        limit = limiter.limit
+
+        assert limiter.release(limiter.acquire(), ENDPOINT, 200, 0.5)
+        assert limiter.limit == limit / 2
+
+    def test_acquire_blocks_at_limit(self):
+        limiter = AimdConcurrency(initial=1, max_limit=1)
+        ticket = limiter.acquire()
+        acquired = threading.Event()
+        waiter = threading.Thread(target=lambda: (limiter.acquire(), acquired.set()))
+        waiter.start()
+
+        assert not acquired.wait(0.1)
+        limiter.release(ticket, ENDPOINT, 200, 0.01)
+        assert acquired.wait(1)
+        waiter.join()
+
+
+class TestRateLimiterClient:
+    """ApiClient проводит каждый запрос через общий ограничитель"""
+
+    def test_throttled_response_pauses_bucket(self):
+        clock = FakeClock()
+        bucket = TokenBucket(rate=100, clock=clock, sleep=clock.sleep)
+        limiter = RateLimiter(bucket, AimdConcurrency(initial=4))
+        client = ApiClient("http://api.invalid", limiter=limiter)
+        client.session.mount("http://", ThrottlingAdapter())
+
+        statuses = [client.get("item/x").status_code for _ in range(3)]
+
+        assert statuses == [200, 429, 200]
+        assert limiter.throttled == 1
+        assert limiter.concurrency.decreases == 1
+        assert limiter.concurrency.in_flight == 0
+        assert clock.now >= 2
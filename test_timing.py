@@ -0,0 +1,37 @@
+"""
+Тесты замеров HTTP-вызовов (utils/http_client.py, utils/timing.py)
+"""
+import pytest
+
+from utils.http_client import ApiClient, endpoint_template
+from utils.timing import TimingRecorder
+
+
+class TestHttpTiming:
+    """Замеры привязываются к шаблону эндпоинта и агрегируются по нему"""
+
+    @pytest.mark.parametrize("method, url, expected", [
+        ("POST", "http://host/api/1/item", "POST /api/1/item"),
+        ("GET", "http://host/api/1/item/0f1e2d3c", "GET /api/1/item/{id}"),
+        ("GET", "http://host/api/1/statistic/0f1e2d3c", "GET /api/1/statistic/{id}"),
+        ("GET", "http://host/api/1/123456/item", "GET /api/1/{sellerID}/item"),
+    ])
+    def test_endpoint_template(self, method, url, expected):
+        assert endpoint_template(method, url) == expected
+
+    def test_client_reports_timings(self, local_api_server):
+        recorder = TimingRecorder()
+        with ApiClient(local_api_server.url) as client:
+            client.listeners.append(recorder)
+            client.get("item/nonexistent-id-12345")
+            client.get("item/nonexistent-id-12345")
+
+        timings = recorder.take()
+        recorder.add(timings)
+
+        assert [timing["status_code"] for timing in timings] == [400, 400]
+        assert timings[0]["connect"] is not None, "First request should open a connection"
+        assert timings[1]["connect"] is None, "Second request should reuse the connection"
+        assert all(timing["total"] >= timing["ttfb"] for timing in timings)
+        assert recorder.summaries()["GET /api/1/item/{id}"]["requests"] == 2
+        assert recorder.take() == []
@@ -0,0 +1,3 @@
+"""
+Вспомогательные модули для тестов API объявлений
+"""
@@ -0,0 +1,145 @@
+"""
+Бенчмарки эндпоинтов: прогрев, фиксированное число итераций и сравнение с базовой линией
+
+Тесты с маркером benchmark запускаются только с --benchmark. Фикстура benchmark
+замеряет вызов и сравнивает перцентили с сохраненными в --benchmark-baseline;
+--benchmark-save записывает результаты прогона как новую базовую линию.
+
+    pytest --benchmark --benchmark-save                 # снять базовую линию
+    pytest --benchmark --benchmark-threshold p95=15     # сравнить новый релиз
+"""
+import datetime
+import json
+import os
+import time
+
+import pytest
+
+from utils.stats import LatencyStats
+
+MARKER = "benchmark"
+DEFAULT_BASELINE = "benchmarks/baseline.json"
+DEFAULT_ITERATIONS = 50
+DEFAULT_WARMUP = 5
+# Допустимый рост перцентилей относительно базовой линии, %
+DEFAULT_THRESHOLDS = {"p50": 20.0, "p95": 30.0, "p99": 50.0}
+# Рост меньше этого значения считается шумом независимо от процента
+MIN_REGRESSION_MS = 1.0
+
+
+def parse_thresholds(text):
+    """Разбирает "p50=10,p95=20" или "25" (для всех перцентилей) в словарь порогов в %"""
+    if "=" not in text:
+        return {column: float(text) for column in DEFAULT_THRESHOLDS}
+    thresholds = {}
+    for part in text.split(","):
+        column, _, value = part.partition("=")
+        column = column.strip()
+        if column not in DEFAULT_THRESHOLDS:
+            raise ValueError(f"Unknown percentile '{column}', expected one of {tuple(DEFAULT_THRESHOLDS)}")
+        thresholds[column] = float(value)
+    return thresholds
+
+
+def measure(call, iterations=DEFAULT_ITERATIONS, warmup=DEFAULT_WARMUP):
+    """Вызывает call() warmup раз без замеров, затем iterations раз с замером;
+    успешным считается ответ со статусом 200"""
+    for _ in range(warmup):
+        call()
+    stats = LatencyStats()
+    for _ in range(iterations):
+        started = time.perf_counter()
+        response = call()
+        stats.add(time.perf_counter() - started, response.status_code == 200)
+    return stats.summary()
+
+
+def compare(summary, baseline, thresholds=None):
+    """Регрессии summary относительно baseline: [(перцентиль, было, стало, рост в %)]"""
+    thresholds = thresholds or DEFAULT_THRESHOLDS
+    regressions = []
+    for column, limit in thresholds.items():
+        before, after = baseline.get(column), summary.get(column)
+        if not before or after is None:
+            continue
+        growth = (after - before) / before * 100
+        if growth > limit and after - before > MIN_REGRESSION_MS:
+            regressions.append((column, before, after, growth))
+    return regressions
+
+
+def load_baseline(path):
+    if not os.path.exists(path):
+        return {}
+    with open(path) as source:
+        return json.load(source).get("benchmarks", {})
+
+
+def save_baseline(path, results, meta=None):
+    """Обновляет базовую линию: новые результаты заменяют записи с теми же именами"""
+    benchmarks = load_baseline(path)
+    benchmarks.update(results)
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    data = {"meta": dict(meta or {}, saved=datetime.datetime.now().isoformat(timespec="seconds")),
+            "benchmarks": dict(sorted(benchmarks.items()))}
+    with open(path, "w") as output:
+        json.dump(data, output, indent=2)
+
+
+class BenchmarkPlugin:
+    """Пропуск бенчмарков без --benchmark, сводка с отличием от базовой линии
+    и сохранение результатов. Результаты передаются через user_properties отчетов,
+    поэтому собираются и при запуске под pytest-xdist."""
+
+    def __init__(self, config):
+        self.enabled = config.getoption("--benchmark")
+        self.baseline_path = config.getoption("--benchmark-baseline")
+        self.save = config.getoption("--benchmark-save")
+        self.thresholds = config.getoption("--benchmark-threshold")
+        self.meta = {
+            "iterations": config.getoption("--benchmark-iterations"),
+            "warmup": config.getoption("--benchmark-warmup"),
+        }
+        self.baseline = load_baseline(self.baseline_path)
+        self.results = {}
+
+    def pytest_collection_modifyitems(self, items):
+        if self.enabled:
+            return
+        skip = pytest.mark.skip(reason="benchmarks run only with --benchmark")
+        for item in items:
+            if item.get_closest_marker(MARKER):
+                item.add_marker(skip)
+
+    def pytest_runtest_logreport(self, report):
+        if report.when == "call":
+            for name, value in report.user_properties:
+                if name == MARKER:
+                    self.results[value["name"]] = value["summary"]
+
+    def pytest_sessionfinish(self, session):
+        # Под xdist сохраняет только контроллер, у которого есть все результаты
+        if self.save and self.results and not hasattr(session.config, "workerinput"):
+            save_baseline(self.baseline_path, self.results, self.meta)
+
+    def pytest_terminal_summary(self, terminalreporter):
+        if not self.results:
+            return
+        terminalreporter.write_sep("-", "Benchmarks (ms, change vs baseline)")
+        width = max(len(name) for name in self.results) + 2
+        for name, summary in sorted(self.results.items()):
+            baseline = self.baseline.get(name, {})
+            cells = []
+            for column in DEFAULT_THRESHOLDS:
+                value, before = summary.get(column), baseline.get(column)
+                if value is None:
+                    cells.append(f"{column} -")
+                elif before:
+                    cells.append(f"{column} {value:.1f} ({(value - before) / before * 100:+.0f}%)")
+                else:
+                    cells.append(f"{column} {value:.1f}")
+            terminalreporter.write_line(f"{name:<{width}}" + "  ".join(cells))
+        if self.save:
+            terminalreporter.write_line(f"baseline saved to {self.baseline_path}")
@@ -0,0 +1,108 @@
+"""
+Маркер latency_budget: бюджет задержки HTTP-вызовов теста
+
+    @pytest.mark.latency_budget(max_ms=500)
+        каждый запрос теста не дольше 500 мс
+    @pytest.mark.latency_budget(max_ms=300, percentile=95, repeat=10)
+        тест выполняется 10 раз, p95 задержки всех его запросов не больше 300 мс
+    @pytest.mark.latency_budget(max_ms=800, endpoint="GET /api/1/{sellerID}/item")
+        бюджет проверяется только для указанного эндпоинта
+
+При strict=False нарушение бюджета дает предупреждение вместо падения теста.
+"""
+import pytest
+
+from utils.stats import percentile
+
+MARKER = "latency_budget"
+MODES = ("enforce", "warn", "off")
+
+
+class LatencyBudgetWarning(pytest.PytestWarning):
+    """Тест прошел функционально, но превысил бюджет задержки"""
+
+
+class LatencyBudget:
+    """Параметры маркера latency_budget"""
+
+    def __init__(self, max_ms, percentile=None, repeat=1, endpoint=None, strict=True):
+        assert max_ms > 0, "max_ms should be positive"
+        assert repeat >= 1, "repeat should be at least 1"
+        self.max_ms = max_ms
+        self.percentile = percentile
+        self.repeat = repeat
+        self.endpoint = endpoint
+        self.strict = strict
+
+    @classmethod
+    def from_item(cls, item):
+        marker = item.get_closest_marker(MARKER)
+        if marker is None:
+            return None
+        return cls(*marker.args, **marker.kwargs)
+
+    def describe(self):
+        scope = f" for {self.endpoint}" if self.endpoint else ""
+        if self.percentile is None:
+            return f"every request <= {self.max_ms} ms{scope}"
+        return f"p{self.percentile} <= {self.max_ms} ms over {self.repeat} run(s){scope}"
+
+    def check(self, timings):
+        """Возвращает текст нарушения с разбивкой по запросам или None"""
+        timings = [timing for timing in timings if self.endpoint in (None, timing["endpoint"])]
+        if not timings:
+            return None
+
+        latencies = [timing["total"] * 1000 for timing in timings]
+        if self.percentile is None:
+            observed = max(latencies)
+        else:
+            observed = percentile(sorted(latencies), self.percentile)
+        if observed <= self.max_ms:
+            return None
+
+        lines = [f"Latency budget exceeded: {self.describe()}, observed {observed:.1f} ms"]
+        for timing, latency in zip(timings, latencies):
+            ttfb = f"{timing['ttfb'] * 1000:.1f}" if timing["ttfb"] is not None else "-"
+            flag = "  <-- over budget" if latency > self.max_ms else ""
+            lines.append(
+                f"  {timing['endpoint']} -> {timing['status_code']}: "
+                f"total {latency:.1f} ms, ttfb {ttfb} ms{flag}"
+            )
+        return "\n".join(lines)
+
+
+class LatencyBudgetPlugin:
+    """Повторяет тест repeat раз и проверяет бюджет по замерам фазы call"""
+
+    def __init__(self, mode="enforce"):
+        assert mode in MODES, f"Unknown latency budget mode '{mode}'"
+        self.mode = mode
+
+    @pytest.hookimpl(trylast=True)
+    def pytest_runtest_call(self, item):
+        # Первый прогон выполняет стандартная реализация pytest, здесь - повторы
+        budget = LatencyBudget.from_item(item)
+        if budget is not None and self.mode != "off":
+            for _ in range(budget.repeat - 1):
+                item.runtest()
+
+    # tryfirst: внешняя обертка видит отчет уже с замерами из HttpTimingPlugin
+    @pytest.hookimpl(hookwrapper=True, tryfirst=True)
+    def pytest_runtest_makereport(self, item, call):
+        outcome = yield
+        report = outcome.get_result()
+        if self.mode == "off" or report.when != "call" or not report.passed:
+            return
+        budget = LatencyBudget.from_item(item)
+        if budget is None:
+            return
+
+        violation = budget.check(getattr(report, "http_timings", None) or [])
+        if violation is None:
+            return
+        if budget.strict and self.mode == "enforce":
+            report.outcome = "failed"
+            report.longrepr = violation
+        else:
+            item.warn(LatencyBudgetWarning(violation))
@@ -0,0 +1,168 @@
+"""
+Запись всего HTTP-трафика тестов в сжатые JSONL-файлы с ротацией по размеру
+
+Каждая строка - один вызов ApiClient:
+    {"time": ..., "node": "test_get_item.py::...", "phase": "call", "method": "GET",
+     "url": ..., "endpoint": ..., "status": 200, "timings": {"connect", "ttfb", "total"},
+     "request": {"headers", "body"}, "response": {"headers", "body"}}
+
+Слушатель только кладет ответ в ограниченную очередь (put_nowait), а
+сериализацию, сжатие и запись выполняет фоновый поток, поэтому запись трафика
+не влияет на измеряемые задержки. При переполнении очереди записи
+отбрасываются и учитываются в счетчике dropped.
+"""
+import gzip
+import json
+import os
+import queue
+import threading
+import time
+
+import pytest
+
+DEFAULT_MAX_BYTES = 50 * 1024 * 1024
+DEFAULT_QUEUE_SIZE = 10000
+_STOP = object()
+
+
+def _decode_body(body, content_type=""):
+    if body is None or body == b"":
+        return None
+    text = body.decode("utf-8", errors="replace") if isinstance(body, bytes) else body
+    if "json" in content_type or text[:1] in ("{", "["):
+        try:
+            return json.loads(text)
+        except ValueError:
+            pass
+    return text
+
+
+class TrafficCapture:
+    """Слушатель ApiClient с фоновой записью в {directory}/{prefix}-...-NNNN.jsonl.gz
+
+    Новый файл начинается, когда в текущий записано max_bytes несжатых данных.
+    Тест, к которому относится вызов, задается атрибутом context (node id, фаза).
+    """
+
+    def __init__(self, directory, max_bytes=DEFAULT_MAX_BYTES, prefix="traffic", queue_size=DEFAULT_QUEUE_SIZE):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.prefix = f"{prefix}-{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}"
+        self.context = (None, None)
+        self.records = 0
+        self.dropped = 0
+        self.files = []
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._file = None
+        self._written = 0
+        os.makedirs(directory, exist_ok=True)
+        self._thread = threading.Thread(target=self._run, name="traffic-capture", daemon=True)
+        self._thread.start()
+
+    def __call__(self, timing, response):
+        # Тело ответа с stream=True, прочитанное по частям, не сохраняется; непрочитанное
+        # фоновый поток не трогает
+        body_ready = response is not None and response._content is not False
+        try:
+            self._queue.put_nowait((time.time(), self.context, timing, response, body_ready))
+        except queue.Full:
+            self.dropped += 1
+
+    def _record(self, captured_at, context, timing, response, body_ready):
+        node, phase = context
+        record = {
+            "time": captured_at,
+            "node": node,
+            "phase": phase,
+            "method": timing.method,
+            "endpoint": timing.endpoint,
+            "status": timing.status_code,
+            "timings": {"connect": timing.connect, "ttfb": timing.ttfb, "total": timing.total},
+        }
+        if response is not None:
+            request = response.request
+            content_type = response.headers.get("Content-Type", "")
+            record["url"] = request.url
+            record["request"] = {
+                "headers": dict(request.headers),
+                "body": _decode_body(request.body, request.headers.get("Content-Type", "")),
+            }
+            record["response"] = {
+                "headers": dict(response.headers),
+                "body": _decode_body(response.content, content_type) if body_ready else "<streamed>",
+            }
+        return record
+
+    def _open_next(self):
+        if self._file is not None:
+            self._file.close()
+        path = os.path.join(self.directory, f"{self.prefix}-{len(self.files):04d}.jsonl.gz")
+        self._file = gzip.open(path, "wt", encoding="utf-8")
+        self._written = 0
+        self.files.append(path)
+
+    def _run(self):
+        while True:
+            entry = self._queue.get()
+            if entry is _STOP:
+                break
+            try:
+                line = json.dumps(self._record(*entry), ensure_ascii=False, default=str) + "\n"
+            except Exception as exc:
+                line = json.dumps({"time": entry[0], "node": entry[1][0], "capture_error": repr(exc)}) + "\n"
+            if self._file is None or self._written >= self.max_bytes:
+                self._open_next()
+            self._file.write(line)
+            self._written += len(line)
+            self.records += 1
+        if self._file is not None:
+            self._file.close()
+
+    def close(self):
+        """Дописывает очередь и закрывает текущий файл"""
+        if self._thread.is_alive():
+            self._queue.put(_STOP)
+            self._thread.join()
+
+
+def read_capture(paths):
+    """Записи из файлов захвата по порядку"""
+    for path in paths:
+        with gzip.open(path, "rt", encoding="utf-8") as source:
+            for line in source:
+                yield json.loads(line)
+
+
+class TrafficCapturePlugin:
+    """Привязывает вызовы к node id и фазе теста и закрывает запись в конце сессии"""
+
+    def __init__(self, capture):
+        self.capture = capture
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_setup(self, item):
+        self.capture.context = (item.nodeid, "setup")
+        yield
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_call(self, item):
+        self.capture.context = (item.nodeid, "call")
+        yield
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_teardown(self, item):
+        self.capture.context = (item.nodeid, "teardown")
+        yield
+        self.capture.context = (None, None)
+
+    def pytest_unconfigure(self, config):
+        self.capture.close()
+
+    def pytest_terminal_summary(self, terminalreporter):
+        # Сессионные фикстуры закрываются раньше, но фоновый поток мог еще не дописать очередь
+        self.capture.close()
+        terminalreporter.write_sep("-", "HTTP traffic capture")
+        terminalreporter.write_line(
+            f"{self.capture.records} requests in {len(self.capture.files)} file(s) "
+            f"under {self.capture.directory}, dropped: {self.capture.dropped}"
+        )
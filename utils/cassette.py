@@ -0,0 +1,197 @@
+"""
+Запись HTTP-трафика тестов в кассету (JSONL) и воспроизведение без сети
+
+Каждая строка кассеты - один запрос и ответ:
+    {"method": "POST", "path": "/api/1/item", "body": {...}, "status": 200, "json": {...}}
+
+При воспроизведении запрос ищется по методу, пути и телу. sellerID в каждом
+запуске новые, поэтому при отсутствии точного совпадения берется первая запись
+с тем же запросом и любым sellerID, а соответствие sellerID запуска и кассеты
+запоминается: дальше он подставляется в пути и тела запросов, а в ответах
+заменяется обратно. id объявлений возвращаются такими, как были записаны, и
+тесты используют их в последующих запросах, поэтому совпадают с кассетой.
+Одновременные запросы, отличающиеся только sellerID, сопоставляются в порядке
+прихода, поэтому у объявлений, создаваемых пачкой, тела должны различаться
+(см. make_pool_payloads).
+"""
+import json
+import re
+import threading
+from collections import defaultdict, deque
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import BaseAdapter
+from requests.structures import CaseInsensitiveDict
+
+MODES = ("off", "record", "replay")
+DEFAULT_CASSETTE = "cassettes/api.jsonl"
+SELLER_FIELDS = ("sellerID", "sellerId")
+
+_SELLER_PATH_RE = re.compile(r"^(/api/\d+/)(-?\d+)(/item)$")
+
+
+class CassetteMissError(requests.exceptions.ConnectionError):
+    """В кассете нет записи для запроса"""
+
+
+def _request_body(prepared):
+    if not prepared.body:
+        return None
+    body = prepared.body.decode("utf-8") if isinstance(prepared.body, bytes) else prepared.body
+    try:
+        return json.loads(body)
+    except ValueError:
+        return body
+
+
+def _key(method, path, body):
+    return method, path, json.dumps(body, sort_keys=True, ensure_ascii=False)
+
+
+def _without_seller(body):
+    if isinstance(body, dict) and "sellerID" in body:
+        return dict(body, sellerID=None)
+    return body
+
+
+def _map_sellers(value, mapping):
+    """Заменяет sellerID/sellerId в теле по словарю соответствия"""
+    if isinstance(value, list):
+        return [_map_sellers(element, mapping) for element in value]
+    if isinstance(value, dict):
+        return {
+            key: mapping.get(element, element) if key in SELLER_FIELDS and isinstance(element, int)
+            else _map_sellers(element, mapping)
+            for key, element in value.items()
+        }
+    return value
+
+
+class CassetteRecorder:
+    """Слушатель ApiClient, дописывающий запросы и ответы в кассету"""
+
+    # Тело ответов с stream=True нужно целиком, ApiClient читает его до возврата ответа
+    needs_body = True
+
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, "w", encoding="utf-8")
+        self._lock = threading.Lock()
+
+    def __call__(self, timing, response):
+        if response is None:
+            return
+        entry = {
+            "method": response.request.method,
+            "path": urlsplit(response.request.url).path,
+            "body": _request_body(response.request),
+            "status": response.status_code,
+        }
+        try:
+            entry["json"] = response.json()
+        except ValueError:
+            entry["text"] = response.text
+        line = json.dumps(entry, ensure_ascii=False, separators=(",", ":"))
+        with self._lock:
+            self._file.write(line + "\n")
+
+    def close(self):
+        self._file.close()
+
+
+class ReplayAdapter(BaseAdapter):
+    """Транспорт requests, отвечающий записями из кассеты"""
+
+    def __init__(self, path):
+        super().__init__()
+        with open(path, encoding="utf-8") as cassette:
+            self.entries = [json.loads(line) for line in cassette if line.strip()]
+        self.exact = defaultdict(deque)
+        self.by_shape = defaultdict(deque)
+        for position, entry in enumerate(self.entries):
+            self.exact[_key(entry["method"], entry["path"], entry["body"])].append(position)
+            self.by_shape[self._shape(entry["method"], entry["path"], entry["body"])].append(position)
+        self.used = set()
+        self.last = {}
+        self.sellers = {}  # sellerID запуска -> sellerID кассеты
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _shape(method, path, body):
+        return _key(method, _SELLER_PATH_RE.sub(r"\1{sellerID}\3", path), _without_seller(body))
+
+    @staticmethod
+    def _seller_of(path, body):
+        match = _SELLER_PATH_RE.match(path)
+        if match:
+            return int(match.group(2))
+        if isinstance(body, dict) and isinstance(body.get("sellerID"), int):
+            return body["sellerID"]
+        return None
+
+    def _translated_key(self, method, path, body):
+        match = _SELLER_PATH_RE.match(path)
+        if match and int(match.group(2)) in self.sellers:
+            path = f"{match.group(1)}{self.sellers[int(match.group(2))]}{match.group(3)}"
+        return _key(method, path, _map_sellers(body, self.sellers))
+
+    def _pop(self, index, key):
+        queue = index.get(key)
+        while queue:
+            position = queue.popleft()
+            if position not in self.used:
+                self.used.add(position)
+                return self.entries[position]
+        return None
+
+    def _find(self, method, path, body):
+        entry = self._pop(self.exact, self._translated_key(method, path, body))
+        seller = self._seller_of(path, body)
+        if entry is None and seller is not None and seller not in self.sellers:
+            entry = self._pop(self.by_shape, self._shape(method, path, body))
+            if entry is not None:
+                self.sellers[seller] = self._seller_of(entry["path"], entry["body"])
+
+        key = self._translated_key(method, path, body)
+        if entry is None:
+            # Повторные одинаковые запросы (например, latency_budget с repeat) получают последний ответ
+            return self.last.get(key)
+        self.last[key] = entry
+        return entry
+
+    def send(self, request, **kwargs):
+        path = urlsplit(request.url).path
+        body = _request_body(request)
+        with self._lock:
+            entry = self._find(request.method, path, body)
+            if entry is None:
+                raise CassetteMissError(f"No cassette entry for {request.method} {path} {body}", request=request)
+            reverse = {recorded: current for current, recorded in self.sellers.items()}
+
+        response = requests.Response()
+        response.status_code = entry["status"]
+        response.request = request
+        response.url = request.url
+        response.encoding = "utf-8"
+        if "json" in entry:
+            content = json.dumps(_map_sellers(entry["json"], reverse), ensure_ascii=False)
+            response.headers = CaseInsensitiveDict({"Content-Type": "application/json; charset=utf-8"})
+        else:
+            content = entry["text"]
+            response.headers = CaseInsensitiveDict({"Content-Type": "text/plain; charset=utf-8"})
+        response._content = content.encode("utf-8")
+        # Тело уже в памяти: iter_content при stream=True отдает его кусками
+        response._content_consumed = True
+        return response
+
+    def close(self):
+        pass
+
+
+def install_replay(client, path):
+    """Переключает клиента на ответы из кассеты"""
+    adapter = ReplayAdapter(path)
+    client.session.mount("http://", adapter)
+    client.session.mount("https://", adapter)
+    return adapter
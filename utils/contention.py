@@ -0,0 +1,167 @@
+"""
+Конкурентная запись объявлений одного продавца
+
+Сотни одновременных POST /api/1/item с одним sellerID на нескольких уровнях
+конкурентности. После записи проверяется, что список продавца содержит ровно
+созданные id без потерь и дублей, а статистика каждого объявления совпадает с
+телом запроса. Задержки записи копятся по уровням, чтобы было видно, как они
+растут с конкурентностью.
+
+Тест с маркером stress запускается только с --stress:
+    pytest test_contention.py --stress --stress-writes=500 --stress-levels=1,16,64,256
+"""
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from utils.items import extract_item_id, make_item_payload
+from utils.stats import LatencyStats, format_table
+
+MARKER = "stress"
+DEFAULT_WRITES = 200
+DEFAULT_LEVELS = (1, 16, 64, 256)
+
+
+def parse_levels(text):
+    """Разбирает "1,16,64" в кортеж уровней конкурентности"""
+    levels = tuple(int(part) for part in text.split(","))
+    if not levels or min(levels) < 1:
+        raise ValueError(f"Expected positive comma-separated concurrency levels, got '{text}'")
+    return levels
+
+
+class ContentionStep:
+    """Результат одного уровня: тела запросов, полученные id и задержки записи"""
+
+    def __init__(self, concurrency, payloads):
+        self.concurrency = concurrency
+        self.payloads = payloads
+        self.ids = [None] * len(payloads)
+        self.failures = [None] * len(payloads)
+        self.stats = LatencyStats()
+        self.elapsed = 0.0
+
+    @property
+    def name(self):
+        return f"concurrency={self.concurrency}"
+
+    def summary(self):
+        return self.stats.summary(self.elapsed)
+
+
+def write_concurrently(client, seller_id, writes, concurrency, prefix="stress"):
+    """Отправляет writes POST для seller_id не более concurrency одновременно;
+    первые concurrency запросов стартуют одновременно"""
+    # Разная статистика у каждого объявления, чтобы перепутанные ответы были заметны;
+    # нули не используются, API считает их отсутствующими полями
+    payloads = [
+        make_item_payload(seller_id, name=f"{prefix}_{concurrency}_{index}", price=index + 1,
+                          likes=index + 1, view_count=index + 2, contacts=index + 3)
+        for index in range(writes)
+    ]
+    step = ContentionStep(concurrency, payloads)
+    start = threading.Barrier(min(concurrency, writes))
+
+    def write(index):
+        if index < start.parties:
+            start.wait()
+        started = time.perf_counter()
+        try:
+            response = client.post("item", json=payloads[index])
+            if response.status_code == 200:
+                step.ids[index] = extract_item_id(response.json())
+            if step.ids[index] is None:
+                step.failures[index] = f"{response.status_code}: {response.text[:200]}"
+        except Exception as exc:
+            step.failures[index] = repr(exc)
+        ok = step.failures[index] is None
+        return time.perf_counter() - started, ok
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        results = list(executor.map(write, range(writes)))
+    step.elapsed = time.perf_counter() - started
+    for latency, ok in results:
+        step.stats.add(latency, ok)
+    return step
+
+
+def verify_seller_items(client, seller_id, steps, max_workers=16):
+    """Сверяет список продавца и статистику объявлений с записанным; возвращает список ошибок"""
+    created = {}
+    errors = []
+    for step in steps:
+        for payload, item_id, failure in zip(step.payloads, step.ids, step.failures):
+            if item_id is None:
+                errors.append(f"POST {payload['name']} failed: {failure}")
+            else:
+                created[item_id] = payload
+
+    response = client.get(f"{seller_id}/item")
+    if response.status_code != 200:
+        return errors + [f"GET /{seller_id}/item returned {response.status_code}: {response.text}"]
+    listed = Counter(item.get("id") for item in response.json())
+    missing = set(created) - set(listed)
+    unexpected = set(listed) - set(created)
+    duplicated = sorted(item_id for item_id, count in listed.items() if count > 1)
+    if missing:
+        errors.append(f"{len(missing)} created items missing from seller list, e.g. {sorted(missing)[:5]}")
+    if unexpected:
+        errors.append(f"{len(unexpected)} unexpected items in seller list, e.g. {sorted(unexpected)[:5]}")
+    if duplicated:
+        errors.append(f"{len(duplicated)} items listed more than once, e.g. {duplicated[:5]}")
+
+    def check_statistic(item_id):
+        payload = created[item_id]
+        response = client.get(f"statistic/{item_id}")
+        if response.status_code != 200:
+            return f"GET statistic/{item_id} returned {response.status_code}"
+        statistic = (response.json() or [None])[0] or {}
+        expected = payload["statistics"]
+        actual = {field: statistic.get(field) for field in expected}
+        if actual != expected:
+            return f"statistic of {item_id} ({payload['name']}) is {actual}, expected {expected}"
+        return None
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        errors.extend(error for error in executor.map(check_statistic, created) if error)
+    return errors
+
+
+def run_contention(client, seller_id, writes=DEFAULT_WRITES, levels=DEFAULT_LEVELS):
+    """Пишет writes объявлений seller_id на каждом уровне конкурентности по очереди
+
+    Пул соединений client должен вмещать max(levels), иначе в задержки попадает
+    открытие новых соединений.
+    """
+    return [write_concurrently(client, seller_id, writes, concurrency) for concurrency in levels]
+
+
+class ContentionPlugin:
+    """Пропуск стресс-тестов без --stress и таблица задержек записи по уровням"""
+
+    def __init__(self, config):
+        self.enabled = config.getoption("--stress")
+        self.results = []
+
+    def pytest_collection_modifyitems(self, items):
+        if self.enabled:
+            return
+        skip = pytest.mark.skip(reason="stress tests run only with --stress")
+        for item in items:
+            if item.get_closest_marker(MARKER):
+                item.add_marker(skip)
+
+    def pytest_runtest_logreport(self, report):
+        if report.when == "call":
+            for name, value in report.user_properties:
+                if name == "write_contention":
+                    self.results.append(value)
+
+    def pytest_terminal_summary(self, terminalreporter):
+        for result in self.results:
+            terminalreporter.write_sep("-", f"Write contention for seller {result['seller_id']} (ms)")
+            terminalreporter.write_line(format_table(result["levels"]))
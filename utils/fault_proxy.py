@@ -0,0 +1,320 @@
+"""
+Локальный прокси с внесением задержек и сбоев между тестами и API
+
+Прокси пересылает запросы на настоящий API или заглушку и по правилам для
+эндпоинтов добавляет задержку из распределения, ограничение скорости отдачи
+тела, медленную отдачу тела по частям, сброс соединения (RST после обработки
+запроса бэкендом) и ответы 5xx/429 - случайные или пачками. Случайные решения
+берутся из генератора с заданным seed, пачки считаются по порядковому номеру
+запроса, поэтому сбои воспроизводимы.
+
+Правило: "[ЭНДПОИНТ:] ключ=значение, ...", без эндпоинта - для всех запросов:
+    GET /api/1/item/{id}: latency=lognormal(50,0.8), error=503@0.1
+    POST /api/1/item: burst=429x5/50, reset=0.02
+    latency=uniform(10,200), bandwidth=16k, drip=500
+
+    latency    задержка в мс: 50, uniform(a,b), normal(mu,sigma), lognormal(median,sigma), exp(mean)
+    bandwidth  скорость отдачи тела в байтах/с: 2048, 16k, 1m
+    drip       тело отдается частями в течение N мс после заголовков
+    reset      вероятность сброса соединения вместо ответа
+    error      STATUS@вероятность, например 503@0.1
+    burst      STATUSxN/M: первые N запросов из каждых M получают STATUS
+
+Запуск отдельно (тесты: pytest --fault "..."):
+    python -m utils.fault_proxy --port 8080 --fault "latency=lognormal(80,1)" --fault "burst=503x3/100"
+"""
+import argparse
+import json
+import random
+import re
+import socket
+import struct
+import threading
+import time
+from collections import Counter, namedtuple
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import urllib3
+
+from utils.http_client import DEFAULT_BASE_URL, endpoint_template
+from utils.stub_server import StubServer
+
+ALL_ENDPOINTS = "*"
+# Заголовки соединения не пересылаются, Content-Length выставляется заново
+_HOP_BY_HOP = frozenset({
+    "connection", "keep-alive", "proxy-authenticate", "proxy-authorization", "te", "trailers",
+    "transfer-encoding", "upgrade", "content-length", "host",
+})
+_PARAM_RE = re.compile(r"(\w+)\s*=\s*([^,()]+(?:\([^)]*\))?)")
+_DISTRIBUTION_RE = re.compile(r"^(\w+)\(([^)]*)\)$")
+_SIZE_SUFFIXES = {"k": 1024, "m": 1024 * 1024}
+# Длительность одной порции тела при ограничении скорости
+_CHUNK_INTERVAL = 0.05
+_DRIP_CHUNKS = 10
+
+FaultDecision = namedtuple("FaultDecision", "status delay reset bandwidth drip")
+
+
+def parse_latency(text):
+    """Функция rng -> задержка в секундах по описанию в мс"""
+    text = text.strip()
+    match = _DISTRIBUTION_RE.match(text)
+    if not match:
+        value = float(text) / 1000
+        return lambda rng: value
+    name, args = match.group(1), [float(arg) for arg in match.group(2).split(",")]
+    # Распределения в мс, результат в секундах; sigma логнормального безразмерна
+    distributions = {
+        "uniform": (2, lambda rng: rng.uniform(args[0], args[1]) / 1000),
+        "normal": (2, lambda rng: max(0.0, rng.gauss(args[0], args[1])) / 1000),
+        "lognormal": (2, lambda rng: args[0] * rng.lognormvariate(0, args[1]) / 1000),
+        "exp": (1, lambda rng: rng.expovariate(1 / args[0]) / 1000),
+    }
+    if name not in distributions or len(args) != distributions[name][0]:
+        raise ValueError(f"Unknown latency distribution '{text}', expected one of "
+                         f"50, uniform(a,b), normal(mu,sigma), lognormal(median,sigma), exp(mean)")
+    return distributions[name][1]
+
+
+def parse_size(text):
+    """Размер с суффиксом k/m в байтах"""
+    text = text.strip().lower()
+    if text[-1:] in _SIZE_SUFFIXES:
+        return int(float(text[:-1]) * _SIZE_SUFFIXES[text[-1]])
+    return int(text)
+
+
+class FaultRule:
+    """Сбои одного правила для эндпоинта (шаблон из endpoint_template) или всех запросов"""
+
+    def __init__(self, endpoint=ALL_ENDPOINTS, latency=None, bandwidth=None, drip=None, reset=0.0,
+                 error=None, burst=None):
+        self.endpoint = endpoint
+        self.latency = latency
+        self.bandwidth = bandwidth
+        self.drip = drip
+        self.reset = reset
+        # (status, вероятность) и (status, N, M)
+        self.error = error
+        self.burst = burst
+        self.requests = 0
+
+    def matches(self, endpoint):
+        return self.endpoint == ALL_ENDPOINTS or self.endpoint == endpoint
+
+
+def parse_fault(text):
+    """FaultRule из строки "[ЭНДПОИНТ:] ключ=значение, ..." (см. описание модуля)"""
+    endpoint, separator, params = text.partition(":")
+    if not separator:
+        endpoint, params = ALL_ENDPOINTS, text
+    rule = FaultRule(endpoint.strip() or ALL_ENDPOINTS)
+    found = _PARAM_RE.findall(params)
+    if not found:
+        raise ValueError(f"Expected '[METHOD /path:] key=value, ...', got '{text}'")
+    for key, value in found:
+        value = value.strip()
+        if key == "latency":
+            rule.latency = parse_latency(value)
+        elif key == "bandwidth":
+            rule.bandwidth = parse_size(value)
+        elif key == "drip":
+            rule.drip = float(value) / 1000
+        elif key == "reset":
+            rule.reset = float(value)
+        elif key == "error":
+            status, _, probability = value.partition("@")
+            rule.error = (int(status), float(probability or 1))
+        elif key == "burst":
+            match = re.match(r"^(\d+)x(\d+)/(\d+)$", value)
+            if not match:
+                raise ValueError(f"Expected burst=STATUSxN/M, got '{value}'")
+            rule.burst = tuple(int(group) for group in match.groups())
+        else:
+            raise ValueError(f"Unknown fault parameter '{key}' in '{text}'")
+    return rule
+
+
+def _error_body(status_code, message="injected fault"):
+    """Тело ошибки в формате API, как у настоящих ответов"""
+    payload = {"result": {"message": message, "messages": {}}, "status": str(status_code)}
+    return json.dumps(payload).encode("utf-8")
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def _proxy(self, method):
+        proxy = self.server.proxy
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length) if length else None
+        decision = proxy.decide(endpoint_template(method, self.path))
+        if decision.delay:
+            time.sleep(decision.delay)
+        if decision.status:
+            headers = {"Content-Type": "application/json; charset=utf-8"}
+            if decision.status == 429:
+                headers["Retry-After"] = "1"
+            return self._respond(decision.status, headers, _error_body(decision.status), decision)
+
+        headers = {name: value for name, value in self.headers.items() if name.lower() not in _HOP_BY_HOP}
+        try:
+            upstream = proxy.pool.request(method, proxy.target + self.path, body=body, headers=headers,
+                                          retries=False, redirect=False, decode_content=False)
+        except urllib3.exceptions.HTTPError as exc:
+            return self._respond(502, {"Content-Type": "application/json; charset=utf-8"},
+                                 _error_body(502, f"upstream error: {exc!r}"), decision)
+
+        if decision.reset:
+            # Запрос уже обработан бэкендом, а клиент получает RST вместо ответа
+            self.connection.setsockopt(socket.SOL_SOCKET, socket.SO_LINGER, struct.pack("ii", 1, 0))
+            self.connection.close()
+            self.close_connection = True
+            return None
+        # Server и Date прокси выставляет сам в send_response
+        response_headers = {name: value for name, value in upstream.headers.items()
+                            if name.lower() not in _HOP_BY_HOP | {"server", "date"}}
+        return self._respond(upstream.status, response_headers, upstream.data, decision)
+
+    def _respond(self, status_code, headers, data, decision):
+        self.send_response(status_code)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        if not decision.bandwidth and not decision.drip:
+            self.wfile.write(data)
+            return
+        if decision.bandwidth:
+            chunk_size = max(1, int(decision.bandwidth * _CHUNK_INTERVAL))
+        else:
+            chunk_size = max(1, -(-len(data) // _DRIP_CHUNKS))
+        chunks = [data[offset:offset + chunk_size] for offset in range(0, len(data), chunk_size)]
+        for chunk in chunks:
+            pause = (decision.drip or 0) / len(chunks)
+            if decision.bandwidth:
+                pause += len(chunk) / decision.bandwidth
+            time.sleep(pause)
+            self.wfile.write(chunk)
+
+    def do_GET(self):
+        self._proxy("GET")
+
+    def do_POST(self):
+        self._proxy("POST")
+
+    def log_message(self, format, *args):
+        pass
+
+
+class _ProxyHTTPServer(ThreadingHTTPServer):
+    request_queue_size = 256
+    daemon_threads = True
+
+
+class FaultProxy:
+    """Прокси в фоновом потоке на host:port с правилами rules (FaultRule) перед target"""
+
+    def __init__(self, target, rules=(), seed=0, host="127.0.0.1", port=0, pool_size=64):
+        self.target = target.rstrip("/")
+        self.rules = list(rules)
+        self.injected = Counter()
+        self.pool = urllib3.PoolManager(maxsize=pool_size)
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._httpd = _ProxyHTTPServer((host, port), _Handler)
+        self._httpd.proxy = self
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def decide(self, endpoint):
+        """Сбои для очередного запроса к endpoint по всем подходящим правилам"""
+        status, delay, reset, bandwidth, drip = None, 0.0, False, None, 0.0
+        with self._lock:
+            for rule in self.rules:
+                if not rule.matches(endpoint):
+                    continue
+                position = rule.requests
+                rule.requests += 1
+                if rule.latency:
+                    delay += rule.latency(self._rng)
+                if rule.burst and status is None and position % rule.burst[2] < rule.burst[1]:
+                    status = rule.burst[0]
+                if rule.error and status is None and self._rng.random() < rule.error[1]:
+                    status = rule.error[0]
+                if rule.reset and self._rng.random() < rule.reset:
+                    reset = True
+                if rule.bandwidth:
+                    bandwidth = min(bandwidth or rule.bandwidth, rule.bandwidth)
+                drip += rule.drip or 0.0
+            reset = reset and status is None
+            for kind, injected in (("latency", delay), (f"status {status}", status), ("reset", reset),
+                                   ("bandwidth", bandwidth), ("drip", drip)):
+                if injected:
+                    self.injected[kind] += 1
+        return FaultDecision(status, delay, reset, bandwidth, drip)
+
+    def start(self):
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        self.pool.clear()
+        if self._thread:
+            self._thread.join()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+
+class FaultProxyPlugin:
+    """pytest-плагин: число внесенных сбоев по видам в терминале"""
+
+    def __init__(self, proxy):
+        self.proxy = proxy
+
+    def pytest_terminal_summary(self, terminalreporter):
+        terminalreporter.write_sep("-", f"Fault proxy -> {self.proxy.target}")
+        counters = ", ".join(f"{kind}: {count}" for kind, count in sorted(self.proxy.injected.items()))
+        terminalreporter.write_line(counters or "no faults injected")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Прокси с внесением задержек и сбоев перед API объявлений")
+    parser.add_argument("--api-url", default=DEFAULT_BASE_URL, help="Куда пересылать запросы")
+    parser.add_argument("--local-api", action="store_true", help="Пересылать на локальную заглушку API")
+    parser.add_argument("--host", default="127.0.0.1", help="Адрес прокси")
+    parser.add_argument("--port", type=int, default=8080, help="Порт прокси")
+    parser.add_argument("--fault", type=parse_fault, action="append", default=[],
+                        help="Правило сбоев, можно указать несколько раз")
+    parser.add_argument("--seed", type=int, default=0, help="Seed случайных сбоев")
+    args = parser.parse_args(argv)
+
+    server = StubServer().start() if args.local_api else None
+    proxy = FaultProxy(server.url if server else args.api_url, args.fault, args.seed, args.host, args.port).start()
+    print(f"fault proxy {proxy.url} -> {proxy.target}", flush=True)
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        proxy.stop()
+        if server:
+            server.stop()
+    print(dict(proxy.injected))
+
+
+if __name__ == "__main__":
+    main()
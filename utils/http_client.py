@@ -0,0 +1,205 @@
+"""
+HTTP-клиент с пулом соединений для тестов API объявлений
+"""
+import re
+import threading
+import time
+from collections import namedtuple
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+DEFAULT_BASE_URL = "https://qa-internship.avito.com"
+DEFAULT_HEADERS = {"Accept": "application/json"}
+# (connect timeout, read timeout) в секундах
+DEFAULT_TIMEOUT = (3.05, 10)
+DEFAULT_POOL_SIZE = 16
+
+# Замеры одного HTTP-вызова в секундах. connect есть только для новых соединений
+# (DNS + TCP + TLS), ttfb - до получения заголовков ответа, total - вместе с телом.
+# status_code равен None, если запрос завершился исключением.
+RequestTiming = namedtuple("RequestTiming", "method endpoint status_code connect ttfb total")
+
+_ENDPOINT_TEMPLATES = (
+    (re.compile(r"^/api/(\d+)/item/[^/]*$"), "/api/{version}/item/{id}"),
+    (re.compile(r"^/api/(\d+)/statistic/[^/]*$"), "/api/{version}/statistic/{id}"),
+    (re.compile(r"^/api/(\d+)/item$"), "/api/{version}/item"),
+    (re.compile(r"^/api/(\d+)/[^/]+/item$"), "/api/{version}/{sellerID}/item"),
+)
+
+_connect_time = threading.local()
+
+
+def endpoint_template(method, url):
+    """Шаблон эндпоинта без конкретных id, например "GET /api/1/item/{id}" """
+    path = urlsplit(url).path
+    for pattern, template in _ENDPOINT_TEMPLATES:
+        match = pattern.match(path)
+        if match:
+            return f"{method} {template.format(version=match.group(1), id='{id}', sellerID='{sellerID}')}"
+    return f"{method} {path}"
+
+
+class _TimedHTTPConnection(HTTPConnection):
+    def connect(self):
+        started = time.perf_counter()
+        super().connect()
+        _connect_time.value = time.perf_counter() - started
+
+
+class _TimedHTTPSConnection(HTTPSConnection):
+    def connect(self):
+        started = time.perf_counter()
+        super().connect()
+        _connect_time.value = time.perf_counter() - started
+
+
+class _TimedHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = _TimedHTTPConnection
+
+
+class _TimedHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = _TimedHTTPSConnection
+
+
+class TimedHTTPAdapter(HTTPAdapter):
+    """Адаптер, замеряющий время установки новых соединений"""
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": _TimedHTTPConnectionPool,
+            "https": _TimedHTTPSConnectionPool,
+        }
+
+
+class ApiClient:
+    """Клиент поверх requests.Session: keep-alive, общий пул, заголовки и таймауты
+
+    Каждый вызов замеряется; слушатели из `listeners` получают RequestTiming
+    и ответ (None при исключении). Если задан `resilience` (ResiliencePolicy),
+    применяются таймауты по эндпоинтам, повторы GET и circuit breaker.
+    Если задан `limiter` (RateLimiter), каждая попытка проходит через него.
+
+    Тело ответа с stream=True читает вызывающий код, поэтому слушатели получают
+    замер только после finish_stream(response), и total включает передачу тела.
+    Слушатели с needs_body = True (запись кассеты) требуют тело сразу: тогда оно
+    читается целиком внутри вызова.
+    """
+
+    def __init__(self, base_url, api_version="1", timeout=DEFAULT_TIMEOUT,
+                 pool_size=DEFAULT_POOL_SIZE, headers=None, resilience=None, limiter=None):
+        self.base_url = base_url.rstrip("/")
+        self.api_version = api_version
+        self.timeout = timeout
+        self.resilience = resilience
+        self.limiter = limiter
+        self.listeners = []
+
+        self.session = requests.Session()
+        adapter = TimedHTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.session.headers.update(DEFAULT_HEADERS)
+        if headers:
+            self.session.headers.update(headers)
+
+    def url(self, path):
+        """Полный URL для пути относительно /api/{version}/ (абсолютные URL не меняются)"""
+        if path.startswith(("http://", "https://")):
+            return path
+        return f"{self.base_url}/api/{self.api_version}/{path.lstrip('/')}"
+
+    def request(self, method, path, **kwargs):
+        url = self.url(path)
+        endpoint = endpoint_template(method, url)
+        policy = self.resilience
+        if policy is None:
+            kwargs.setdefault("timeout", self.timeout)
+            return self._send(method, url, endpoint, **kwargs)
+
+        kwargs.setdefault("timeout", policy.timeout_for(endpoint, self.timeout))
+        attempt = 0
+        while True:
+            policy.breaker.before_request()
+            response = error = None
+            try:
+                response = self._send(method, url, endpoint, **kwargs)
+            except requests.RequestException as exc:
+                error = exc
+
+            if policy.is_failure(response, error):
+                policy.breaker.record_failure()
+            else:
+                policy.breaker.record_success()
+
+            if not policy.retry.should_retry(method, attempt, response, error):
+                if error is not None:
+                    raise error
+                return response
+            if response is not None:
+                self.finish_stream(response)
+            policy.stats.increment("retries")
+            time.sleep(policy.retry.delay(attempt))
+            attempt += 1
+
+    def _send(self, method, url, endpoint, **kwargs):
+        """Один HTTP-вызов с замером и уведомлением слушателей"""
+        ticket = self.limiter.acquire() if self.limiter else None
+        _connect_time.value = None
+        response = None
+        started = time.perf_counter()
+        try:
+            response = self.session.request(method, url, **kwargs)
+            if kwargs.get("stream") and any(getattr(listener, "needs_body", False) for listener in self.listeners):
+                response.content
+            return response
+        finally:
+            total = time.perf_counter() - started
+            if self.limiter:
+                self.limiter.release(ticket, endpoint, response, total)
+            if self.listeners:
+                timing = RequestTiming(
+                    method=method,
+                    endpoint=endpoint,
+                    status_code=response.status_code if response is not None else None,
+                    connect=_connect_time.value,
+                    ttfb=response.elapsed.total_seconds() if response is not None else None,
+                    total=total,
+                )
+                if response is not None and not response._content_consumed:
+                    # Тело еще не прочитано: замер завершит finish_stream
+                    response.pending_timing = (timing, started)
+                else:
+                    self._notify(timing, response)
+
+    def _notify(self, timing, response):
+        for listener in self.listeners:
+            listener(timing, response)
+
+    def finish_stream(self, response):
+        """Завершает замер вызова с stream=True после чтения тела и уведомляет слушателей"""
+        pending = getattr(response, "pending_timing", None)
+        if pending is None:
+            return
+        timing, started = pending
+        response.pending_timing = None
+        self._notify(timing._replace(total=time.perf_counter() - started), response)
+
+    def get(self, path, **kwargs):
+        return self.request("GET", path, **kwargs)
+
+    def post(self, path, **kwargs):
+        return self.request("POST", path, **kwargs)
+
+    def close(self):
+        self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
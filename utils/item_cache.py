@@ -0,0 +1,84 @@
+"""
+Кэш объявлений между запусками
+
+DELETE в API нет, поэтому каждое созданное объявление остается на сервере.
+Кэш хранит объявления прошлых запусков по ключу тела запроса; в начале
+запуска все записи проверяются одним запросом списка на каждого продавца,
+и повторно создаются только пропавшие или измененные объявления.
+"""
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+from utils.items import DEFAULT_CREATE_WORKERS, build_item, create_items
+
+# Поля, по которым объявление из списка продавца сверяется с телом запроса
+_COMPARED_FIELDS = ("sellerId", "name", "price", "statistics")
+
+
+def payload_key(payload):
+    return json.dumps(payload, sort_keys=True, ensure_ascii=False)
+
+
+class ItemCache:
+    """Объявления {ключ тела запроса: объявление} для одного base_url в JSON-файле
+
+    seller_id - продавец, под которым создаются кэшируемые объявления; он
+    сохраняется вместе с кэшем, чтобы тела запросов совпадали между запусками.
+    """
+
+    def __init__(self, path, base_url):
+        self.path = path
+        self.base_url = base_url
+        self.entries = {}
+        self.seller_id = None
+        self.reused = 0
+        self.created = 0
+        if os.path.exists(path):
+            with open(path) as source:
+                data = json.load(source)
+            if data.get("base_url") == base_url:
+                self.entries = data.get("items", {})
+                self.seller_id = data.get("seller_id")
+
+    def _listing(self, client, seller_id):
+        response = client.get(f"{seller_id}/item")
+        if response.status_code != 200:
+            return {}
+        return {item.get("id"): item for item in response.json() if isinstance(item, dict)}
+
+    def validate(self, client, max_workers=DEFAULT_CREATE_WORKERS):
+        """Удаляет записи, которых больше нет на сервере или которые не совпадают с телом
+        запроса; возвращает число удаленных записей"""
+        sellers = sorted({item["sellerId"] for item in self.entries.values()})
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            listings = dict(zip(sellers, executor.map(lambda seller_id: self._listing(client, seller_id), sellers)))
+
+        stale = []
+        for key, item in self.entries.items():
+            listed = listings[item["sellerId"]].get(item["id"])
+            expected = build_item(json.loads(key), item["id"])
+            if listed is None or any(listed.get(field) != expected[field] for field in _COMPARED_FIELDS):
+                stale.append(key)
+            else:
+                self.entries[key] = listed
+        for key in stale:
+            del self.entries[key]
+        return len(stale)
+
+    def get_or_create(self, client, payloads, max_workers=DEFAULT_CREATE_WORKERS):
+        """Объявления для payloads: из кэша или созданные заново"""
+        missing = [payload for payload in payloads if payload_key(payload) not in self.entries]
+        for payload, item in zip(missing, create_items(client, missing, max_workers=max_workers)):
+            self.entries[payload_key(payload)] = item
+        self.created += len(missing)
+        self.reused += len(payloads) - len(missing)
+        return [self.entries[payload_key(payload)] for payload in payloads]
+
+    def save(self):
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        data = {"base_url": self.base_url, "seller_id": self.seller_id, "items": self.entries}
+        with open(self.path, "w") as output:
+            json.dump(data, output, ensure_ascii=False, indent=1)
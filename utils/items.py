@@ -0,0 +1,127 @@
+"""
+Создание объявлений и пул заранее созданных объявлений
+"""
+import itertools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+DEFAULT_CREATE_WORKERS = 8
+
+
+def make_item_payload(seller_id, name="testItem", price=9900, likes=21, view_count=11, contacts=43):
+    """Тело запроса POST /api/1/item"""
+    return {
+        "sellerID": seller_id,
+        "name": name,
+        "price": price,
+        "statistics": {
+            "likes": likes,
+            "viewCount": view_count,
+            "contacts": contacts
+        }
+    }
+
+
+def make_pool_payloads(seller_ids):
+    """Тела запросов пула с уникальными именами poolItem_0..poolItem_{n-1}
+
+    Уникальные имена нужны кассете: одновременные POST пула при воспроизведении
+    сопоставляются с записями однозначно, а не в порядке завершения потоков.
+    """
+    return [make_item_payload(seller_id, name=f"poolItem_{index}") for index, seller_id in enumerate(seller_ids)]
+
+
+def extract_item_id(response_data):
+    """Извлекает id объявления из ответа POST /api/1/item"""
+    if isinstance(response_data, dict):
+        if "status" in response_data:
+            # API возвращает {"status": "Сохранили объявление - {id}"}
+            status_text = response_data["status"]
+            if " - " in status_text:
+                return status_text.split(" - ")[-1]
+        elif "id" in response_data:
+            return response_data["id"]
+    elif isinstance(response_data, list) and len(response_data) > 0:
+        if "id" in response_data[0]:
+            return response_data[0]["id"]
+    return None
+
+
+def fetch_item(client, item_id):
+    """Получает объявление по id, None если не удалось"""
+    response = client.get(f"item/{item_id}")
+    if response.status_code == 200:
+        items = response.json()
+        if isinstance(items, list) and len(items) > 0:
+            return items[0]
+    return None
+
+
+def build_item(payload, item_id):
+    """Объявление в формате ответа GET из тела запроса и id (без createdAt)"""
+    return {
+        "id": item_id,
+        "sellerId": payload["sellerID"],
+        "name": payload["name"],
+        "price": payload["price"],
+        "statistics": dict(payload["statistics"]),
+    }
+
+
+def create_item(client, payload, fetch=True):
+    """Создает объявление и возвращает его полные данные
+
+    При fetch=False объявление собирается из тела запроса и id из строки статуса
+    без дополнительного GET.
+    """
+    response = client.post("item", json=payload)
+    assert response.status_code == 200, f"Failed to create item: {response.text}"
+    response_data = response.json()
+
+    item_id = extract_item_id(response_data)
+    if isinstance(response_data, dict) and "createdAt" in response_data:
+        item_data = response_data
+    elif item_id and fetch:
+        item_data = fetch_item(client, item_id) or response_data
+    elif item_id:
+        item_data = build_item(payload, item_id)
+    else:
+        item_data = response_data
+
+    assert "id" in item_data, f"Response doesn't contain 'id': {item_data}"
+    return item_data
+
+
+def create_items(client, payloads, max_workers=DEFAULT_CREATE_WORKERS, fetch=True):
+    """Создает объявления параллельно, не более max_workers запросов одновременно"""
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(lambda payload: create_item(client, payload, fetch), payloads))
+
+
+def create_seller_items(client, seller_id, count, max_workers=DEFAULT_CREATE_WORKERS, fetch=True, **fields):
+    """Создает count объявлений продавца с именами testItem_0..testItem_{count-1}
+
+    POST и GET каждого объявления выполняются в одной задаче пула, поэтому
+    объявления возвращаются полностью заполненными за одну волну запросов.
+    """
+    payloads = [make_item_payload(seller_id, name=f"testItem_{index}", **fields) for index in range(count)]
+    return create_items(client, payloads, max_workers=max_workers, fetch=fetch)
+
+
+class ItemPool:
+    """Пул заранее созданных объявлений для тестов, которые их только читают"""
+
+    def __init__(self, items):
+        assert items, "Item pool can't be empty"
+        self.items = list(items)
+        # Объявления не изменяются, поэтому при исчерпании пула выдаются повторно
+        self._cycle = itertools.cycle(self.items)
+        self._lock = threading.Lock()
+
+    def checkout(self):
+        """Выдает следующее объявление из пула"""
+        with self._lock:
+            return next(self._cycle)
+
+    def __len__(self):
+        return len(self.items)
@@ -0,0 +1,215 @@
+"""
+Замер задержки видимости (read-after-write) созданных объявлений
+
+После POST /api/1/item объявление одновременно опрашивается в
+GET /api/1/{sellerID}/item и GET /api/1/statistic/{id} до первого появления,
+задержка каждого эндпоинта считается от завершения POST. Интервал опроса растет
+экспоненциально, а первый интервал подстраивается под медиану уже измеренных
+задержек. Прогон идет ступенями с возрастающей частотой записи.
+
+Запуск:
+    python -m utils.lag_probe --rates 1,5,10,20 --step-duration 30
+    python -m utils.lag_probe --local-api --rates 5,50 --step-duration 2
+"""
+import json
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from utils.http_client import ApiClient
+from utils.items import extract_item_id, make_item_payload
+from utils.load import build_parser
+from utils.sellers import SellerIdAllocator
+from utils.stats import LatencyStats, format_table
+from utils.stub_server import StubServer
+
+PROBED_ENDPOINTS = ("seller_items", "statistic")
+DEFAULT_TIMEOUT = 30.0
+MIN_DELAY = 0.005
+MAX_DELAY = 1.0
+BACKOFF_FACTOR = 1.6
+
+
+class AdaptiveBackoff:
+    """Интервалы опроса: старт с доли медианы прошлых задержек, затем рост до MAX_DELAY"""
+
+    def __init__(self, min_delay=MIN_DELAY, max_delay=MAX_DELAY, factor=BACKOFF_FACTOR, history=100):
+        self.min_delay = min_delay
+        self.max_delay = max_delay
+        self.factor = factor
+        self.history = history
+        self._lags = []
+        self._lock = threading.Lock()
+
+    def observe(self, lag):
+        with self._lock:
+            self._lags.append(lag)
+            del self._lags[:-self.history]
+
+    def delays(self):
+        with self._lock:
+            median = statistics.median(self._lags) if self._lags else 0.0
+        delay = max(self.min_delay, median / 4)
+        while True:
+            yield delay
+            delay = min(delay * self.factor, self.max_delay)
+
+
+def poll_until(check, backoff, timeout=DEFAULT_TIMEOUT, started=None):
+    """Вызывает check() до истинного результата; возвращает задержку от started или None"""
+    started = time.perf_counter() if started is None else started
+    for delay in backoff.delays():
+        if check():
+            lag = time.perf_counter() - started
+            backoff.observe(lag)
+            return lag
+        if time.perf_counter() - started + delay > timeout:
+            return None
+        time.sleep(delay)
+
+
+class VisibilityProbe:
+    """Создает объявления с заданной частотой и измеряет, когда они становятся видны"""
+
+    def __init__(self, client, seller_ids=None, timeout=DEFAULT_TIMEOUT, max_workers=64):
+        self.client = client
+        self.seller_ids = seller_ids or SellerIdAllocator()
+        self.timeout = timeout
+        self.max_workers = max_workers
+        self.backoff = {endpoint: AdaptiveBackoff() for endpoint in PROBED_ENDPOINTS}
+
+    def _in_listing(self, seller_id, item_id):
+        response = self.client.get(f"{seller_id}/item")
+        if response.status_code != 200:
+            return False
+        data = response.json()
+        return isinstance(data, list) and any(isinstance(item, dict) and item.get("id") == item_id for item in data)
+
+    def _statistic_matches(self, item_id, expected):
+        response = self.client.get(f"statistic/{item_id}")
+        if response.status_code != 200:
+            return False
+        data = response.json()
+        return isinstance(data, list) and bool(data) and data[0] == expected
+
+    def _checks(self, seller_id, item_id, payload):
+        return {
+            "seller_items": lambda: self._in_listing(seller_id, item_id),
+            "statistic": lambda: self._statistic_matches(item_id, payload["statistics"]),
+        }
+
+    def _poll(self, endpoint, check, written):
+        """poll_until для одного эндпоинта; возвращает (задержка или None, число неудачных запросов)
+
+        Ошибка запроса или разбора ответа (таймаут, обрыв, открытый circuit breaker,
+        не JSON) считается непоявлением объявления, опрос продолжается до timeout.
+        """
+        failures = 0
+
+        def safe_check():
+            nonlocal failures
+            try:
+                return check()
+            except Exception:
+                failures += 1
+                return False
+
+        return poll_until(safe_check, self.backoff[endpoint], self.timeout, written), failures
+
+    def probe_one(self, pollers):
+        """Создает объявление и запускает в pollers опрос эндпоинтов
+
+        Возвращает время завершения POST и {endpoint: future с результатом _poll};
+        None вместо словаря при ошибке POST. Эндпоинты опрашиваются одновременно,
+        у каждого свой timeout от момента записи.
+        """
+        seller_id = self.seller_ids.allocate()
+        payload = make_item_payload(seller_id)
+        try:
+            response = self.client.post("item", json=payload)
+            item_id = extract_item_id(response.json()) if response.status_code == 200 else None
+        except Exception:
+            item_id = None
+        written = time.perf_counter()
+        if not item_id:
+            return written, None
+        return written, {
+            endpoint: pollers.submit(self._poll, endpoint, check, written)
+            for endpoint, check in self._checks(seller_id, item_id, payload).items()
+        }
+
+    def run_step(self, rate, duration):
+        """Пишет rate объявлений в секунду в течение duration секунд; возвращает сводку задержек
+
+        Опрос идет в отдельном пуле, чтобы долгие ожидания видимости не задерживали
+        расписание записи; rps - фактическая частота завершения POST.
+        """
+        lags = {endpoint: LatencyStats() for endpoint in PROBED_ENDPOINTS}
+        failed_polls = dict.fromkeys(PROBED_ENDPOINTS, 0)
+        failed_writes = 0
+        pollers = ThreadPoolExecutor(max_workers=self.max_workers * len(PROBED_ENDPOINTS))
+        with pollers, ThreadPoolExecutor(max_workers=self.max_workers) as writers:
+            started = time.perf_counter()
+            futures = []
+            for index in range(max(round(rate * duration), 1)):
+                time.sleep(max(0.0, started + index / rate - time.perf_counter()))
+                futures.append(writers.submit(self.probe_one, pollers))
+            probes = [future.result() for future in futures]
+            for _, polls in probes:
+                if polls is None:
+                    failed_writes += 1
+                    continue
+                for endpoint, poll in polls.items():
+                    lag, failures = poll.result()
+                    failed_polls[endpoint] += failures
+                    lags[endpoint].add(lag if lag is not None else self.timeout, ok=lag is not None)
+
+        written = sorted(written for written, _ in probes)
+        span = written[-1] - written[0]
+        rps = (len(written) - 1) / span if span > 0 else None
+        summaries = {}
+        for endpoint, stats in lags.items():
+            summary = stats.summary()
+            summary["rps"] = rps
+            summary["failed_writes"] = failed_writes
+            summary["failed_polls"] = failed_polls[endpoint]
+            summaries[f"{rate:g}/s {endpoint}"] = summary
+        return summaries
+
+
+def main(argv=None):
+    parser = build_parser("Замер задержки видимости созданных объявлений")
+    parser.add_argument("--rates", default="1,5,10,20",
+                        help="Частоты записи (объявлений в секунду) для ступеней прогона")
+    parser.add_argument("--step-duration", type=float, default=30.0, help="Длительность ступени в секундах")
+    parser.add_argument("--timeout", type=float, default=DEFAULT_TIMEOUT,
+                        help="Сколько ждать появления объявления, секунд")
+    args = parser.parse_args(argv)
+    rates = [float(rate) for rate in args.rates.split(",")]
+
+    server = StubServer().start() if args.local_api else None
+    api_url = server.url if server else args.api_url
+    summaries = {}
+    try:
+        with ApiClient(api_url, pool_size=64) as client:
+            probe = VisibilityProbe(client, timeout=args.timeout)
+            for rate in rates:
+                summaries.update(probe.run_step(rate, args.step_duration))
+    finally:
+        if server:
+            server.stop()
+
+    # requests - число проб, errors - объявления, не ставшие видимыми за timeout,
+    # rps - фактическая частота записи, перцентили - задержка видимости в мс
+    print(format_table(summaries))
+    for name, summary in summaries.items():
+        if summary["failed_writes"] or summary["failed_polls"]:
+            print(f"{name}: failed writes {summary['failed_writes']}, failed poll requests {summary['failed_polls']}")
+    if args.json_path:
+        with open(args.json_path, "w") as output:
+            json.dump(summaries, output, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,214 @@
+"""
+Нагрузочный прогон API объявлений на asyncio
+
+Запуск:
+    python -m utils.load --concurrency 32 --duration 30
+    python -m utils.load --local-api --requests 2000 --mix create=1,get_item=4
+    python -m utils.load --duration 60 --rate 200 --max-concurrency 64
+"""
+import argparse
+import asyncio
+import json
+import random
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+from utils.http_client import DEFAULT_BASE_URL, ApiClient
+from utils.items import extract_item_id, make_item_payload
+from utils.schemas import validate_response
+from utils.sellers import SellerIdAllocator
+from utils.stats import LatencyStats, format_table
+from utils.stub_server import StubServer
+from utils.throttle import build_rate_limiter
+
+ENDPOINTS = ("create", "get_item", "seller_items", "statistic")
+DEFAULT_MIX = {"create": 1, "get_item": 4, "seller_items": 2, "statistic": 2}
+DEFAULT_SEED_ITEMS = 10
+# Сколько последних созданных объявлений хранится для запросов чтения
+DEFAULT_KNOWN_ITEMS = 1000
+
+
+def parse_mix(text):
+    """Разбирает строку вида "create=1,get_item=4" в словарь весов"""
+    mix = {}
+    for part in text.split(","):
+        endpoint, _, weight = part.partition("=")
+        endpoint = endpoint.strip()
+        if endpoint not in ENDPOINTS:
+            raise ValueError(f"Unknown endpoint '{endpoint}', expected one of {ENDPOINTS}")
+        mix[endpoint] = float(weight) if weight else 1.0
+    return mix
+
+
+class ItemApiOperations:
+    """Синхронные вызовы эндпоинтов с общим буфером созданных объявлений
+
+    Хранятся только max_known_items последних объявлений, поэтому память не растет
+    в многочасовых прогонах.
+    """
+
+    def __init__(self, client, seller_ids=None, payload_factory=make_item_payload,
+                 max_known_items=DEFAULT_KNOWN_ITEMS):
+        self.client = client
+        self.seller_ids = seller_ids or SellerIdAllocator()
+        self.payload_factory = payload_factory
+        # Пары (item_id, seller_id); deque.append и random.choice потокобезопасны в CPython
+        self.known_items = deque(maxlen=max_known_items)
+
+    def create(self):
+        seller_id = self.seller_ids.allocate()
+        response = self.client.post("item", json=self.payload_factory(seller_id))
+        if response.status_code == 200:
+            item_id = extract_item_id(response.json())
+            if item_id:
+                self.known_items.append((item_id, seller_id))
+        return response
+
+    def get_item(self):
+        item_id, _ = random.choice(self.known_items)
+        return self.client.get(f"item/{item_id}")
+
+    def seller_items(self):
+        _, seller_id = random.choice(self.known_items)
+        return self.client.get(f"{seller_id}/item")
+
+    def statistic(self):
+        item_id, _ = random.choice(self.known_items)
+        return self.client.get(f"statistic/{item_id}")
+
+    def seed(self, count):
+        """Создает объявления, без которых нельзя вызывать эндпоинты чтения"""
+        for _ in range(count):
+            self.create()
+        assert self.known_items, "Failed to create seed items for load run"
+
+    def timed_call(self, endpoint):
+        """Выполняет вызов и возвращает (задержка в секундах, успешность);
+        успешен ответ 200, тело которого соответствует схеме эндпоинта"""
+        started = time.perf_counter()
+        try:
+            response = getattr(self, endpoint)()
+            latency = time.perf_counter() - started
+            ok = response.status_code == 200 and validate_response(response) is None
+        except Exception:
+            latency = time.perf_counter() - started
+            ok = False
+        return latency, ok
+
+
+class LoadResult:
+    """Статистика по эндпоинтам и длительность прогона"""
+
+    def __init__(self, stats, elapsed):
+        self.stats = stats
+        self.elapsed = elapsed
+
+    def summaries(self):
+        return {endpoint: stats.summary(self.elapsed) for endpoint, stats in self.stats.items()}
+
+
+async def run_load(client, mix=None, concurrency=16, duration=None, total_requests=None,
+                   seller_ids=None, seed_items=DEFAULT_SEED_ITEMS, stats=None):
+    """Держит concurrency одновременных запросов в пропорциях mix до окончания duration
+    секунд или total_requests запросов
+
+    stats - готовый словарь {endpoint: статистика с методом add(latency, ok)};
+    по умолчанию для каждого эндпоинта создается LatencyStats.
+    """
+    assert duration or total_requests, "Either duration or total_requests is required"
+    mix = mix or DEFAULT_MIX
+    endpoints, weights = list(mix), list(mix.values())
+
+    loop = asyncio.get_running_loop()
+    operations = ItemApiOperations(client, seller_ids)
+    if stats is None:
+        stats = {endpoint: LatencyStats() for endpoint in endpoints}
+
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        await loop.run_in_executor(executor, operations.seed, seed_items)
+
+        started = time.perf_counter()
+        deadline = started + duration if duration else None
+        budget = {"remaining": total_requests}
+
+        def has_work():
+            if deadline is not None and time.perf_counter() >= deadline:
+                return False
+            if total_requests is not None:
+                if budget["remaining"] <= 0:
+                    return False
+                budget["remaining"] -= 1
+            return True
+
+        async def worker():
+            while has_work():
+                endpoint = random.choices(endpoints, weights)[0]
+                latency, ok = await loop.run_in_executor(executor, operations.timed_call, endpoint)
+                stats[endpoint].add(latency, ok)
+
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+
+    return LoadResult(stats, elapsed)
+
+
+def build_parser(description):
+    """Общие аргументы командной строки нагрузочных утилит"""
+    parser = argparse.ArgumentParser(description=description)
+    parser.add_argument("--api-url", default=DEFAULT_BASE_URL, help="Базовый URL API")
+    parser.add_argument("--local-api", action="store_true", help="Запустить локальную заглушку API")
+    parser.add_argument("--json", dest="json_path", help="Сохранить результат в JSON-файл")
+    return parser
+
+
+def add_rate_limit_arguments(parser):
+    """Аргументы общего ограничителя нагрузки (utils/throttle.py)"""
+    parser.add_argument("--rate", type=float, help="Не больше N запросов в секунду")
+    parser.add_argument("--burst", type=float, help="Запас токенов для всплесков (по умолчанию равен --rate)")
+    parser.add_argument("--max-concurrency", type=int,
+                        help="Подбирать число одновременных запросов (AIMD) не выше N")
+
+
+def rate_limiter_from_args(args):
+    """RateLimiter по аргументам; при AIMD-лимите воркеров не меньше его верхней границы"""
+    if args.max_concurrency:
+        args.concurrency = max(args.concurrency, args.max_concurrency)
+    return build_rate_limiter(args.rate, args.burst, args.max_concurrency)
+
+
+def main(argv=None):
+    parser = build_parser("Нагрузочный прогон API объявлений")
+    parser.add_argument("--mix", type=parse_mix, default=DEFAULT_MIX,
+                        help="Веса эндпоинтов, например create=1,get_item=4,seller_items=2,statistic=2")
+    parser.add_argument("--concurrency", type=int, default=16, help="Число одновременных запросов")
+    parser.add_argument("--duration", type=float, help="Длительность прогона в секундах")
+    parser.add_argument("--requests", dest="total_requests", type=int, help="Общее число запросов")
+    add_rate_limit_arguments(parser)
+    args = parser.parse_args(argv)
+    if not args.duration and not args.total_requests:
+        parser.error("one of --duration or --requests is required")
+    limiter = rate_limiter_from_args(args)
+
+    server = StubServer().start() if args.local_api else None
+    api_url = server.url if server else args.api_url
+    try:
+        with ApiClient(api_url, pool_size=args.concurrency, limiter=limiter) as client:
+            result = asyncio.run(run_load(client, args.mix, args.concurrency,
+                                          args.duration, args.total_requests))
+    finally:
+        if server:
+            server.stop()
+
+    summaries = result.summaries()
+    print(format_table(summaries))
+    print(f"elapsed: {result.elapsed:.2f}s")
+    if limiter:
+        print("rate limiting: " + ", ".join(f"{name}: {value}" for name, value in limiter.as_dict().items()))
+    if args.json_path:
+        with open(args.json_path, "w") as output:
+            json.dump({"elapsed": result.elapsed, "endpoints": summaries}, output, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""
+Объединение HTML-отчетов pytest-html и файлов длительностей, полученных с шардов
+
+Запуск:
+    python -m utils.merge_reports reports/shard-*.html --output reports/report.html
+    python -m utils.merge_reports reports/shard-*.html --durations durations/*.json \\
+        --durations-output .test_durations.json
+"""
+import argparse
+import html
+import json
+import os
+import re
+
+from utils.sharding import load_durations, save_durations
+
+DEFAULT_OUTPUT = "reports/report.html"
+
+_BLOB_RE = re.compile(r'(<div id="data-container" data-jsonblob=")([^"]*)(")')
+_RUN_COUNT_RE = re.compile(r'(<p class="run-count">)(.*?)(</p>)', re.S)
+_POSTFIX_RE = re.compile(r'(<div class="additional-summary postfix">)(.*?)(</div>)', re.S)
+_TOOK_RE = re.compile(r"took (.+)\.$")
+# Итог теста в pytest-html -> класс счетчика в фильтрах отчета
+_RESULT_CLASSES = {
+    "failed": "failed", "passed": "passed", "skipped": "skipped", "xfailed": "xfailed",
+    "xpassed": "xpassed", "error": "error", "rerun": "rerun", "retried": "retried",
+}
+
+
+def parse_duration(text):
+    """Секунды из формата pytest-html: "524 ms" или "01:02:03" """
+    text = text.strip()
+    if text.endswith(" ms"):
+        return int(text[:-3]) / 1000
+    hours, minutes, seconds = (int(part) for part in text.split(":"))
+    return hours * 3600 + minutes * 60 + seconds
+
+
+def read_report(path):
+    with open(path, encoding="utf-8") as source:
+        content = source.read()
+    match = _BLOB_RE.search(content)
+    if match is None:
+        raise ValueError(f"{path} is not a pytest-html report (no data-jsonblob)")
+    return content, json.loads(html.unescape(match.group(2)))
+
+
+def merge_reports(paths):
+    """HTML объединенного отчета: тесты всех шардов, пересчитанные счетчики,
+    сводки шардов друг за другом; время прогона - время самого долгого шарда"""
+    template, merged = None, None
+    longest, took_text, postfixes = -1.0, "", []
+    for path in paths:
+        content, data = read_report(path)
+        if template is None:
+            template, merged = content, data
+        else:
+            merged["tests"].update(data["tests"])
+        run_count = _RUN_COUNT_RE.search(content)
+        took = _TOOK_RE.search(run_count.group(2).strip()) if run_count else None
+        if took and parse_duration(took.group(1)) > longest:
+            longest, took_text = parse_duration(took.group(1)), took.group(1)
+        postfix = _POSTFIX_RE.search(content)
+        if postfix and postfix.group(2).strip():
+            postfixes.append(f"<h3>{html.escape(os.path.basename(path))}</h3>{postfix.group(2)}")
+
+    counts = dict.fromkeys(_RESULT_CLASSES.values(), 0)
+    for results in merged["tests"].values():
+        for result in results:
+            counts[_RESULT_CLASSES.get(result["result"].lower(), "error")] += 1
+    total = sum(len(results) for results in merged["tests"].values())
+
+    blob = html.escape(json.dumps(merged), quote=True)
+    content = _BLOB_RE.sub(lambda match: match.group(1) + blob + match.group(3), template, count=1)
+    content = _RUN_COUNT_RE.sub(
+        lambda match: f"{match.group(1)}{total} tests took {took_text} "
+                      f"(longest of {len(paths)} shards).{match.group(3)}",
+        content, count=1)
+    content = _POSTFIX_RE.sub(lambda match: match.group(1) + "".join(postfixes) + match.group(3), content, count=1)
+    for css_class, count in counts.items():
+        content = re.sub(rf'(<span class="{css_class}">)\d+', rf"\g<1>{count}", content, count=1)
+        # Фильтр по итогу доступен, только если таких тестов больше нуля
+        checkbox = rf'(data-test-result="{css_class}")\s*(disabled)?>'
+        content = re.sub(checkbox, rf"\g<1> {'' if count else 'disabled'}>", content, count=1)
+    return content
+
+
+def merge_durations(paths):
+    merged = {}
+    for path in paths:
+        merged.update(load_durations(path))
+    return merged
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Объединение отчетов pytest-html с шардов")
+    parser.add_argument("reports", nargs="+", help="HTML-отчеты шардов")
+    parser.add_argument("--output", default=DEFAULT_OUTPUT, help="Итоговый отчет (по умолчанию %(default)s)")
+    parser.add_argument("--durations", nargs="*", default=[], help="Файлы длительностей тестов с шардов")
+    parser.add_argument("--durations-output", help="Куда записать объединенные длительности")
+    args = parser.parse_args(argv)
+
+    directory = os.path.dirname(args.output)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(args.output, "w", encoding="utf-8") as output:
+        output.write(merge_reports(args.reports))
+    print(f"merged {len(args.reports)} reports -> {args.output}")
+
+    if args.durations and args.durations_output:
+        save_durations(args.durations_output, merge_durations(args.durations))
+        print(f"merged {len(args.durations)} duration files -> {args.durations_output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,174 @@
+"""
+Нагрузочный прогон в нескольких процессах: по одному на ядро
+
+Один процесс упирается в GIL и разбор JSON раньше, чем в API. Здесь каждый
+процесс получает свой диапазон sellerID и свой пул соединений и гоняет
+utils.load (или utils.open_loop с --rate, частота делится между процессами).
+Гистограммы задержек и счетчики ошибок процессов объединяются в один результат.
+
+Запуск:
+    python -m utils.multiprocess_load --concurrency 32 --duration 60
+    python -m utils.multiprocess_load --processes 4 --rate 4000 --duration 60 --arrival poisson
+    python -m utils.multiprocess_load --local-api --requests 5000
+"""
+import asyncio
+import json
+import multiprocessing
+import os
+import random
+
+from utils.histogram import LatencyHistogram
+from utils.http_client import ApiClient
+from utils.load import DEFAULT_MIX, DEFAULT_SEED_ITEMS, LoadResult, build_parser, parse_mix, run_load
+from utils.open_loop import ARRIVALS, run_open_loop
+from utils.sellers import SellerIdAllocator
+from utils.stats import format_table
+from utils.stub_server import StubServer
+
+# Запас на запуск процессов и засев объявлений сверх длительности прогона
+START_TIMEOUT = 60.0
+
+
+def split_evenly(total, parts):
+    """Делит total на parts целых долей, отличающихся не больше чем на 1"""
+    return [total // parts + (1 if index < total % parts else 0) for index in range(parts)]
+
+
+def _run_worker(index, processes, api_url, options, start, results):
+    """Тело процесса: свой аллокатор sellerID и клиент, результат - гистограммы в словарях"""
+    try:
+        # После fork у процессов одинаковое состояние random
+        random.seed()
+        seller_ids = SellerIdAllocator(index, processes)
+        with ApiClient(api_url, pool_size=options["concurrency"]) as client:
+            start.wait(START_TIMEOUT)
+            if options["rate"]:
+                result = asyncio.run(run_open_loop(
+                    client, options["rate"] / processes, options["duration"], options["mix"],
+                    options["arrival"], options["concurrency"], seller_ids, options["seed_items"],
+                ))
+            else:
+                stats = {endpoint: LatencyHistogram() for endpoint in options["mix"]}
+                result = asyncio.run(run_load(
+                    client, options["mix"], options["concurrency"], options["duration"],
+                    options["total_requests"][index], seller_ids, options["seed_items"], stats,
+                ))
+        histograms = {endpoint: histogram.to_dict() for endpoint, histogram in result.stats.items()}
+        results.put((index, {"elapsed": result.elapsed, "histograms": histograms}, None))
+    except BaseException as exc:
+        results.put((index, None, repr(exc)))
+
+
+class MultiProcessResult(LoadResult):
+    """Объединенные гистограммы процессов; elapsed - длительность самого долгого процесса"""
+
+    def __init__(self, stats, elapsed, workers):
+        super().__init__(stats, elapsed)
+        self.workers = workers
+
+
+def merge_worker_results(worker_results):
+    """MultiProcessResult из результатов процессов {"elapsed", "histograms"}"""
+    stats = {}
+    for worker in worker_results:
+        for endpoint, data in worker["histograms"].items():
+            histogram = LatencyHistogram.from_dict(data)
+            if endpoint in stats:
+                stats[endpoint].merge(histogram)
+            else:
+                stats[endpoint] = histogram
+    elapsed = max((worker["elapsed"] for worker in worker_results), default=0.0)
+    return MultiProcessResult(stats, elapsed, len(worker_results))
+
+
+def run_multiprocess_load(api_url, processes=None, mix=None, concurrency=16, duration=None, total_requests=None,
+                          rate=None, arrival="fixed", seed_items=DEFAULT_SEED_ITEMS):
+    """Запускает processes процессов (по умолчанию по числу ядер) с concurrency запросами
+    в каждом и объединяет их статистику
+
+    Без rate процессы работают как utils.load: total_requests делится между ними.
+    С rate - как utils.open_loop с частотой rate / processes в каждом.
+    """
+    assert duration or total_requests, "Either duration or total_requests is required"
+    assert duration or not rate, "Open-loop mode (rate) requires duration"
+    processes = processes or os.cpu_count() or 1
+    options = {
+        "mix": mix or DEFAULT_MIX,
+        "concurrency": concurrency,
+        "duration": duration,
+        "total_requests": split_evenly(total_requests, processes) if total_requests else [None] * processes,
+        "rate": rate,
+        "arrival": arrival,
+        "seed_items": seed_items,
+    }
+    # fork в Linux, spawn в Windows и macOS: аргументы процессов сериализуемы
+    context = multiprocessing.get_context()
+    # Процессы начинают нагрузку одновременно, когда все клиенты созданы
+    start = context.Barrier(processes)
+    results = context.Queue()
+    workers = [
+        context.Process(target=_run_worker, args=(index, processes, api_url, options, start, results),
+                        name=f"load-worker-{index}", daemon=True)
+        for index in range(processes)
+    ]
+    for worker in workers:
+        worker.start()
+
+    worker_results, errors = {}, {}
+    try:
+        for _ in workers:
+            index, result, error = results.get(timeout=(duration or 0) + START_TIMEOUT * 5)
+            if error is None:
+                worker_results[index] = result
+            else:
+                errors[index] = error
+    finally:
+        for worker in workers:
+            worker.join(timeout=5)
+            if worker.is_alive():
+                worker.terminate()
+    if errors:
+        raise RuntimeError(f"Load workers failed: {errors}")
+    return merge_worker_results([worker_results[index] for index in sorted(worker_results)])
+
+
+def main(argv=None):
+    parser = build_parser("Нагрузочный прогон API объявлений в нескольких процессах")
+    parser.add_argument("--processes", type=int, default=None,
+                        help="Число процессов (по умолчанию по числу ядер)")
+    parser.add_argument("--mix", type=parse_mix, default=DEFAULT_MIX,
+                        help="Веса эндпоинтов, например create=1,get_item=4,seller_items=2,statistic=2")
+    parser.add_argument("--concurrency", type=int, default=16,
+                        help="Число одновременных запросов в каждом процессе")
+    parser.add_argument("--duration", type=float, help="Длительность прогона в секундах")
+    parser.add_argument("--requests", dest="total_requests", type=int, help="Общее число запросов")
+    parser.add_argument("--rate", type=float,
+                        help="Общая частота запросов в секунду (открытая модель, см. utils.open_loop)")
+    parser.add_argument("--arrival", choices=ARRIVALS, default="fixed", help="Модель поступления запросов при --rate")
+    args = parser.parse_args(argv)
+    if not args.duration and not args.total_requests:
+        parser.error("one of --duration or --requests is required")
+    if args.rate and not args.duration:
+        parser.error("--rate requires --duration")
+
+    server = StubServer().start() if args.local_api else None
+    api_url = server.url if server else args.api_url
+    try:
+        result = run_multiprocess_load(api_url, args.processes, args.mix, args.concurrency, args.duration,
+                                       args.total_requests, args.rate, args.arrival)
+    finally:
+        if server:
+            server.stop()
+
+    summaries = result.summaries()
+    print(format_table(summaries))
+    print(f"processes: {result.workers}, elapsed: {result.elapsed:.2f}s")
+    if args.json_path:
+        with open(args.json_path, "w") as output:
+            json.dump({"elapsed": result.elapsed, "processes": result.workers, "endpoints": summaries,
+                       "histograms": {endpoint: stats.to_dict() for endpoint, stats in result.stats.items()}},
+                      output, indent=2)
+
+
+if __name__ == "__main__":
+    main()
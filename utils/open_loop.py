@@ -0,0 +1,143 @@
+"""
+Нагрузочный прогон с открытой моделью поступления запросов
+
+В utils.load каждый воркер ждет ответа перед следующим запросом, поэтому при
+зависании API запросы просто не отправляются, и хвост задержек занижается
+(coordinated omission). Здесь запросы запускаются по расписанию с постоянной
+частотой (--arrival fixed) или пуассоновским потоком (--arrival poisson)
+независимо от ответов, а задержка считается от запланированного момента
+отправки. Для сравнения отдельно копится время обслуживания - от фактической
+отправки до ответа.
+
+Запуск:
+    python -m utils.open_loop --rate 200 --duration 60 --arrival poisson
+    python -m utils.open_loop --local-api --rate 100 --duration 5
+"""
+import asyncio
+import json
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from utils.histogram import LatencyHistogram
+from utils.http_client import ApiClient
+from utils.load import DEFAULT_MIX, DEFAULT_SEED_ITEMS, ItemApiOperations, LoadResult, build_parser, parse_mix
+from utils.stats import format_table
+from utils.stub_server import StubServer
+
+ARRIVALS = ("fixed", "poisson")
+DEFAULT_MAX_WORKERS = 256
+
+
+def arrival_offsets(rate, duration, arrival="fixed", rng=random):
+    """Моменты отправки в секундах от начала: первый сразу, дальше через 1 / rate
+    или с экспоненциальными интервалами со средним 1 / rate"""
+    assert arrival in ARRIVALS, f"Unknown arrival process '{arrival}', expected one of {ARRIVALS}"
+    offset, index = 0.0, 0
+    while offset < duration:
+        yield offset
+        index += 1
+        # Для fixed без накопления ошибки округления при суммировании интервалов
+        offset = index / rate if arrival == "fixed" else offset + rng.expovariate(rate)
+
+
+class OpenLoopResult(LoadResult):
+    """stats - задержка от запланированной отправки, service_stats - от фактической"""
+
+    def __init__(self, stats, service_stats, elapsed, scheduled, late_sends):
+        super().__init__(stats, elapsed)
+        self.service_stats = service_stats
+        self.scheduled = scheduled
+        self.late_sends = late_sends
+
+    def service_summaries(self):
+        return {endpoint: stats.summary(self.elapsed) for endpoint, stats in self.service_stats.items()}
+
+
+async def run_open_loop(client, rate, duration, mix=None, arrival="fixed", max_workers=DEFAULT_MAX_WORKERS,
+                        seller_ids=None, seed_items=DEFAULT_SEED_ITEMS, rng=random):
+    """Отправляет запросы в пропорциях mix с частотой rate в секунду в течение duration
+    секунд, не дожидаясь ответов; возвращает OpenLoopResult
+
+    Если все max_workers потоков заняты, запрос ждет в очереди пула, и это
+    ожидание входит в задержку, как и у реального пользователя.
+    """
+    mix = mix or DEFAULT_MIX
+    endpoints, weights = list(mix), list(mix.values())
+    stats = {endpoint: LatencyHistogram() for endpoint in endpoints}
+    service_stats = {endpoint: LatencyHistogram() for endpoint in endpoints}
+
+    loop = asyncio.get_running_loop()
+    operations = ItemApiOperations(client, seller_ids)
+
+    def call(endpoint, intended):
+        service_time, ok = operations.timed_call(endpoint)
+        return time.perf_counter() - intended, service_time, ok
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        await loop.run_in_executor(executor, operations.seed, seed_items)
+
+        async def send(endpoint, intended):
+            latency, service_time, ok = await loop.run_in_executor(executor, call, endpoint, intended)
+            stats[endpoint].add(latency, ok)
+            service_stats[endpoint].add(service_time, ok)
+
+        # Только незавершенные задачи: память не растет с rate * duration
+        tasks = set()
+        scheduled = late_sends = 0
+        started = time.perf_counter()
+        for offset in arrival_offsets(rate, duration, arrival, rng):
+            intended = started + offset
+            delay = intended - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            else:
+                # Планировщик не успевает: запрос уходит сразу, задержка все равно от intended
+                late_sends += 1
+            endpoint = rng.choices(endpoints, weights)[0]
+            task = asyncio.create_task(send(endpoint, intended))
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+            scheduled += 1
+        await asyncio.gather(*tasks)
+        elapsed = time.perf_counter() - started
+
+    return OpenLoopResult(stats, service_stats, elapsed, scheduled, late_sends)
+
+
+def main(argv=None):
+    parser = build_parser("Нагрузочный прогон API объявлений с открытой моделью поступления запросов")
+    parser.add_argument("--mix", type=parse_mix, default=DEFAULT_MIX,
+                        help="Веса эндпоинтов, например create=1,get_item=4,seller_items=2,statistic=2")
+    parser.add_argument("--rate", type=float, required=True, help="Частота отправки запросов в секунду")
+    parser.add_argument("--duration", type=float, required=True, help="Длительность прогона в секундах")
+    parser.add_argument("--arrival", choices=ARRIVALS, default="fixed",
+                        help="Постоянные интервалы или пуассоновский поток (по умолчанию %(default)s)")
+    parser.add_argument("--max-workers", type=int, default=DEFAULT_MAX_WORKERS,
+                        help="Предел одновременных запросов (по умолчанию %(default)s)")
+    args = parser.parse_args(argv)
+
+    server = StubServer().start() if args.local_api else None
+    api_url = server.url if server else args.api_url
+    try:
+        with ApiClient(api_url, pool_size=args.max_workers) as client:
+            result = asyncio.run(run_open_loop(client, args.rate, args.duration, args.mix,
+                                               args.arrival, args.max_workers))
+    finally:
+        if server:
+            server.stop()
+
+    summaries, service = result.summaries(), result.service_summaries()
+    print("latency from intended send time:")
+    print(format_table(summaries))
+    print("service time:")
+    print(format_table(service))
+    print(f"elapsed: {result.elapsed:.2f}s, scheduled: {result.scheduled}, late sends: {result.late_sends}")
+    if args.json_path:
+        with open(args.json_path, "w") as output:
+            json.dump({"elapsed": result.elapsed, "rate": args.rate, "arrival": args.arrival,
+                       "endpoints": summaries, "service": service}, output, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,170 @@
+"""
+Таймауты по эндпоинтам, повтор идемпотентных запросов и circuit breaker
+"""
+import random
+import threading
+import time
+
+import pytest
+import requests
+
+# (connect timeout, read timeout) в секундах по шаблону эндпоинта
+DEFAULT_ENDPOINT_TIMEOUTS = {
+    "POST /api/1/item": (3.05, 10),
+    "GET /api/1/item/{id}": (3.05, 10),
+    "GET /api/1/statistic/{id}": (3.05, 10),
+    # Список объявлений продавца растет вместе с числом объявлений
+    "GET /api/1/{sellerID}/item": (3.05, 30),
+}
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+RETRY_STATUS_CODES = frozenset({500, 502, 503, 504})
+
+
+class CircuitOpenError(requests.exceptions.ConnectionError):
+    """Запрос не отправлен: API признан недоступным после серии ошибок"""
+
+
+class ResilienceStats:
+    """Счетчики повторов и срабатываний circuit breaker"""
+
+    def __init__(self):
+        self.retries = 0
+        self.breaker_trips = 0
+        self.fast_failures = 0
+        self._lock = threading.Lock()
+
+    def increment(self, counter):
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def as_dict(self):
+        return {"retries": self.retries, "breaker_trips": self.breaker_trips, "fast_failures": self.fast_failures}
+
+
+class RetryPolicy:
+    """Повтор идемпотентных запросов при 5xx и сетевых ошибках с экспоненциальной
+    задержкой и полным джиттером: uniform(0, min(max_delay, base_delay * 2 ** attempt))"""
+
+    def __init__(self, retries=2, base_delay=0.2, max_delay=5.0, status_codes=RETRY_STATUS_CODES):
+        self.retries = retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.status_codes = status_codes
+
+    def should_retry(self, method, attempt, response=None, error=None):
+        if method not in IDEMPOTENT_METHODS or attempt >= self.retries:
+            return False
+        if error is not None:
+            return isinstance(error, (requests.ConnectionError, requests.Timeout)) \
+                and not isinstance(error, CircuitOpenError)
+        return response.status_code in self.status_codes
+
+    def delay(self, attempt):
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+
+
+class CircuitBreaker:
+    """После failure_threshold ошибок подряд запросы отклоняются reset_timeout секунд,
+    затем пропускается один пробный запрос: успех закрывает цепь, ошибка снова размыкает
+
+    Пока пробный запрос не завершился, остальные запросы тоже отклоняются. Если его
+    результат так и не записан (исключение вне requests), через reset_timeout
+    пропускается следующий пробный запрос.
+    """
+
+    CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+
+    def __init__(self, failure_threshold=5, reset_timeout=30.0, stats=None):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.stats = stats or ResilienceStats()
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = None
+        self.trial_started = None
+        self._lock = threading.Lock()
+
+    def before_request(self):
+        with self._lock:
+            now = time.monotonic()
+            if self.state == self.OPEN:
+                if now - self.opened_at < self.reset_timeout:
+                    self.stats.increment("fast_failures")
+                    raise CircuitOpenError(
+                        f"Circuit breaker is open after {self.failures} consecutive failures, "
+                        f"retry in {self.reset_timeout - (now - self.opened_at):.1f}s"
+                    )
+            elif self.state == self.HALF_OPEN:
+                if now - self.trial_started < self.reset_timeout:
+                    self.stats.increment("fast_failures")
+                    raise CircuitOpenError("Circuit breaker is half-open, waiting for the trial request")
+            else:
+                return
+            self.state = self.HALF_OPEN
+            self.trial_started = now
+
+    def record_success(self):
+        with self._lock:
+            self.state = self.CLOSED
+            self.failures = 0
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.state == self.HALF_OPEN or (
+                    self.state == self.CLOSED and self.failures >= self.failure_threshold):
+                self.state = self.OPEN
+                self.opened_at = time.monotonic()
+                self.stats.increment("breaker_trips")
+
+
+class ResiliencePolicy:
+    """Настройки устойчивости ApiClient: таймауты, повторы и circuit breaker"""
+
+    def __init__(self, endpoint_timeouts=None, retry=None, breaker=None, stats=None):
+        self.stats = stats or ResilienceStats()
+        self.endpoint_timeouts = dict(DEFAULT_ENDPOINT_TIMEOUTS)
+        if endpoint_timeouts:
+            self.endpoint_timeouts.update(endpoint_timeouts)
+        self.retry = retry or RetryPolicy()
+        self.breaker = breaker or CircuitBreaker(stats=self.stats)
+        self.breaker.stats = self.stats
+
+    def timeout_for(self, endpoint, default):
+        return self.endpoint_timeouts.get(endpoint, default)
+
+    def is_failure(self, response=None, error=None):
+        """Ошибки, которые учитывает circuit breaker: сеть, таймауты и 5xx"""
+        return error is not None or response.status_code >= 500
+
+
+def parse_endpoint_timeout(text):
+    """Разбирает "GET /api/1/{sellerID}/item=5,30" в (эндпоинт, (connect, read))"""
+    endpoint, _, value = text.rpartition("=")
+    parts = [float(part) for part in value.split(",")]
+    if not endpoint or len(parts) not in (1, 2):
+        raise ValueError(f"Expected 'METHOD /path=read' or 'METHOD /path=connect,read', got '{text}'")
+    return endpoint, tuple(parts) if len(parts) == 2 else parts[0]
+
+
+class ResiliencePlugin:
+    """pytest-плагин: счетчики повторов и срабатываний breaker в терминале и pytest-html"""
+
+    TITLES = {"retries": "Повторов", "breaker_trips": "Срабатываний breaker", "fast_failures": "Отклонено breaker"}
+
+    def __init__(self, stats):
+        self.stats = stats
+
+    def pytest_terminal_summary(self, terminalreporter):
+        counters = self.stats.as_dict()
+        if any(counters.values()):
+            terminalreporter.write_sep("-", "HTTP resilience")
+            terminalreporter.write_line(", ".join(f"{name}: {value}" for name, value in counters.items()))
+
+    @pytest.hookimpl(optionalhook=True)
+    def pytest_html_results_summary(self, prefix, summary, postfix, session):
+        rows = "".join(
+            f"<tr><td>{self.TITLES[name]}</td><td>{value}</td></tr>"
+            for name, value in self.stats.as_dict().items()
+        )
+        postfix.append(f"<h2>Устойчивость HTTP-слоя</h2><table id=\"http-resilience\">{rows}</table>")
@@ -0,0 +1,163 @@
+"""
+Схемы ответов эндпоинтов и скомпилированные по ним валидаторы
+
+Схема - тип поля (int, str, dict, list), словарь обязательных полей, ListOf или
+OneOf. compile_schema один раз превращает схему в дерево замыканий, поэтому
+проверка каждого ответа не разбирает схему заново и дешева даже под нагрузкой.
+Валидатор возвращает None или текст ошибки с путем до поля, например
+"$[0].statistics.likes: expected integer, got string".
+"""
+from utils.http_client import endpoint_template
+
+STATISTIC_SCHEMA = {
+    "likes": int,
+    "viewCount": int,
+    "contacts": int,
+}
+
+ITEM_RESPONSE_SCHEMA = {
+    "id": str,
+    "sellerId": int,
+    "name": str,
+    "price": int,
+    "statistics": STATISTIC_SCHEMA,
+    "createdAt": str,
+}
+
+ERROR_SCHEMA = {
+    "result": dict,
+    "status": str,
+}
+
+
+class ListOf:
+    """Массив элементов одной схемы не короче min_items"""
+
+    def __init__(self, items, min_items=0):
+        self.items = items
+        self.min_items = min_items
+
+
+class OneOf:
+    """Значение, подходящее хотя бы под одну из схем"""
+
+    def __init__(self, *options):
+        self.options = options
+
+
+# Схемы успешных ответов по шаблону эндпоинта (utils.http_client.endpoint_template)
+RESPONSE_SCHEMAS = {
+    # Создание возвращает объявление или {"status": "Сохранили объявление - <id>"} (BUGS.md, баг 1)
+    "POST /api/1/item": OneOf(ITEM_RESPONSE_SCHEMA, {"status": str}),
+    "GET /api/1/item/{id}": ListOf(ITEM_RESPONSE_SCHEMA, min_items=1),
+    "GET /api/1/statistic/{id}": ListOf(STATISTIC_SCHEMA, min_items=1),
+    "GET /api/1/{sellerID}/item": ListOf(ITEM_RESPONSE_SCHEMA),
+}
+
+_JSON_TYPE_NAMES = {type(None): "null", bool: "boolean", int: "integer", float: "number",
+                    str: "string", list: "array", dict: "object"}
+
+
+def _type_name(value):
+    return _JSON_TYPE_NAMES.get(type(value), type(value).__name__)
+
+
+def _compile_type(expected):
+    name = _JSON_TYPE_NAMES[expected]
+
+    # Точное сравнение типа: bool не должен проходить как int
+    def validate(value):
+        if type(value) is expected:
+            return None
+        return f": expected {name}, got {_type_name(value)}"
+    return validate
+
+
+def _compile_object(schema):
+    fields = tuple((field, _compile(field_schema)) for field, field_schema in schema.items())
+
+    def validate(value):
+        if type(value) is not dict:
+            return f": expected object, got {_type_name(value)}"
+        for field, validate_field in fields:
+            if field not in value:
+                return f".{field}: missing"
+            error = validate_field(value[field])
+            if error is not None:
+                return f".{field}{error}"
+        return None
+    return validate
+
+
+def _compile_list(schema):
+    validate_item = _compile(schema.items)
+    min_items = schema.min_items
+
+    def validate(value):
+        if type(value) is not list:
+            return f": expected array, got {_type_name(value)}"
+        if len(value) < min_items:
+            return f": expected at least {min_items} item(s), got {len(value)}"
+        for index, item in enumerate(value):
+            error = validate_item(item)
+            if error is not None:
+                return f"[{index}]{error}"
+        return None
+    return validate
+
+
+def _compile_one_of(schema):
+    options = tuple(_compile(option) for option in schema.options)
+
+    def validate(value):
+        errors = []
+        for validate_option in options:
+            error = validate_option(value)
+            if error is None:
+                return None
+            errors.append(f"${error}")
+        return f": matches none of {len(options)} schemas ({'; '.join(errors)})"
+    return validate
+
+
+def _compile(schema):
+    if isinstance(schema, ListOf):
+        return _compile_list(schema)
+    if isinstance(schema, OneOf):
+        return _compile_one_of(schema)
+    if isinstance(schema, dict):
+        return _compile_object(schema)
+    if schema in _JSON_TYPE_NAMES:
+        return _compile_type(schema)
+    raise TypeError(f"Unsupported schema {schema!r}")
+
+
+def compile_schema(schema):
+    """Валидатор value -> None или текст ошибки с путем от корня "$" """
+    validate = _compile(schema)
+
+    def validate_root(value):
+        error = validate(value)
+        return None if error is None else f"${error}"
+    return validate_root
+
+
+validate_item = compile_schema(ITEM_RESPONSE_SCHEMA)
+validate_error = compile_schema(ERROR_SCHEMA)
+RESPONSE_VALIDATORS = {endpoint: compile_schema(schema) for endpoint, schema in RESPONSE_SCHEMAS.items()}
+
+
+def validate_response(response):
+    """Проверяет тело ответа requests по схеме его эндпоинта: ответы 200 - по
+    RESPONSE_SCHEMAS, остальные - по схеме ошибки. Возвращает текст ошибки или None"""
+    if response.status_code == 200:
+        validate = RESPONSE_VALIDATORS.get(endpoint_template(response.request.method, response.request.url))
+        if validate is None:
+            return None
+    else:
+        validate = validate_error
+    try:
+        data = response.json()
+    except ValueError:
+        return f"$: response body is not JSON: {response.text[:200]!r}"
+    return validate(data)
@@ -0,0 +1,292 @@
+"""
+Наполнение API синтетическими объявлениями для тестов на больших объемах
+
+Тела запросов в формате sample_item_data генерируются пакетами: продавцы
+выбираются по закону Ципфа (несколько продавцов с огромным числом объявлений и
+длинный хвост маленьких), цена и просмотры - логнормально, лайки и контакты -
+как доли просмотров. С numpy пакет генерируется векторно, без него - тем же
+алгоритмом на random (медленнее, и набор данных другой).
+
+В памяти только текущий пакет. После каждого пакета id созданных объявлений
+дописываются в манифест (gzip, строки "item_id<TAB>seller_id"), а позиция - в
+файл контрольной точки, поэтому прерванное наполнение продолжается с того же
+пакета. Пакет детерминирован (seed, номер пакета), повтор дает те же тела.
+
+Продавцы берутся из диапазона SEED_LOW-SEED_HIGH (utils/sellers.py), который
+SellerIdAllocator тестам не выдает.
+
+Запуск:
+    python -m utils.seeder --items 2000000 --sellers 300000 --zipf 1.1 --concurrency 32
+    python -m utils.seeder --local-api --items 5000 --sellers 500 --manifest /tmp/seed.tsv.gz
+"""
+import bisect
+import gzip
+import itertools
+import json
+import math
+import os
+import random
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    import numpy
+except ImportError:  # векторная генерация недоступна, используется random
+    numpy = None
+
+from utils.http_client import ApiClient
+from utils.items import extract_item_id
+from utils.load import add_rate_limit_arguments, build_parser, rate_limiter_from_args
+from utils.sellers import SEED_HIGH, SEED_LOW
+from utils.stub_server import StubServer
+
+DEFAULT_MANIFEST = "seed/manifest.tsv.gz"
+DEFAULT_BATCH_SIZE = 5000
+DEFAULT_CONCURRENCY = 32
+# Параметры распределений по умолчанию: медианы и sigma логнормальных величин
+DEFAULT_DISTRIBUTIONS = {
+    "zipf": 1.1,
+    "price_median": 5000,
+    "price_sigma": 1.2,
+    "views_median": 150,
+    "views_sigma": 1.5,
+    "like_rate": 0.05,
+    "contact_rate": 0.02,
+}
+
+
+class SeedPlan:
+    """Параметры набора данных; вместе с seed однозначно задают тела всех запросов"""
+
+    def __init__(self, items, sellers, seed=1, batch_size=DEFAULT_BATCH_SIZE, first_seller_id=SEED_LOW,
+                 use_numpy=None, **distributions):
+        unknown = set(distributions) - set(DEFAULT_DISTRIBUTIONS)
+        assert not unknown, f"Unknown distribution parameters: {sorted(unknown)}"
+        assert SEED_LOW <= first_seller_id and first_seller_id + sellers - 1 <= SEED_HIGH, \
+            f"Sellers {first_seller_id}..{first_seller_id + sellers - 1} are outside the seed range {SEED_LOW}..{SEED_HIGH}"
+        self.items = items
+        self.sellers = sellers
+        self.seed = seed
+        self.batch_size = batch_size
+        self.first_seller_id = first_seller_id
+        self.distributions = {**DEFAULT_DISTRIBUTIONS, **distributions}
+        self.use_numpy = numpy is not None if use_numpy is None else use_numpy
+        assert not self.use_numpy or numpy is not None, "numpy is not installed"
+        self._cumulative = None
+
+    @property
+    def generator(self):
+        return "numpy" if self.use_numpy else "python"
+
+    @property
+    def batches(self):
+        return math.ceil(self.items / self.batch_size)
+
+    def as_dict(self):
+        """Параметры для контрольной точки: продолжать можно только с теми же"""
+        return {"items": self.items, "sellers": self.sellers, "seed": self.seed, "batch_size": self.batch_size,
+                "first_seller_id": self.first_seller_id, "generator": self.generator, **self.distributions}
+
+    def cumulative_weights(self):
+        """Накопленные веса Ципфа 1 / rank ** zipf для рангов 1..sellers"""
+        if self._cumulative is None:
+            exponent = self.distributions["zipf"]
+            if self.use_numpy:
+                self._cumulative = numpy.cumsum(numpy.arange(1, self.sellers + 1, dtype=float) ** -exponent)
+            else:
+                self._cumulative = list(itertools.accumulate(rank ** -exponent for rank in range(1, self.sellers + 1)))
+        return self._cumulative
+
+    def batch(self, index):
+        """Тела запросов пакета index; имена seed_{номер объявления}"""
+        start = index * self.batch_size
+        size = min(self.batch_size, self.items - start)
+        columns = self._numpy_columns(index, size) if self.use_numpy else self._python_columns(index, size)
+        return [
+            {
+                "sellerID": self.first_seller_id + rank,
+                "name": f"seed_{start + offset}",
+                "price": price,
+                "statistics": {"likes": likes, "viewCount": views, "contacts": contacts},
+            }
+            for offset, (rank, price, views, likes, contacts) in enumerate(zip(*columns))
+        ]
+
+    def _numpy_columns(self, index, size):
+        params = self.distributions
+        rng = numpy.random.default_rng([self.seed, index])
+        cumulative = self.cumulative_weights()
+        ranks = numpy.searchsorted(cumulative, rng.random(size) * cumulative[-1], side="right")
+        ranks = numpy.minimum(ranks, self.sellers - 1)
+
+        def lognormal(median, sigma):
+            return rng.lognormal(math.log(median), sigma, size)
+
+        # Нулевые значения API считает отсутствующими полями, поэтому минимум 1
+        prices = numpy.maximum(1, numpy.rint(lognormal(params["price_median"], params["price_sigma"])))
+        views = numpy.maximum(1, numpy.rint(lognormal(params["views_median"], params["views_sigma"])))
+        likes = numpy.maximum(1, numpy.rint(views * params["like_rate"] * rng.lognormal(0, 0.5, size)))
+        contacts = numpy.maximum(1, numpy.rint(views * params["contact_rate"] * rng.lognormal(0, 0.5, size)))
+        return [column.astype(numpy.int64).tolist() for column in (ranks, prices, views, likes, contacts)]
+
+    def _python_columns(self, index, size):
+        params = self.distributions
+        rng = random.Random(self.seed * 1_000_003 + index)
+        cumulative = self.cumulative_weights()
+        ranks = [min(bisect.bisect_right(cumulative, rng.random() * cumulative[-1]), self.sellers - 1)
+                 for _ in range(size)]
+
+        def lognormal(median, sigma):
+            return rng.lognormvariate(math.log(median), sigma)
+
+        prices = [max(1, round(lognormal(params["price_median"], params["price_sigma"]))) for _ in range(size)]
+        views = [max(1, round(lognormal(params["views_median"], params["views_sigma"]))) for _ in range(size)]
+        likes = [max(1, round(value * params["like_rate"] * rng.lognormvariate(0, 0.5))) for value in views]
+        contacts = [max(1, round(value * params["contact_rate"] * rng.lognormvariate(0, 0.5))) for value in views]
+        return ranks, prices, views, likes, contacts
+
+
+class SeedCheckpoint:
+    """Позиция наполнения в JSON-файле: следующий пакет, счетчики и размер манифеста"""
+
+    def __init__(self, path, plan):
+        self.path = path
+        self.plan = plan
+        self.next_batch = 0
+        self.created = 0
+        self.failed = 0
+        self.manifest_bytes = 0
+        if os.path.exists(path):
+            with open(path) as source:
+                data = json.load(source)
+            if data["plan"] != plan.as_dict():
+                raise ValueError(f"Checkpoint {path} was written for another plan: {data['plan']}; "
+                                 f"remove it or use the same parameters")
+            self.next_batch = data["next_batch"]
+            self.created = data["created"]
+            self.failed = data["failed"]
+            self.manifest_bytes = data["manifest_bytes"]
+
+    @property
+    def done(self):
+        return self.next_batch >= self.plan.batches
+
+    def save(self):
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        data = {"plan": self.plan.as_dict(), "next_batch": self.next_batch, "created": self.created,
+                "failed": self.failed, "manifest_bytes": self.manifest_bytes}
+        # Запись через временный файл: прерывание не оставит битую контрольную точку
+        with open(f"{self.path}.tmp", "w") as output:
+            json.dump(data, output, indent=1)
+        os.replace(f"{self.path}.tmp", self.path)
+
+
+def _create(client, payload):
+    try:
+        response = client.post("item", json=payload)
+        return extract_item_id(response.json()) if response.status_code == 200 else None
+    except Exception:
+        return None
+
+
+def seed(client, plan, manifest_path=DEFAULT_MANIFEST, checkpoint_path=None, concurrency=DEFAULT_CONCURRENCY,
+         progress=None):
+    """Создает объявления плана, продолжая с контрольной точки; возвращает SeedCheckpoint
+
+    Манифест обрезается до размера из контрольной точки: строки пакета, прерванного
+    до ее записи, не дублируются. Объявления этого пакета остаются на сервере
+    (DELETE в API нет), пакет создается заново.
+    """
+    checkpoint = SeedCheckpoint(checkpoint_path or f"{manifest_path}.checkpoint.json", plan)
+    directory = os.path.dirname(manifest_path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(manifest_path, "ab") as manifest:
+        manifest.truncate(checkpoint.manifest_bytes)
+
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        while not checkpoint.done:
+            payloads = plan.batch(checkpoint.next_batch)
+            ids = list(executor.map(lambda payload: _create(client, payload), payloads))
+            lines = "".join(f"{item_id}\t{payload['sellerID']}\n"
+                            for payload, item_id in zip(payloads, ids) if item_id)
+            # Отдельный gzip-член на пакет: файл читается целиком и обрезается по границе пакета
+            with open(manifest_path, "ab") as manifest:
+                manifest.write(gzip.compress(lines.encode()))
+                checkpoint.manifest_bytes = manifest.tell()
+            created = sum(1 for item_id in ids if item_id)
+            checkpoint.created += created
+            checkpoint.failed += len(ids) - created
+            checkpoint.next_batch += 1
+            checkpoint.save()
+            if progress:
+                progress(checkpoint)
+    return checkpoint
+
+
+def read_manifest(path):
+    """Пары (item_id, seller_id) из манифеста"""
+    with gzip.open(path, "rt") as source:
+        for line in source:
+            item_id, seller_id = line.rstrip("\n").split("\t")
+            yield item_id, int(seller_id)
+
+
+def seller_sizes(path):
+    """Counter {seller_id: число объявлений} по манифесту"""
+    return Counter(seller_id for _, seller_id in read_manifest(path))
+
+
+def main(argv=None):
+    parser = build_parser("Наполнение API синтетическими объявлениями")
+    parser.add_argument("--items", type=int, required=True, help="Сколько объявлений создать")
+    parser.add_argument("--sellers", type=int, required=True, help="Число продавцов в распределении")
+    parser.add_argument("--seed", type=int, default=1, help="Seed генератора (по умолчанию %(default)s)")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE,
+                        help="Объявлений в пакете и между контрольными точками (по умолчанию %(default)s)")
+    parser.add_argument("--first-seller-id", type=int, default=SEED_LOW,
+                        help=f"sellerID продавца с наибольшим числом объявлений, дальше по порядку; "
+                             f"в диапазоне {SEED_LOW}-{SEED_HIGH} (по умолчанию %(default)s)")
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY, help="Число одновременных POST")
+    parser.add_argument("--manifest", default=DEFAULT_MANIFEST, help="Манифест id (по умолчанию %(default)s)")
+    parser.add_argument("--checkpoint", help="Файл контрольной точки (по умолчанию <manifest>.checkpoint.json)")
+    parser.add_argument("--no-numpy", action="store_true", help="Генерировать без numpy, даже если он установлен")
+    for name, default in DEFAULT_DISTRIBUTIONS.items():
+        parser.add_argument(f"--{name.replace('_', '-')}", dest=name, type=float, default=default,
+                            help=f"Параметр распределения (по умолчанию {default})")
+    add_rate_limit_arguments(parser)
+    args = parser.parse_args(argv)
+    limiter = rate_limiter_from_args(args)
+
+    plan = SeedPlan(args.items, args.sellers, args.seed, args.batch_size, args.first_seller_id,
+                    use_numpy=False if args.no_numpy else None,
+                    **{name: getattr(args, name) for name in DEFAULT_DISTRIBUTIONS})
+    started = time.perf_counter()
+
+    def progress(checkpoint):
+        elapsed = time.perf_counter() - started
+        print(f"batch {checkpoint.next_batch}/{plan.batches}: created {checkpoint.created}, "
+              f"failed {checkpoint.failed}, {elapsed:.0f}s", flush=True)
+
+    server = StubServer().start() if args.local_api else None
+    api_url = server.url if server else args.api_url
+    try:
+        with ApiClient(api_url, pool_size=args.concurrency, limiter=limiter) as client:
+            checkpoint = seed(client, plan, args.manifest, args.checkpoint, args.concurrency, progress)
+    finally:
+        if server:
+            server.stop()
+
+    summary = {"created": checkpoint.created, "failed": checkpoint.failed, "manifest": args.manifest,
+               "generator": plan.generator, "elapsed": time.perf_counter() - started}
+    print(json.dumps(summary))
+    if args.json_path:
+        with open(args.json_path, "w") as output:
+            json.dump(summary, output, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""
+Выдача sellerID без пересечений между параллельными воркерами и запусками
+"""
+import os
+import random
+import threading
+from pathlib import Path
+
+try:
+    import fcntl
+except ImportError:  # Windows: блокировка файла состояния недоступна
+    fcntl = None
+
+SELLER_ID_MIN = 111111
+SELLER_ID_MAX = 999999
+# Продавцы наполнения (utils/seeder.py) с миллионами объявлений; тестам и нагрузочным
+# прогонам не выдаются, чтобы их списки не смешивались с синтетическими объявлениями
+SEED_LOW = 600000
+SEED_HIGH = SELLER_ID_MAX - 1
+# Граничные значения используются тестами TC-6.1 и TC-6.2, поэтому не выдаются
+DEFAULT_LOW = SELLER_ID_MIN + 1
+DEFAULT_HIGH = SEED_LOW - 1
+DEFAULT_BLOCK_SIZE = 64
+
+
+def xdist_worker():
+    """Номер и число воркеров pytest-xdist (0, 1 при запуске без xdist)"""
+    worker = os.environ.get("PYTEST_XDIST_WORKER", "gw0")
+    worker_count = int(os.environ.get("PYTEST_XDIST_WORKER_COUNT", "1"))
+    return int(worker.lstrip("gw") or 0), worker_count
+
+
+class SellerIdAllocator:
+    """Последовательная выдача sellerID из непересекающегося диапазона воркера
+
+    Диапазон [low, high] делится поровну между worker_count воркерами.
+    Выдача начинается со случайной позиции внутри диапазона; если задан state_file,
+    позиция сохраняется между запусками (файл на воркер) и дальше продолжается с нее.
+    """
+
+    def __init__(self, worker_index=0, worker_count=1, state_file=None,
+                 low=DEFAULT_LOW, high=DEFAULT_HIGH, block_size=DEFAULT_BLOCK_SIZE):
+        assert 0 <= worker_index < worker_count, f"Invalid worker index {worker_index} of {worker_count}"
+        span = (high - low + 1) // worker_count
+        assert span > 0, f"Range {low}-{high} is too small for {worker_count} workers"
+        self.low = low + worker_index * span
+        self.high = self.low + span - 1
+        self.block_size = block_size
+        self.state_file = None
+        if state_file is not None:
+            self.state_file = Path(f"{state_file}.{worker_index}")
+            self.state_file.parent.mkdir(parents=True, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._block = iter(())
+        self._next = random.randint(self.low, self.high)
+
+    @classmethod
+    def for_xdist_worker(cls, state_file=None, **kwargs):
+        """Аллокатор для текущего воркера pytest-xdist"""
+        worker_index, worker_count = xdist_worker()
+        return cls(worker_index, worker_count, state_file=state_file, **kwargs)
+
+    def _wrap(self, value):
+        return value if self.low <= value <= self.high else self.low
+
+    def _reserve_block(self):
+        """Резервирует следующий блок id, при необходимости под блокировкой файла состояния"""
+        if self.state_file is None:
+            start = self._wrap(self._next)
+            end = min(start + self.block_size, self.high + 1)
+            self._next = end
+            return range(start, end)
+
+        with open(self.state_file, "a+") as state:
+            if fcntl is not None:
+                fcntl.flock(state, fcntl.LOCK_EX)
+            state.seek(0)
+            raw = state.read().strip()
+            # Без сохраненной позиции (новый checkout, CI) - случайный старт, как без файла,
+            # иначе параллельные запуски с чистым .pytest_cache получат одни и те же id
+            start = self._wrap(int(raw) if raw.isdigit() else self._next)
+            end = min(start + self.block_size, self.high + 1)
+            state.seek(0)
+            state.truncate()
+            state.write(str(end))
+        return range(start, end)
+
+    def allocate(self):
+        """Следующий свободный sellerID"""
+        with self._lock:
+            seller_id = next(self._block, None)
+            if seller_id is None:
+                self._block = iter(self._reserve_block())
+                seller_id = next(self._block)
+            return seller_id
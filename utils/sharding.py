@@ -0,0 +1,147 @@
+"""
+Длительности тестов между запусками и разбиение набора на шарды
+
+Плагин запоминает длительность каждого теста (setup + call + teardown) и при
+следующем запуске распределяет тесты по --num-shards шардам жадным алгоритмом
+LPT: тесты по убыванию длительности, каждый - в наименее загруженный шард.
+При шардировании и под pytest-xdist тесты выполняются начиная с самых долгих
+модулей, чтобы воркеры не простаивали в конце прогона.
+
+    pytest --num-shards 3 --shard-id 0 --durations-file durations.json --html=reports/shard-0.html
+
+Шард не меняет входной файл длительностей, а пишет замеры в durations.shard-0.json;
+после прогона их объединяет utils.merge_reports.
+"""
+import heapq
+import json
+import os
+import statistics
+from collections import defaultdict
+
+import pytest
+
+DURATIONS_CACHE_KEY = "sharding/durations"
+# Оценка длительности теста, для которого еще нет замеров
+DEFAULT_DURATION = 1.0
+
+
+def module_of(nodeid):
+    return nodeid.split("::", 1)[0]
+
+
+def load_durations(path):
+    if not path or not os.path.exists(path):
+        return {}
+    with open(path) as source:
+        return json.load(source)
+
+
+def save_durations(path, durations):
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, "w") as output:
+        json.dump(dict(sorted(durations.items())), output, indent=1)
+
+
+class DurationEstimator:
+    """Длительность теста по прошлым замерам; для новых тестов - медиана их модуля или всего набора"""
+
+    def __init__(self, durations):
+        self.durations = durations
+        by_module = defaultdict(list)
+        for nodeid, duration in durations.items():
+            by_module[module_of(nodeid)].append(duration)
+        self.module_medians = {module: statistics.median(values) for module, values in by_module.items()}
+        self.default = statistics.median(durations.values()) if durations else DEFAULT_DURATION
+
+    def __call__(self, nodeid):
+        duration = self.durations.get(nodeid)
+        if duration is None:
+            duration = self.module_medians.get(module_of(nodeid), self.default)
+        return duration
+
+
+def assign_shards(nodeids, estimate, num_shards):
+    """{nodeid: номер шарда} по алгоритму LPT; результат детерминирован"""
+    loads = [(0.0, shard) for shard in range(num_shards)]
+    assignment = {}
+    for nodeid in sorted(nodeids, key=lambda nodeid: (-estimate(nodeid), nodeid)):
+        load, shard = heapq.heappop(loads)
+        assignment[nodeid] = shard
+        heapq.heappush(loads, (load + estimate(nodeid), shard))
+    return assignment
+
+
+def order_longest_first(items, estimate):
+    """Модули по убыванию суммарной длительности, внутри модуля - тесты по убыванию.
+    Тесты одного модуля остаются рядом, чтобы module-фикстуры не пересоздавались."""
+    modules = defaultdict(list)
+    for item in items:
+        modules[module_of(item.nodeid)].append(item)
+    totals = {module: sum(estimate(item.nodeid) for item in module_items) for module, module_items in modules.items()}
+    ordered = []
+    for module in sorted(modules, key=lambda module: (-totals[module], module)):
+        ordered.extend(sorted(modules[module], key=lambda item: -estimate(item.nodeid)))
+    return ordered
+
+
+def _uses_xdist(config):
+    return bool(getattr(config.option, "numprocesses", None)) or hasattr(config, "workerinput")
+
+
+class ShardingPlugin:
+    """Выбор тестов шарда, порядок по длительности и запись длительностей"""
+
+    def __init__(self, config):
+        self.config = config
+        self.num_shards = config.getoption("--num-shards")
+        self.shard_id = config.getoption("--shard-id")
+        if self.num_shards < 1 or not 0 <= self.shard_id < self.num_shards:
+            raise pytest.UsageError(
+                f"--shard-id should be in [0, {self.num_shards}) and --num-shards at least 1, "
+                f"got {self.shard_id} and {self.num_shards}"
+            )
+        self.path = config.getoption("--durations-file")
+        self.durations = self._load()
+        self.observed = defaultdict(float)
+
+    def _load(self):
+        if self.path:
+            return load_durations(self.path)
+        cache = getattr(self.config, "cache", None)
+        return cache.get(DURATIONS_CACHE_KEY, {}) if cache is not None else {}
+
+    def _save(self, durations):
+        # Все шарды должны читать одни и те же длительности, иначе разбиение разойдется,
+        # поэтому шард пишет свои замеры в отдельный файл для utils.merge_reports
+        if self.num_shards > 1:
+            if self.path:
+                root, ext = os.path.splitext(self.path)
+                save_durations(f"{root}.shard-{self.shard_id}{ext}", durations)
+        elif self.path:
+            save_durations(self.path, durations)
+        elif getattr(self.config, "cache", None) is not None:
+            self.config.cache.set(DURATIONS_CACHE_KEY, durations)
+
+    # tryfirst: остальные хуки (размер пула объявлений) видят уже отобранные тесты
+    @pytest.hookimpl(tryfirst=True)
+    def pytest_collection_modifyitems(self, config, items):
+        estimate = DurationEstimator(self.durations)
+        if self.num_shards > 1:
+            assignment = assign_shards([item.nodeid for item in items], estimate, self.num_shards)
+            selected = [item for item in items if assignment[item.nodeid] == self.shard_id]
+            deselected = [item for item in items if assignment[item.nodeid] != self.shard_id]
+            if deselected:
+                config.hook.pytest_deselected(items=deselected)
+            items[:] = selected
+        if self.num_shards > 1 or _uses_xdist(config):
+            items[:] = order_longest_first(items, estimate)
+
+    def pytest_runtest_logreport(self, report):
+        self.observed[report.nodeid] += report.duration
+
+    def pytest_sessionfinish(self, session):
+        # Под xdist пишет только контроллер, который видит отчеты всех воркеров
+        if self.observed and not hasattr(self.config, "workerinput"):
+            self._save({**self.durations, **self.observed})
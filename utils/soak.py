@@ -0,0 +1,143 @@
+"""
+Длительный (soak) прогон API объявлений с потоковой статистикой задержек
+
+Задержки копятся в LatencyHistogram с фиксированной памятью, поэтому прогон
+может идти часами. Каждые --snapshot-interval секунд в JSONL-файл дописывается
+снимок: сводка за интервал (по ней видны дрейф задержек и рост ошибок) и
+нарастающий итог с начала прогона.
+
+Запуск:
+    python -m utils.soak --duration 28800 --snapshot-interval 60 --snapshots soak.jsonl
+    python -m utils.soak --local-api --duration 10 --snapshot-interval 1
+"""
+import asyncio
+import json
+import time
+
+from utils.histogram import LatencyHistogram
+from utils.http_client import ApiClient
+from utils.load import (
+    DEFAULT_MIX,
+    add_rate_limit_arguments,
+    build_parser,
+    parse_mix,
+    rate_limiter_from_args,
+    run_load,
+)
+from utils.stats import format_table
+from utils.stub_server import StubServer
+
+DEFAULT_SNAPSHOT_INTERVAL = 60.0
+DEFAULT_SNAPSHOTS = "soak.jsonl"
+
+
+class SoakStats:
+    """Гистограммы одного эндпоинта: за текущий интервал и с начала прогона"""
+
+    def __init__(self):
+        self.interval = LatencyHistogram()
+        self.total = LatencyHistogram()
+
+    def add(self, latency, ok=True):
+        self.interval.add(latency, ok)
+        self.total.add(latency, ok)
+
+    def summary(self, elapsed=None):
+        return self.total.summary(elapsed)
+
+
+def error_rate(summary):
+    return summary["errors"] / summary["requests"] if summary["requests"] else 0.0
+
+
+class SnapshotWriter:
+    """Дописывает снимки статистики в JSONL-файл и обнуляет интервальные гистограммы"""
+
+    def __init__(self, path, stats):
+        self.path = path
+        self.stats = stats
+        self.started = time.time()
+        self.interval_started = time.perf_counter()
+        self.run_started = self.interval_started
+        self.snapshots = 0
+
+    def snapshot(self):
+        now = time.perf_counter()
+        interval, elapsed = now - self.interval_started, now - self.run_started
+        endpoints = {}
+        for endpoint, stats in self.stats.items():
+            interval_summary = stats.interval.summary(interval)
+            interval_summary["error_rate"] = error_rate(interval_summary)
+            total_summary = stats.total.summary(elapsed)
+            total_summary["error_rate"] = error_rate(total_summary)
+            endpoints[endpoint] = {
+                "interval": interval_summary,
+                "total": total_summary,
+                # Разреженная гистограмма интервала для последующего переагрегирования
+                "histogram": stats.interval.to_dict(),
+            }
+            stats.interval.reset()
+        record = {"timestamp": self.started + elapsed, "elapsed": elapsed, "interval": interval, "endpoints": endpoints}
+        with open(self.path, "a") as output:
+            output.write(json.dumps(record) + "\n")
+        self.interval_started = now
+        self.snapshots += 1
+        return record
+
+    async def run(self, every):
+        """Пишет снимок каждые every секунд до отмены задачи"""
+        while True:
+            await asyncio.sleep(max(0.0, self.interval_started + every - time.perf_counter()))
+            self.snapshot()
+
+
+async def run_soak(client, snapshots_path, mix=None, concurrency=16, duration=None, total_requests=None,
+                   snapshot_interval=DEFAULT_SNAPSHOT_INTERVAL, seller_ids=None):
+    """Нагрузочный прогон с периодическими снимками; возвращает (LoadResult, SnapshotWriter)"""
+    mix = mix or DEFAULT_MIX
+    stats = {endpoint: SoakStats() for endpoint in mix}
+    writer = SnapshotWriter(snapshots_path, stats)
+    snapshots = asyncio.create_task(writer.run(snapshot_interval))
+    try:
+        result = await run_load(client, mix, concurrency, duration, total_requests,
+                                seller_ids=seller_ids, stats=stats)
+    finally:
+        snapshots.cancel()
+    # Последний, возможно неполный, интервал
+    writer.snapshot()
+    return result, writer
+
+
+def main(argv=None):
+    parser = build_parser("Длительный прогон API объявлений с периодическими снимками статистики")
+    parser.add_argument("--mix", type=parse_mix, default=DEFAULT_MIX,
+                        help="Веса эндпоинтов, например create=1,get_item=4,seller_items=2,statistic=2")
+    parser.add_argument("--concurrency", type=int, default=16, help="Число одновременных запросов")
+    parser.add_argument("--duration", type=float, required=True, help="Длительность прогона в секундах")
+    parser.add_argument("--snapshot-interval", type=float, default=DEFAULT_SNAPSHOT_INTERVAL,
+                        help="Период записи снимков в секундах")
+    parser.add_argument("--snapshots", default=DEFAULT_SNAPSHOTS, help="JSONL-файл для снимков")
+    add_rate_limit_arguments(parser)
+    args = parser.parse_args(argv)
+    limiter = rate_limiter_from_args(args)
+
+    server = StubServer().start() if args.local_api else None
+    api_url = server.url if server else args.api_url
+    try:
+        with ApiClient(api_url, pool_size=args.concurrency, limiter=limiter) as client:
+            result, writer = asyncio.run(run_soak(client, args.snapshots, args.mix, args.concurrency,
+                                                  args.duration, snapshot_interval=args.snapshot_interval))
+    finally:
+        if server:
+            server.stop()
+
+    summaries = result.summaries()
+    print(format_table(summaries))
+    print(f"elapsed: {result.elapsed:.2f}s, snapshots: {writer.snapshots} -> {args.snapshots}")
+    if args.json_path:
+        with open(args.json_path, "w") as output:
+            json.dump({"elapsed": result.elapsed, "endpoints": summaries}, output, indent=2)
+
+
+if __name__ == "__main__":
+    main()
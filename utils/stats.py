@@ -0,0 +1,62 @@
+"""
+Агрегация задержек запросов по эндпоинтам
+"""
+import math
+
+PERCENTILES = (50, 95, 99)
+
+
+def percentile(sorted_values, percent):
+    """Перцентиль по методу ближайшего ранга для отсортированного списка"""
+    if not sorted_values:
+        return None
+    rank = max(math.ceil(percent / 100 * len(sorted_values)), 1)
+    return sorted_values[rank - 1]
+
+
+class LatencyStats:
+    """Задержки (в секундах) и число ошибок одного эндпоинта"""
+
+    def __init__(self):
+        self.latencies = []
+        self.errors = 0
+
+    @property
+    def count(self):
+        return len(self.latencies)
+
+    def add(self, latency, ok=True):
+        self.latencies.append(latency)
+        if not ok:
+            self.errors += 1
+
+    def summary(self, elapsed=None):
+        """Сводка: число запросов, ошибки, пропускная способность и перцентили в мс"""
+        values = sorted(self.latencies)
+        result = {"requests": self.count, "errors": self.errors}
+        if elapsed:
+            result["rps"] = self.count / elapsed
+        for percent in PERCENTILES:
+            value = percentile(values, percent)
+            result[f"p{percent}"] = value * 1000 if value is not None else None
+        return result
+
+
+def format_table(summaries):
+    """Текстовая таблица сводок {endpoint: summary}"""
+    columns = ["requests", "errors", "rps"] + [f"p{percent}" for percent in PERCENTILES]
+    width = max([16] + [len(endpoint) + 2 for endpoint in summaries])
+    header = f"{'endpoint':<{width}}" + "".join(f"{column:>10}" for column in columns)
+    lines = [header, "-" * len(header)]
+    for endpoint, summary in summaries.items():
+        cells = []
+        for column in columns:
+            value = summary.get(column)
+            if value is None:
+                cells.append(f"{'-':>10}")
+            elif isinstance(value, float):
+                cells.append(f"{value:>10.1f}")
+            else:
+                cells.append(f"{value:>10}")
+        lines.append(f"{endpoint:<{width}}" + "".join(cells))
+    return "\n".join(lines)
@@ -0,0 +1,138 @@
+"""
+Потоковый разбор и проверка больших списков объявлений продавца
+
+Ответ GET /api/1/{sellerID}/item читается из сокета кусками, элементы массива
+разбираются по мере поступления и сразу проверяются. В памяти остаются только
+текущий кусок, счетчики и несколько примеров ошибок, поэтому размер списка
+ограничен лишь временем прогона.
+"""
+import codecs
+import json
+
+from utils.schemas import validate_item
+
+DEFAULT_CHUNK_SIZE = 64 * 1024
+DEFAULT_FAILURE_SAMPLE = 5
+# Разобранная часть буфера отбрасывается, когда становится больше этого размера
+_COMPACT_THRESHOLD = 64 * 1024
+_WHITESPACE = " \t\n\r"
+_DELIMITERS = _WHITESPACE + ",]"
+
+
+def iter_json_array(chunks, encoding="utf-8"):
+    """Генератор элементов JSON-массива верхнего уровня из последовательности
+    кусков (bytes или str); ValueError, если тело не массив или оборвано"""
+    decoder = json.JSONDecoder()
+    text_decoder = codecs.getincrementaldecoder(encoding)()
+    chunks = iter(chunks)
+    buffer, position, exhausted = "", 0, False
+    state = "start"
+
+    def read_more():
+        nonlocal buffer, position, exhausted
+        for chunk in chunks:
+            text = text_decoder.decode(chunk) if isinstance(chunk, bytes) else chunk
+            if text:
+                buffer = buffer[position:] + text
+                position = 0
+                return True
+        exhausted = True
+        buffer = buffer[position:] + text_decoder.decode(b"", final=True)
+        position = 0
+        return False
+
+    while True:
+        while position < len(buffer) and buffer[position] in _WHITESPACE:
+            position += 1
+        if position >= len(buffer):
+            if exhausted:
+                raise ValueError(f"Unexpected end of JSON array (state: {state})")
+            read_more()
+            continue
+
+        char = buffer[position]
+        if state == "start":
+            if char != "[":
+                raise ValueError(f"Expected JSON array, got '{char}'")
+            position += 1
+            state = "first"
+        elif char == "]":
+            if state == "value":
+                raise ValueError("Trailing comma in JSON array")
+            return
+        elif state == "separator":
+            if char != ",":
+                raise ValueError(f"Expected ',' or ']' in JSON array, got '{char}'")
+            position += 1
+            state = "value"
+        else:
+            try:
+                value, end = decoder.raw_decode(buffer, position)
+            except json.JSONDecodeError:
+                if exhausted:
+                    raise
+                read_more()
+                continue
+            # Число на границе куска могло быть разобрано не полностью ("-0" из "-0.5")
+            if not exhausted and (end == len(buffer) or buffer[end] not in _DELIMITERS):
+                read_more()
+                continue
+            position = end
+            state = "separator"
+            if position > _COMPACT_THRESHOLD:
+                buffer, position = buffer[position:], 0
+            yield value
+
+
+def check_listing_item(item, seller_id=None):
+    """Текст ошибки элемента списка объявлений продавца или None"""
+    error = validate_item(item)
+    if error is not None:
+        return error
+    if seller_id is not None and item["sellerId"] != seller_id:
+        return f"sellerId {item['sellerId']!r} != {seller_id}"
+    return None
+
+
+class ListingCheck:
+    """Счетчики проверки элементов и первые sample_size ошибок"""
+
+    def __init__(self, sample_size=DEFAULT_FAILURE_SAMPLE):
+        self.sample_size = sample_size
+        self.count = 0
+        self.failures = 0
+        self.samples = []
+
+    def feed(self, item, error):
+        self.count += 1
+        if error is not None:
+            self.failures += 1
+            if len(self.samples) < self.sample_size:
+                self.samples.append({"index": self.count - 1, "error": error, "item": item})
+
+    def describe(self):
+        lines = [f"{self.failures} of {self.count} items failed validation"]
+        lines.extend(f"  [{sample['index']}] {sample['error']}: {sample['item']!r}" for sample in self.samples)
+        return "\n".join(lines)
+
+
+def stream_listing(client, seller_id, validate=check_listing_item, chunk_size=DEFAULT_CHUNK_SIZE,
+                   sample_size=DEFAULT_FAILURE_SAMPLE):
+    """Запрашивает список объявлений продавца и проверяет элементы по мере чтения
+
+    Возвращает (response, ListingCheck); тело ответа после этого уже прочитано.
+    Если статус не 200, тело читается целиком для сообщений об ошибке, а check равен None.
+    Замер вызова передается слушателям клиента после чтения тела, вместе с его передачей.
+    """
+    response = client.get(f"{seller_id}/item", stream=True)
+    try:
+        if response.status_code != 200:
+            response.content
+            return response, None
+        check = ListingCheck(sample_size)
+        for item in iter_json_array(response.iter_content(chunk_size), response.encoding or "utf-8"):
+            check.feed(item, validate(item, seller_id))
+        return response, check
+    finally:
+        response.close()
+        client.finish_stream(response)
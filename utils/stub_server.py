@@ -0,0 +1,253 @@
+"""
+Локальная заглушка API объявлений для запуска тестов без сети
+
+Воспроизводит формат ответов https://qa-internship.avito.com и поведение,
+описанное в BUGS.md. Набор воспроизводимых багов задается параметром `bugs`.
+"""
+import json
+import re
+import threading
+import uuid
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Номера багов из BUGS.md, поведение которых умеет воспроизводить заглушка
+BUG_CREATE_RETURNS_STATUS = 1
+BUG_ITEM_NOT_FOUND_IS_400 = 2
+BUG_STATISTIC_NOT_FOUND_IS_400 = 3
+BUG_EMPTY_NAME_ACCEPTED = 4
+BUG_NEGATIVE_STATISTICS_ACCEPTED = 5
+BUG_NEGATIVE_PRICE_ACCEPTED = 6
+BUG_ZERO_PRICE_ACCEPTED = 8
+BUG_STATISTIC_NULL = 9
+
+ALL_BUGS = frozenset({
+    BUG_CREATE_RETURNS_STATUS,
+    BUG_ITEM_NOT_FOUND_IS_400,
+    BUG_STATISTIC_NOT_FOUND_IS_400,
+    BUG_EMPTY_NAME_ACCEPTED,
+    BUG_NEGATIVE_STATISTICS_ACCEPTED,
+    BUG_NEGATIVE_PRICE_ACCEPTED,
+    BUG_ZERO_PRICE_ACCEPTED,
+    BUG_STATISTIC_NULL,
+})
+
+STATISTIC_FIELDS = ("likes", "viewCount", "contacts")
+INVALID_ID_MESSAGE = "передан некорректный идентификатор объявления"
+
+_UUID_RE = re.compile(r"^[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}$")
+_ROUTES = (
+    ("POST", re.compile(r"^/api/1/item$"), "create_item"),
+    ("GET", re.compile(r"^/api/1/item/(?P<item_id>[^/]*)$"), "get_item"),
+    ("GET", re.compile(r"^/api/1/statistic/(?P<item_id>[^/]*)$"), "get_statistic"),
+    ("GET", re.compile(r"^/api/1/(?P<seller_id>[^/]+)/item$"), "get_seller_items"),
+)
+
+
+def _error(status_code, message):
+    """Тело ошибки в формате API: {"result": {...}, "status": "400"}"""
+    return status_code, {"result": {"message": message, "messages": {}}, "status": str(status_code)}
+
+
+def _is_int(value):
+    return isinstance(value, int) and not isinstance(value, bool)
+
+
+# Нулевые значения полей тела POST /api/1/item
+_ZERO_VALUES = {"sellerID": 0, "name": "", "price": 0}
+
+
+def _null_as_zero(body):
+    """Как в API: null в поле тела разбирается в нулевое значение его типа"""
+    if not isinstance(body, dict):
+        return body
+    body = {field: _ZERO_VALUES.get(field) if value is None else value for field, value in body.items()}
+    if "statistics" in body and body["statistics"] is None:
+        body["statistics"] = dict.fromkeys(STATISTIC_FIELDS, 0)
+    elif isinstance(body.get("statistics"), dict):
+        body["statistics"] = {field: 0 if value is None else value for field, value in body["statistics"].items()}
+    return body
+
+
+class StubApi:
+    """In-memory реализация четырех эндпоинтов API объявлений"""
+
+    def __init__(self, bugs=ALL_BUGS):
+        self.bugs = frozenset(bugs)
+        self.items = {}
+        self._lock = threading.Lock()
+
+    def handle(self, method, path, body=None):
+        """Обрабатывает запрос и возвращает пару (status_code, payload)"""
+        path = path.split("?", 1)[0]
+        for route_method, pattern, handler_name in _ROUTES:
+            match = pattern.match(path)
+            if match and route_method == method:
+                handler = getattr(self, handler_name)
+                if method == "POST":
+                    return handler(body, **match.groupdict())
+                return handler(**match.groupdict())
+        return _error(404, "not found")
+
+    def _validate(self, data):
+        """Возвращает текст ошибки валидации или None"""
+        if not isinstance(data, dict):
+            return "некорректное тело запроса"
+        for field in ("sellerID", "name", "price", "statistics"):
+            if field not in data:
+                return f"поле {field} обязательно"
+        if not _is_int(data["sellerID"]):
+            return "поле sellerID должно быть числом"
+        if not isinstance(data["name"], str):
+            return "поле name должно быть строкой"
+        if not _is_int(data["price"]):
+            return "поле price должно быть числом"
+        statistics = data["statistics"]
+        if not isinstance(statistics, dict):
+            return "поле statistics должно быть объектом"
+        for field in STATISTIC_FIELDS:
+            if field not in statistics:
+                return f"поле statistics.{field} обязательно"
+            if not _is_int(statistics[field]):
+                return f"поле statistics.{field} должно быть числом"
+
+        if data["name"] == "" and BUG_EMPTY_NAME_ACCEPTED not in self.bugs:
+            return "поле name не может быть пустым"
+        if data["price"] < 0 and BUG_NEGATIVE_PRICE_ACCEPTED not in self.bugs:
+            return "поле price не может быть отрицательным"
+        if data["price"] == 0 and BUG_ZERO_PRICE_ACCEPTED not in self.bugs:
+            return "поле price должно быть больше нуля"
+        if (any(statistics[field] < 0 for field in STATISTIC_FIELDS)
+                and BUG_NEGATIVE_STATISTICS_ACCEPTED not in self.bugs):
+            return "поля statistics не могут быть отрицательными"
+        return None
+
+    def create_item(self, body):
+        body = _null_as_zero(body)
+        error = self._validate(body)
+        if error:
+            return _error(400, error)
+
+        item = {
+            "id": str(uuid.uuid4()),
+            "sellerId": body["sellerID"],
+            "name": body["name"],
+            "price": body["price"],
+            "statistics": {field: body["statistics"][field] for field in STATISTIC_FIELDS},
+            "createdAt": datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S.%f +0000 +0000"),
+        }
+        with self._lock:
+            self.items[item["id"]] = item
+
+        if BUG_CREATE_RETURNS_STATUS in self.bugs:
+            return 200, {"status": f"Сохранили объявление - {item['id']}"}
+        return 200, item
+
+    def _find(self, item_id, not_found_bug):
+        """Возвращает (item, None) или (None, ответ с ошибкой)"""
+        if not _UUID_RE.match(item_id):
+            status_code = 400 if not_found_bug in self.bugs else 404
+            return None, _error(status_code, INVALID_ID_MESSAGE)
+        item = self.items.get(item_id)
+        if item is None:
+            return None, _error(404, f"item {item_id} not found")
+        return item, None
+
+    def get_item(self, item_id):
+        item, error = self._find(item_id, BUG_ITEM_NOT_FOUND_IS_400)
+        if error:
+            return error
+        return 200, [item]
+
+    def get_statistic(self, item_id):
+        item, error = self._find(item_id, BUG_STATISTIC_NOT_FOUND_IS_400)
+        if error:
+            return error
+        statistics = item["statistics"]
+        if BUG_STATISTIC_NULL in self.bugs and not any(statistics.values()):
+            return 200, [None]
+        return 200, [statistics]
+
+    def get_seller_items(self, seller_id):
+        try:
+            seller_id = int(seller_id)
+        except ValueError:
+            return _error(400, "передан некорректный идентификатор продавца")
+        with self._lock:
+            items = [item for item in self.items.values() if item["sellerId"] == seller_id]
+        return 200, items
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Заголовки и тело пишутся отдельно, без этого keep-alive упирается в Nagle
+    disable_nagle_algorithm = True
+
+    def _dispatch(self, method):
+        body = None
+        length = int(self.headers.get("Content-Length") or 0)
+        if length:
+            raw = self.rfile.read(length)
+            try:
+                body = json.loads(raw)
+            except ValueError:
+                status_code, payload = _error(400, "некорректный JSON")
+                return self._send(status_code, payload)
+        status_code, payload = self.server.api.handle(method, self.path, body)
+        self._send(status_code, payload)
+
+    def _send(self, status_code, payload):
+        data = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        self.send_response(status_code)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        self._dispatch("GET")
+
+    def do_POST(self):
+        self._dispatch("POST")
+
+    def log_message(self, format, *args):
+        pass
+
+
+class _StubHTTPServer(ThreadingHTTPServer):
+    # Очередь соединений по умолчанию (5) переполняется сотнями одновременных
+    # подключений, и лишние сбрасываются ядром
+    request_queue_size = 256
+    daemon_threads = True
+
+
+class StubServer:
+    """HTTP-сервер заглушки в фоновом потоке на 127.0.0.1"""
+
+    def __init__(self, api=None, host="127.0.0.1", port=0):
+        self.api = api or StubApi()
+        self._httpd = _StubHTTPServer((host, port), _Handler)
+        self._httpd.api = self.api
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        if self._thread:
+            self._thread.join()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
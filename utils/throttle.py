@@ -0,0 +1,180 @@
+"""
+Клиентское ограничение нагрузки: token bucket и адаптивная (AIMD) конкурентность
+
+Token bucket ограничивает частоту запросов, а AIMD подбирает число одновременных
+запросов: лимит растет на increase за "окно" успешных ответов (+increase / limit
+на каждый ответ) и умножается на decrease при 429/503, сетевой ошибке или
+всплеске задержки выше latency_factor * EWMA задержки эндпоинта. Ответы на
+запросы, начатые до снижения, лимит повторно не снижают.
+"""
+import threading
+import time
+
+THROTTLE_STATUS_CODES = frozenset({429, 503})
+
+
+def _retry_after(response):
+    """Секунды из заголовка Retry-After (HTTP-дата не поддерживается)"""
+    try:
+        return max(float(response.headers.get("Retry-After", "")), 0.0)
+    except ValueError:
+        return None
+
+
+class TokenBucket:
+    """rate токенов в секунду, не больше burst накопленных; acquire ждет токен"""
+
+    def __init__(self, rate, burst=None, clock=time.monotonic, sleep=time.sleep):
+        assert rate > 0, "Rate must be positive"
+        self.rate = rate
+        self.capacity = burst or max(1.0, rate)
+        self.tokens = self.capacity
+        self.paused_until = 0.0
+        self._clock = clock
+        self._sleep = sleep
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def _refill(self, now):
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self):
+        """Забирает токен (в долг, если их нет) и ждет его; возвращает время ожидания"""
+        with self._lock:
+            now = self._clock()
+            self._refill(now)
+            self.tokens -= 1
+            wait = max(-self.tokens / self.rate, self.paused_until - now, 0.0)
+        if wait > 0:
+            self._sleep(wait)
+        return wait
+
+    def pause(self, seconds):
+        """Не выдавать токены seconds секунд (Retry-After) и сбросить накопленные"""
+        with self._lock:
+            now = self._clock()
+            self._refill(now)
+            self.paused_until = max(self.paused_until, now + seconds)
+            self.tokens = min(self.tokens, 0.0)
+
+
+class AimdConcurrency:
+    """Лимит одновременных запросов с аддитивным ростом и мультипликативным снижением"""
+
+    def __init__(self, initial=4, min_limit=1, max_limit=64, increase=1.0, decrease=0.5,
+                 latency_factor=3.0, warmup=20, smoothing=0.1, throttle_status_codes=THROTTLE_STATUS_CODES):
+        self.limit = float(min(max(initial, min_limit), max_limit))
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.increase = increase
+        self.decrease = decrease
+        self.latency_factor = latency_factor
+        self.warmup = warmup
+        self.smoothing = smoothing
+        self.throttle_status_codes = throttle_status_codes
+        self.in_flight = 0
+        self.peak_limit = self.limit
+        self.decreases = 0
+        # {эндпоинт: [EWMA задержки, число учтенных ответов]}
+        self._latency = {}
+        self._started = 0
+        self._decreased_at = 0
+        self._condition = threading.Condition()
+
+    def acquire(self):
+        """Ждет свободного места под лимитом; возвращает номер запроса для release"""
+        with self._condition:
+            while self.in_flight >= int(self.limit):
+                self._condition.wait()
+            self.in_flight += 1
+            self._started += 1
+            return self._started
+
+    def is_latency_spike(self, endpoint, latency):
+        mean, samples = self._latency.get(endpoint, (None, 0))
+        return samples >= self.warmup and latency > self.latency_factor * mean
+
+    def _observe_latency(self, endpoint, latency):
+        mean, samples = self._latency.get(endpoint, (latency, 0))
+        self._latency[endpoint] = [mean + self.smoothing * (latency - mean), samples + 1]
+
+    def release(self, ticket, endpoint, status_code, latency):
+        """Освобождает место и пересчитывает лимит по результату запроса;
+        возвращает True, если лимит был снижен"""
+        with self._condition:
+            self.in_flight -= 1
+            overloaded = status_code is None or status_code in self.throttle_status_codes \
+                or self.is_latency_spike(endpoint, latency)
+            decreased = False
+            if not overloaded:
+                self._observe_latency(endpoint, latency)
+                self.limit = min(self.max_limit, self.limit + self.increase / self.limit)
+                self.peak_limit = max(self.peak_limit, self.limit)
+            elif ticket > self._decreased_at:
+                self.limit = max(self.min_limit, self.limit * self.decrease)
+                self._decreased_at = self._started
+                self.decreases += 1
+                decreased = True
+            self._condition.notify_all()
+            return decreased
+
+
+class RateLimiter:
+    """Общий для всех ApiClient ограничитель: token bucket и/или AIMD-конкурентность"""
+
+    def __init__(self, bucket=None, concurrency=None):
+        self.bucket = bucket
+        self.concurrency = concurrency
+        self.requests = 0
+        self.throttled = 0
+        self.waited = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Вызывается перед отправкой запроса; возвращает номер запроса для release"""
+        ticket = self.concurrency.acquire() if self.concurrency else None
+        waited = self.bucket.acquire() if self.bucket else 0.0
+        with self._lock:
+            self.requests += 1
+            self.waited += waited
+        return ticket
+
+    def release(self, ticket, endpoint, response, latency):
+        """Вызывается после ответа (response=None при исключении)"""
+        status_code = response.status_code if response is not None else None
+        if status_code in THROTTLE_STATUS_CODES:
+            with self._lock:
+                self.throttled += 1
+            delay = _retry_after(response)
+            if self.bucket and delay:
+                self.bucket.pause(delay)
+        if self.concurrency:
+            self.concurrency.release(ticket, endpoint, status_code, latency)
+
+    def as_dict(self):
+        counters = {"requests": self.requests, "throttled": self.throttled, "waited_s": round(self.waited, 3)}
+        if self.concurrency:
+            counters.update(limit=round(self.concurrency.limit, 1), peak_limit=round(self.concurrency.peak_limit, 1),
+                            decreases=self.concurrency.decreases)
+        return counters
+
+
+def build_rate_limiter(rate=None, burst=None, max_concurrency=None, initial_concurrency=4):
+    """RateLimiter по параметрам командной строки или None, если ограничение не задано"""
+    if not rate and not max_concurrency:
+        return None
+    bucket = TokenBucket(rate, burst) if rate else None
+    concurrency = AimdConcurrency(initial=initial_concurrency, max_limit=max_concurrency) if max_concurrency else None
+    return RateLimiter(bucket, concurrency)
+
+
+class RateLimitPlugin:
+    """pytest-плагин: итоги ограничения нагрузки в терминале"""
+
+    def __init__(self, limiter):
+        self.limiter = limiter
+
+    def pytest_terminal_summary(self, terminalreporter):
+        terminalreporter.write_sep("-", "HTTP rate limiting")
+        terminalreporter.write_line(", ".join(f"{name}: {value}" for name, value in self.limiter.as_dict().items()))
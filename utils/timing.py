@@ -0,0 +1,145 @@
+"""
+Замеры HTTP-вызовов тестов и сводная таблица задержек по эндпоинтам
+"""
+import html
+import threading
+from collections import defaultdict
+
+import pytest
+
+from utils.stats import PERCENTILES, LatencyStats, format_table, percentile
+
+
+def _ms(value):
+    return value * 1000 if value is not None else None
+
+
+class EndpointTimings:
+    """Задержки одного эндпоинта: total, ttfb и время установки соединений"""
+
+    def __init__(self):
+        self.total = LatencyStats()
+        self.ttfb = []
+        self.connect = []
+        self.status_codes = defaultdict(int)
+
+    def add(self, timing):
+        status_code = timing["status_code"]
+        self.total.add(timing["total"], ok=status_code is not None and status_code < 500)
+        self.status_codes[status_code if status_code is not None else "error"] += 1
+        if timing["ttfb"] is not None:
+            self.ttfb.append(timing["ttfb"])
+        if timing["connect"] is not None:
+            self.connect.append(timing["connect"])
+
+    def summary(self):
+        result = self.total.summary()
+        ttfb = sorted(self.ttfb)
+        result["ttfb_p50"] = _ms(percentile(ttfb, 50))
+        result["ttfb_p95"] = _ms(percentile(ttfb, 95))
+        result["connects"] = len(self.connect)
+        result["connect_avg"] = _ms(sum(self.connect) / len(self.connect)) if self.connect else None
+        result["status_codes"] = dict(self.status_codes)
+        return result
+
+
+class TimingRecorder:
+    """Слушатель ApiClient: копит замеры текущей фазы теста и агрегирует их за сессию
+
+    Замеры фазы забираются через take() и передаются в отчет теста как список
+    словарей, поэтому агрегация работает и на контроллере pytest-xdist.
+    """
+
+    def __init__(self):
+        self._pending = []
+        self._lock = threading.Lock()
+        self.endpoints = defaultdict(EndpointTimings)
+
+    def __call__(self, timing, response):
+        with self._lock:
+            self._pending.append(timing)
+
+    def take(self):
+        """Забирает замеры, накопленные с прошлого вызова"""
+        with self._lock:
+            pending, self._pending = self._pending, []
+        return [timing._asdict() for timing in pending]
+
+    def add(self, timings):
+        for timing in timings:
+            self.endpoints[timing["endpoint"]].add(timing)
+
+    def summaries(self):
+        return {endpoint: self.endpoints[endpoint].summary() for endpoint in sorted(self.endpoints)}
+
+
+SUMMARY_COLUMNS = (
+    [("requests", "Запросов"), ("errors", "Ошибок")]
+    + [(f"p{percent}", f"p{percent}, мс") for percent in PERCENTILES]
+    + [("ttfb_p50", "TTFB p50, мс"), ("ttfb_p95", "TTFB p95, мс"),
+       ("connects", "Соединений"), ("connect_avg", "Connect avg, мс")]
+)
+
+
+def render_html_table(summaries):
+    """HTML-таблица задержек по эндпоинтам для pytest-html"""
+    header = "".join(f"<th>{html.escape(title)}</th>" for _, title in SUMMARY_COLUMNS)
+    rows = []
+    for endpoint, summary in summaries.items():
+        cells = []
+        for column, _ in SUMMARY_COLUMNS:
+            value = summary.get(column)
+            if value is None:
+                value = "-"
+            elif isinstance(value, float):
+                value = f"{value:.1f}"
+            cells.append(f"<td>{value}</td>")
+        rows.append(f"<tr><td>{html.escape(endpoint)}</td>{''.join(cells)}</tr>")
+    return (
+        "<h2>Задержки HTTP по эндпоинтам</h2>"
+        f"<table id=\"http-latency\"><tr><th>Эндпоинт</th>{header}</tr>{''.join(rows)}</table>"
+    )
+
+
+def describe_test_timings(timings):
+    """Краткая сводка HTTP-вызовов теста для строки отчета"""
+    if not timings:
+        return "-"
+    total_ms = sum(timing["total"] for timing in timings) * 1000
+    return f"{len(timings)} req / {total_ms:.1f} ms"
+
+
+class HttpTimingPlugin:
+    """pytest-плагин: замеры в отчетах тестов, сводка в терминале и в pytest-html"""
+
+    def __init__(self, recorder):
+        self.recorder = recorder
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_makereport(self, item, call):
+        outcome = yield
+        # Замеры фазы передаются вместе с отчетом, в том числе из воркеров xdist
+        outcome.get_result().http_timings = self.recorder.take()
+
+    def pytest_runtest_logreport(self, report):
+        self.recorder.add(getattr(report, "http_timings", None) or [])
+
+    def pytest_terminal_summary(self, terminalreporter):
+        summaries = self.recorder.summaries()
+        if summaries:
+            terminalreporter.write_sep("-", "HTTP latency by endpoint (ms)")
+            terminalreporter.write_line(format_table(summaries))
+
+    @pytest.hookimpl(optionalhook=True)
+    def pytest_html_results_summary(self, prefix, summary, postfix, session):
+        summaries = self.recorder.summaries()
+        if summaries:
+            postfix.append(render_html_table(summaries))
+
+    @pytest.hookimpl(optionalhook=True)
+    def pytest_html_results_table_header(self, cells):
+        cells.insert(2, "<th>HTTP</th>")
+
+    @pytest.hookimpl(optionalhook=True)
+    def pytest_html_results_table_row(self, report, cells):
+        cells.insert(2, f"<td>{describe_test_timings(getattr(report, 'http_timings', None))}</td>")
@@ -0,0 +1,111 @@
+"""
+Матрица невалидных тел POST /api/1/item, построенная по схеме объявления
+"""
+import copy
+from concurrent.futures import ThreadPoolExecutor
+
+ITEM_SCHEMA = {
+    "sellerID": int,
+    "name": str,
+    "price": int,
+    "statistics": {
+        "likes": int,
+        "viewCount": int,
+        "contacts": int,
+    },
+}
+
+# Значения другого типа для каждого типа поля схемы
+WRONG_TYPE_VALUES = {
+    int: {"string": "not_a_number", "float": 1.5, "bool": True},
+    str: {"number": 12345},
+    dict: {"string": "not_an_object", "array": []},
+}
+
+# Обязательная ошибка валидации и поведение, зависящее от бизнес-логики (BUGS.md)
+REJECTED = (400,)
+BUSINESS_RULE = (200, 400)
+
+# Случаи, которые раньше были отдельными тестами в test_create_item.py
+TESTCASE_IDS = {
+    "missing-sellerID": "TC-1.2",
+    "missing-name": "TC-1.3",
+    "missing-price": "TC-1.4",
+    "missing-statistics": "TC-1.5",
+    "missing-statistics.likes": "TC-1.6",
+    "missing-statistics.viewCount": "TC-1.7",
+    "missing-statistics.contacts": "TC-1.8",
+    "string-sellerID": "TC-1.9",
+    "string-price": "TC-1.10",
+    "negative-price": "TC-1.11",
+    "empty-name": "TC-1.12",
+}
+
+
+class ValidationCase:
+    """Одна мутация валидного тела запроса и допустимые коды ответа"""
+
+    def __init__(self, name, path, value=None, remove=False, expected=REJECTED):
+        self.name = name
+        self.path = path
+        self.value = value
+        self.remove = remove
+        self.expected = expected
+
+    @property
+    def case_id(self):
+        testcase = TESTCASE_IDS.get(self.name)
+        return f"{testcase}-{self.name}" if testcase else self.name
+
+    def apply(self, payload):
+        """Копия payload с примененной мутацией"""
+        data = copy.deepcopy(payload)
+        target = data
+        for key in self.path[:-1]:
+            target = target[key]
+        if self.remove:
+            del target[self.path[-1]]
+        else:
+            target[self.path[-1]] = self.value
+        return data
+
+    def __repr__(self):
+        return f"ValidationCase({self.case_id})"
+
+
+def _fields(schema, prefix=()):
+    for field, field_type in schema.items():
+        path = prefix + (field,)
+        if isinstance(field_type, dict):
+            yield path, dict
+            yield from _fields(field_type, path)
+        else:
+            yield path, field_type
+
+
+def generate_invalid_cases(schema=ITEM_SCHEMA):
+    """Все мутации схемы: отсутствие поля, неверный тип, пустые, нулевые и отрицательные значения"""
+    cases = []
+    for path, field_type in _fields(schema):
+        field = ".".join(path)
+        cases.append(ValidationCase(f"missing-{field}", path, remove=True))
+        for kind, value in WRONG_TYPE_VALUES[field_type].items():
+            cases.append(ValidationCase(f"{kind}-{field}", path, value=value))
+        # API разбирает null в нулевое значение типа поля (0, "", объект с нулями),
+        # поэтому ожидание то же, что у zero-<field> и empty-<field> (БАГ #4, #8)
+        cases.append(ValidationCase(f"null-{field}", path, value=None, expected=BUSINESS_RULE))
+        if field_type is int:
+            cases.append(ValidationCase(f"negative-{field}", path, value=-100, expected=BUSINESS_RULE))
+            cases.append(ValidationCase(f"zero-{field}", path, value=0, expected=BUSINESS_RULE))
+        elif field_type is str:
+            cases.append(ValidationCase(f"empty-{field}", path, value="", expected=BUSINESS_RULE))
+    return cases
+
+
+def dispatch_cases(client, cases, payload, max_workers=8):
+    """Отправляет тела всех случаев параллельно и возвращает {case_id: response}"""
+    def send(case):
+        return case.case_id, client.post("item", json=case.apply(payload))
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return dict(executor.map(send, cases))